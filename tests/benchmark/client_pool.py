@@ -0,0 +1,44 @@
+"""
+Measures the per-attempt cost of obtaining a ClientWrapper in Unit.execute.
+
+`rebuild` constructs a fresh ClientWrapper on every call (litellm client, instructor
+patch, rate limiter configuration), as ModelSelectionPolicy.get_clients() used to;
+`pooled` goes through ModelSelectionPolicy.get_clients(), which reuses one
+ClientWrapper per (model, inference_parameters).
+
+    python tests/benchmark/client_pool.py [calls]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from verdict.model import ClientWrapper, ModelSelectionPolicy
+
+
+def bench(get_client, calls: int, threads: int) -> float:
+    def work(_) -> None:
+        for _ in range(calls // threads):
+            get_client()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+    return (time.perf_counter() - start) / calls
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+
+    policy = ModelSelectionPolicy.from_name("gpt-4o-mini", retries=3, temperature=0.0)
+    model, _, inference_parameters = policy.client_configs[0]
+
+    candidates = {
+        "rebuild": lambda: ClientWrapper.from_model(model, **inference_parameters),
+        "pooled": lambda: next(policy.get_clients()),
+    }
+    for threads in (1, 8):
+        for name, get_client in candidates.items():
+            get_client()  # warm up imports
+            elapsed = bench(get_client, calls, threads)
+            print(f"{name:>8} ({threads} threads): {elapsed * 1e6:8.2f}us/call")
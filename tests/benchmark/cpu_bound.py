@@ -0,0 +1,62 @@
+"""
+Measures a pipeline whose MapUnit runs a CPU-heavy scoring function (a pure-Python
+edit distance between a response and a reference), on lightweight threads (GIL-bound)
+and with `cpu_bound=True` (in worker processes). The speedup is bounded by the number
+of CPUs.
+
+    python tests/benchmark/cpu_bound.py [rows] [length]
+"""
+
+import random
+import string
+import sys
+import time
+
+from verdict import Pipeline, config
+from verdict.schema import Schema
+from verdict.transform import MapUnit
+from verdict.util.process import cpu_bound_executor
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y))
+            )
+        previous = current
+    return previous[-1]
+
+
+def score(input: Schema) -> Schema:
+    return Schema.of(distance=edit_distance(input.response, input.reference))
+
+
+def bench(rows, cpu_bound: bool) -> float:
+    pipeline = Pipeline("bench") >> MapUnit(score, cpu_bound=cpu_bound)
+    start = time.perf_counter()
+    pipeline.run_from_list(rows, max_workers=32)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+
+    rng = random.Random(0)
+
+    def text() -> str:
+        return "".join(rng.choices(string.ascii_lowercase, k=length))
+
+    rows = [Schema.of(response=text(), reference=text()) for _ in range(count)]
+
+    cpu_bound_executor.run(len, "")  # start the worker processes outside the timing
+    print(f"{config.CPU_BOUND_WORKER_COUNT} worker processes")
+
+    for name, cpu_bound in (("threads", False), ("cpu_bound", True)):
+        elapsed = bench(rows, cpu_bound)
+        print(
+            f"{name:>9}: {count} rows in {elapsed:6.2f}s ({count / elapsed:6.1f} rows/s)"
+        )
@@ -0,0 +1,70 @@
+"""
+Measures the logging overhead per Unit with logging off (only the CRITICAL stderr
+sink, as with VERDICT_NO_LOG) and on (a DEBUG sink that discards the messages).
+
+`executor` runs rows through a Layer of MapUnits, so it only measures the executor's
+per-task overhead (submit, dispatch, completion). `client` calls Client.__call__ with
+a stub completion and a judge-sized message list, which used to `pprint.pformat` the
+parameters on every request.
+
+    python tests/benchmark/logging_overhead.py [rows]
+"""
+
+import sys
+import time
+
+import verdict.core.pipeline
+from verdict import Layer, Pipeline
+from verdict.model import Client, ModelSelectionPolicy
+from verdict.schema import Schema
+from verdict.transform import MapUnit, MeanPoolUnit
+from verdict.util.log import VERDICT_VERBOSE_LOG_FORMAT, logger
+
+WIDTH = 16  # MapUnits per row
+
+
+def executor(rows: int) -> float:
+    pipeline = (
+        Pipeline("bench")
+        >> Layer(MapUnit(lambda input: Schema.of(score=input.x * 2)), WIDTH)
+        >> MeanPoolUnit("score")
+    )
+    samples = [Schema.of(x=i, text="lorem ipsum " * 50) for i in range(rows)]
+
+    start = time.perf_counter()
+    pipeline.run_from_list(samples, max_workers=8)
+    return (time.perf_counter() - start) / (rows * (WIDTH + 1))
+
+
+def client(calls: int) -> float:
+    model = ModelSelectionPolicy.from_name("gpt-4o-mini").client_configs[0][0]
+    stub = Client(lambda **parameters: {"content": "5"}, model, {"temperature": 0.7})
+    messages = [
+        {"role": "system", "content": "You are a careful judge. " * 40},
+        {"role": "user", "content": "Rate the following answer. " * 200},
+    ]
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        stub(logger, messages)
+    return (time.perf_counter() - start) / calls
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    # keep the sinks below instead of the ones Pipeline.run_from_list configures
+    verdict.core.pipeline.init_logger = lambda name=None: None
+    logger.remove()
+    logger.add(sys.stderr, level="CRITICAL")
+    executor(10)  # warm up
+
+    for name in ("off", "on"):
+        if name == "on":
+            logger.add(
+                lambda message: None, level="DEBUG", format=VERDICT_VERBOSE_LOG_FORMAT
+            )
+        print(
+            f"logging {name:>3}: executor {executor(rows) * 1e6:8.2f}us/unit, "
+            f"Client.__call__ {client(rows * 10) * 1e6:8.2f}us/call"
+        )
@@ -0,0 +1,60 @@
+"""
+Measures pooling a large ensemble (e.g., a Layer of hundreds of judges) per row, with
+the `statistics`-based pooling units and the NumPy-backed array pooling units.
+
+    python tests/benchmark/pooling.py [rows] [judges]
+"""
+
+import random
+import sys
+import time
+
+from verdict.schema import Schema
+from verdict.transform import (
+    ArrayMeanPoolUnit,
+    ArrayMeanVariancePoolUnit,
+    MajorityVotePoolUnit,
+    MapUnit,
+    MaxPoolUnit,
+    MeanPoolUnit,
+    MeanVariancePoolUnit,
+)
+
+FIELDS = ["relevance", "accuracy", "style"]
+
+
+def bench(unit, inputs) -> float:
+    start = time.perf_counter()
+    for input in inputs:
+        unit.execute(input)
+    return (time.perf_counter() - start) / len(inputs)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    judges = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    rng = random.Random(0)
+    inputs = [
+        MapUnit.InputSchema(
+            values=[
+                Schema.of(**{field: rng.randint(1, 5) for field in FIELDS})
+                for _ in range(judges)
+            ]
+        )
+        for _ in range(rows)
+    ]
+
+    for name, (baseline, array) in {
+        "mean": (MeanPoolUnit(FIELDS), ArrayMeanPoolUnit(FIELDS)),
+        "mean/variance": (
+            MeanVariancePoolUnit(FIELDS),
+            ArrayMeanVariancePoolUnit(FIELDS),
+        ),
+        "majority vote": (MaxPoolUnit(FIELDS), MajorityVotePoolUnit(FIELDS)),
+    }.items():
+        before, after = bench(baseline, inputs), bench(array, inputs)
+        print(
+            f"{name:>13}: statistics {before * 1e6:8.1f}us/row, "
+            f"numpy {after * 1e6:8.1f}us/row ({before / after:4.1f}x)"
+        )
@@ -0,0 +1,90 @@
+"""
+Measures the cost of populating a Unit's prompt, as done once per row and attempt.
+
+`eval` re-implements the previous Prompt.format: rescan the templates for `{{`/`}}`,
+merge every caller local (here, a notebook-sized globals dict) into the context, find
+the placeholders with a regex and `eval` each of them. `compiled` is the current
+Prompt.format, with templates compiled once into literal segments and placeholders,
+attribute paths resolved without `eval`, and only the referenced caller locals kept.
+
+    python tests/benchmark/prompt_format.py [formats]
+"""
+
+import re
+import sys
+import time
+
+from verdict import Unit
+from verdict.schema import Schema
+
+TEMPLATE = """
+@system
+You are a careful judge of {input.topic} answers.
+
+@user
+{instructions}
+
+Question: {input.question}
+Answer: {input.answer}
+Reference: {source.reference}
+
+Rate the answer from {unit.scale_min} to {unit.scale_max} in {len(input.answer)} words or fewer.
+"""
+
+PLACEHOLDER = r"(?<!\{)\{([^{}]+?)\}(?!\})"
+
+
+def eval_format(prompt, caller_locals, input_schema, unit, source) -> str:
+    templates = [prompt.system_prompt_template, prompt.user_prompt_template]
+    [symbol for symbol in ["{{", "}}"] for template in templates if symbol in template]
+
+    context = {"input": input_schema, "unit": unit, "previous": None, "source": source}
+    for key, value in caller_locals.items():
+        if key not in context and not key.startswith("__"):
+            context[key] = value
+
+    formatted = []
+    for template in [prompt.system_prompt_template, prompt.user_prompt_template]:
+        for match in re.findall(PLACEHOLDER, template):
+            template = template.replace(f"{{{match}}}", str(eval(match, {}, context)))
+        formatted.append(template)
+    return formatted[1]
+
+
+def bench(format_one, formats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(formats):
+        format_one()
+    return (time.perf_counter() - start) / formats
+
+
+if __name__ == "__main__":
+    formats = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+    # like a notebook, the prompt is declared at module level next to lots of globals
+    notebook_globals = {f"cell_{i}": list(range(10)) for i in range(2_000)}
+    globals().update(notebook_globals)
+    instructions = "Be strict."
+
+    unit = Unit()
+    unit.scale_min, unit.scale_max = 1, 5
+    unit.prompt(TEMPLATE)
+
+    input_schema = Schema.of(
+        topic="history", question="When did WW2 end?", answer="In 1945."
+    )
+    source = Schema.of(reference="1945")
+
+    prompt = unit._prompt
+    results = {
+        "eval": lambda: eval_format(prompt, globals(), input_schema, unit, source),
+        "eval (referenced locals only)": lambda: eval_format(
+            prompt, {"instructions": instructions}, input_schema, unit, source
+        ),
+        "compiled": lambda: prompt.format(input_schema, unit, None, source).user,
+    }
+    assert results["eval"]() == results["compiled"]()
+
+    for name, format_one in results.items():
+        elapsed = bench(format_one, formats)
+        print(f"{name:>29}: {elapsed * 1e6:8.2f}us/format")
@@ -0,0 +1,92 @@
+"""
+Simulates two models that share a ConcurrentRateLimiter (e.g., two models of one
+self-hosted deployment) but have separate tokens-per-window limits, and reports the
+achieved throughput of each against its limits.
+
+Model A sends large prompts and is bound by its tokens limit; model B is only bound by
+the shared concurrency. With `independent` acquisition (the previous behavior), A's
+requests take concurrency slots and hold them while they are queued on A's tokens
+limiter, starving B. With `atomic` acquisition, a request only takes a slot once its
+tokens limiter can admit it too. Windows are scaled down to 1 second and each request
+takes LATENCY seconds.
+
+    python tests/benchmark/ratelimit_throughput.py [seconds] [clients per model]
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+
+from verdict.util.ratelimit import (
+    ConcurrentRateLimiter,
+    RateLimitPolicy,
+    TokenBucketRateLimiter,
+)
+
+MAX_CONCURRENT = 8
+LATENCY = 0.05  # so at most MAX_CONCURRENT / LATENCY = 160 requests/s in total
+WINDOW_SECONDS = 1
+MODELS = {  # name: (tokens per window, tokens per request)
+    "A": (2_000, 200),  # at most 10 requests/s
+    "B": (100_000, 20),  # not bound by tokens
+}
+
+
+def simulate(atomic: bool, seconds: float, clients: int) -> Counter:
+    shared = ConcurrentRateLimiter(MAX_CONCURRENT)
+    policies = {
+        name: RateLimitPolicy(
+            {
+                shared: "requests",
+                TokenBucketRateLimiter(
+                    tpm, WINDOW_SECONDS, smoothing_factor=1
+                ): "tokens",
+            },
+            atomic=atomic,
+        )
+        for name, (tpm, _) in MODELS.items()
+    }
+    completed: Counter = Counter()
+    lock = threading.Lock()
+    start = time.monotonic() + WINDOW_SECONDS  # skip the initial burst
+    deadline = start + seconds
+
+    def client(name: str) -> None:
+        policy, tokens = policies[name], MODELS[name][1]
+        while time.monotonic() < deadline:
+            policy.acquire({"requests": 1, "tokens": tokens}).wait()
+            time.sleep(LATENCY)
+            policy.release({"tokens": 0})
+            if start <= time.monotonic() <= deadline:
+                with lock:
+                    completed[name] += 1
+
+    threads = [
+        threading.Thread(target=client, args=(name,))
+        for name in MODELS
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return Counter({name: count / seconds for name, count in completed.items()})
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    max_requests = MAX_CONCURRENT / LATENCY
+    for name, atomic in (("independent", False), ("atomic", True)):
+        throughput = simulate(atomic, seconds, clients)
+        total = sum(throughput.values())
+        per_model = ", ".join(
+            f"{model}: {throughput[model]:6.1f} req/s ({throughput[model] * tokens / tpm:6.1%} of tokens limit)"
+            for model, (tpm, tokens) in MODELS.items()
+        )
+        print(
+            f"{name:>11}: {total:6.1f} req/s ({total / max_requests:6.1%} of concurrency bound) | {per_model}"
+        )
@@ -0,0 +1,76 @@
+"""
+Measures GraphExecutor scheduling overhead per task, independent of Unit execution.
+
+Each sample is a `width`-wide fan-in (`width` independent tasks feeding one join task),
+similar to `Layer(Unit(), width) >> MeanPoolUnit()`. Dispatch is replaced by a queue
+drained on the main thread, so the timings only cover submit/dependency bookkeeping.
+
+    python tests/benchmark/scheduler.py [width]
+"""
+
+import sys
+import time
+from collections import deque
+from types import SimpleNamespace
+
+from verdict.core.executor import GraphExecutor, Task
+from verdict.schema import Schema
+
+
+class BenchmarkTask(Task):
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.prefix = [name]
+        self.dependencies = set()
+        self.dependents = set()
+        self.shared = SimpleNamespace(branch=SimpleNamespace(update=lambda *_: None))
+
+    def execute(self, input_data: Schema) -> Schema:
+        return input_data
+
+
+class BenchmarkExecutor(GraphExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.dispatched = deque()
+        self.output = Schema.empty()
+
+    def _dispatch(self, task, input_data, leader, execution_context) -> None:
+        self.dispatched.append(task)
+
+    def drain(self) -> None:
+        while self.dispatched:
+            task = self.dispatched.popleft()
+            self.outputs[task] = task.output = self.output
+            self._on_task_complete(task)
+
+
+def sample(idx: int, width: int) -> list:
+    join = BenchmarkTask(f"{idx}.join")
+    roots = [BenchmarkTask(f"{idx}.{i}") for i in range(width)]
+    for root in roots:
+        root.dependents.add(join)
+        join.dependencies.add(root)
+    return roots
+
+
+def bench(n_tasks: int, width: int) -> float:
+    executor = BenchmarkExecutor()
+    samples = [sample(idx, width) for idx in range(n_tasks // (width + 1))]
+    input_data = Schema.empty()
+
+    start = time.perf_counter()
+    for roots in samples:
+        executor.submit(roots, input_data)
+    executor.drain()
+    elapsed = time.perf_counter() - start
+
+    executor.shutdown()
+    assert executor.is_complete.is_set()
+    return elapsed / (len(samples) * (width + 1))
+
+
+if __name__ == "__main__":
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    for n_tasks in (1_000, 10_000, 100_000):
+        print(f"{n_tasks:>7} tasks: {bench(n_tasks, width) * 1e6:8.2f}us/task")
@@ -0,0 +1,69 @@
+"""
+Measures the cost of the per-row dynamic Schema classes built by Schema.of and
+Schema.add (e.g., by MapUnit, the executor and the extractors).
+
+`uncached` builds a new pydantic model class for every call, as before; `cached` reuses
+one interned class per shape. Time and peak traced memory (tracemalloc) are reported
+while keeping every row alive, as a pipeline holding its results does. Half of the rows
+are built with Schema.of and half with Schema.add.
+
+    python tests/benchmark/schema_classes.py [rows]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+import verdict.schema as schema
+from verdict.schema import Schema
+
+
+class Judgement(Schema):
+    score: int
+
+
+def rows(count: int) -> List[Schema]:
+    half = count // 2
+    return [
+        Schema.of(question=f"question {i}", answer=f"answer {i}", score=i % 5)
+        for i in range(half)
+    ] + [Judgement(score=i % 5).add(explanation=f"because {i}") for i in range(half)]
+
+
+def bench(count: int) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = rows(count)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed, peak
+
+
+def uncached(factory: Callable) -> Callable:
+    def build(*key):
+        return factory.__wrapped__(*key)
+
+    return build
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    cached = (schema._schema_class, schema._extended_class)
+    results = {}
+    schema._schema_class = uncached(schema._schema_class)  # type: ignore[assignment]
+    schema._extended_class = uncached(schema._extended_class)  # type: ignore[assignment]
+    results["uncached"] = bench(count)
+    schema._schema_class, schema._extended_class = cached  # type: ignore[assignment]
+    results["cached"] = bench(count)
+
+    for name, (elapsed, peak) in results.items():
+        print(
+            f"{name:>8}: {count:,} rows in {elapsed:7.2f}s "
+            f"({elapsed / count * 1e6:7.2f}us/row), peak {peak / 2**20:8.1f} MiB"
+        )
@@ -0,0 +1,75 @@
+"""
+Measures the tracing overhead per Unit: rows run through a Layer of MapUnits, so only
+the executor's per-task overhead (including its spans) is measured.
+
+`noop` is the default tracer (NoOpTracer, which only propagates the context). `export`
+records every span with a BatchExportTracer that discards the batches, and `export 1%`
+samples 1% of the rows. Also reports the calls still referenced after the run, e.g.,
+by a tracer that keeps them.
+
+    python tests/benchmark/tracing_overhead.py [rows]
+"""
+
+import gc
+import os
+import sys
+import time
+
+import verdict.core.pipeline
+from verdict import Layer, Pipeline
+from verdict.schema import Schema
+from verdict.transform import MapUnit, MeanPoolUnit
+from verdict.util.tracing import (
+    BatchExportTracer,
+    Call,
+    ConsoleTracer,
+    NoOpTracer,
+    TracingManager,
+)
+
+WIDTH = 16  # MapUnits per row
+
+
+class DiscardTracer(BatchExportTracer):
+    def export(self, calls):
+        pass
+
+
+def executor(rows: int, tracer) -> float:
+    pipeline = (
+        Pipeline("bench")
+        >> Layer(MapUnit(lambda input: Schema.of(score=input.x * 2)), WIDTH)
+        >> MeanPoolUnit("score")
+    )
+    samples = [Schema.of(x=i, text="lorem ipsum " * 50) for i in range(rows)]
+
+    start = time.perf_counter()
+    pipeline.run_from_list(samples, max_workers=8, tracers=tracer)
+    return (time.perf_counter() - start) / (rows * (WIDTH + 1))
+
+
+def live_calls() -> int:
+    gc.collect()
+    return sum(isinstance(obj, Call) for obj in gc.get_objects())
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    verdict.core.pipeline.init_logger = lambda name=None: None
+    executor(10, NoOpTracer())  # warm up
+
+    tracers = {
+        "noop": lambda: NoOpTracer(),
+        "export": lambda: DiscardTracer(),
+        "export 1%": lambda: TracingManager([DiscardTracer()], sample_rate=0.01),
+    }
+    for name, tracer in tracers.items():
+        print(f"{name:>9}: {executor(rows, tracer()) * 1e6:8.2f}us/unit")
+
+    # ConsoleTracer prints, so only check what it keeps
+    sys.stdout = open(os.devnull, "w")
+    tracer = ConsoleTracer()
+    executor(rows, tracer)
+    sys.stdout = sys.__stdout__
+    print(f"calls kept after a ConsoleTracer run: {live_calls()}")
@@ -0,0 +1,369 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from verdict import Layer, Pipeline, Unit
+from verdict.extractor import RawExtractor
+from verdict.schema import Schema
+from verdict.transform import MapUnit, MeanPoolUnit
+from verdict.util import ratelimit
+from verdict.util.exceptions import VerdictSystemError
+from verdict.util.ratelimit import AwaitableEvent, RateLimitPolicy
+
+
+class EchoUnit(Unit):
+    class ResponseSchema(Schema):
+        output: str
+
+
+@pytest.fixture
+def no_rate_limit():
+    ratelimit.disable()
+    yield
+    ratelimit.enable()
+
+
+def echo_pipeline(repeat: int = 2) -> Pipeline:
+    # litellm's `mock_response` short-circuits the provider call
+    return (
+        Pipeline("test")
+        >> Layer(
+            EchoUnit()
+            .prompt("Repeat {input.x}")
+            .extract(RawExtractor())
+            .via("gpt-4o-mini", mock_response="hello"),
+            repeat,
+        )
+        >> MapUnit(lambda outputs: Schema.of(count=len(outputs)))
+    )
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_run_from_list(executor, no_rate_limit):
+    df, leaf_node_prefixes = echo_pipeline().run_from_list(
+        [Schema.of(x=i) for i in range(10)], executor=executor
+    )
+
+    assert len(df) == 10
+    assert leaf_node_prefixes == ["test_root.block.block.unit[Map]_count"]
+    assert (df["test_root.block.block.unit[Map]_count"] == 2).all()
+    assert (df["test_root.block.layer[0].unit[Unit]_output"] == "hello").all()
+
+
+def test_async_lightweight_only():
+    pipeline = (
+        Pipeline("test")
+        >> Layer(MapUnit(lambda input: Schema.of(score=input.x * 2)), 3)
+        >> MeanPoolUnit("score")
+    )
+    outputs, leaf_node_prefixes = pipeline.run(Schema.of(x=2), executor="async")
+
+    assert outputs[leaf_node_prefixes[0]] == 4
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_accumulate_preserves_layer_order(executor):
+    def member(k: int) -> MapUnit:
+        def scale(input: Schema) -> Schema:
+            time.sleep(0.01 * (5 - k))  # complete in reverse order
+            return Schema.of(k=input.x * k)
+
+        return MapUnit(scale)
+
+    pipeline = (
+        Pipeline("test")
+        >> Layer([member(k) for k in range(5)])
+        >> MapUnit(lambda outputs: Schema.of(ks=[output.k for output in outputs]))
+    )
+    outputs, leaf_node_prefixes = pipeline.run(Schema.of(x=1), executor=executor)
+
+    assert outputs[leaf_node_prefixes[0]] == [0, 1, 2, 3, 4]
+
+
+def test_awaitable_event():
+    async def wait(event: AwaitableEvent) -> bool:
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, event.set)
+        await asyncio.wait_for(event.wait_async(), timeout=1)
+        return event.is_set()
+
+    assert asyncio.run(wait(AwaitableEvent()))
+
+
+def test_rate_limit_policy_wait_async():
+    policy = RateLimitPolicy.of(rpm=2, tpm=1_000)
+
+    async def acquire() -> None:
+        await policy.acquire({"requests": 1, "tokens": 10}).wait_async()
+
+    asyncio.run(asyncio.wait_for(acquire(), timeout=1))
+    assert not policy.acquire({"requests": 1, "tokens": 10}).is_set()
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_max_inflight_samples(executor):
+    pipeline = (
+        Pipeline("test")
+        >> Layer(MapUnit(lambda input: Schema.of(score=input.x * 2)), 2)
+        >> MeanPoolUnit("score")
+    )
+    df, leaf_node_prefixes = pipeline.run_from_list(
+        [Schema.of(x=i) for i in range(100)],
+        executor=executor,
+        max_inflight_samples=4,
+    )
+
+    assert df["x"].tolist() == list(range(100))
+    assert (df[leaf_node_prefixes[0]] == df["x"] * 2).all()
+    assert len(pipeline.executor.outputs) == 0  # released as rows completed
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_max_inflight_samples_collection_failure(executor, monkeypatch):
+    def collect_outputs(executor, block_instance):
+        raise ValueError("bad row")
+
+    pipeline = Pipeline("test") >> MapUnit(lambda input: Schema.of(score=input.x))
+    monkeypatch.setattr(pipeline, "collect_outputs", collect_outputs)
+
+    with pytest.raises(VerdictSystemError, match="Executor failed"):
+        pipeline.run_from_list(
+            [Schema.of(x=i) for i in range(10)],
+            executor=executor,
+            max_inflight_samples=2,
+        )
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_stream_from_dataset(executor):
+    from datasets import Dataset
+
+    from verdict.dataset import DatasetWrapper
+
+    pipeline = Pipeline("test") >> MapUnit(lambda input: Schema.of(score=input.x * 2))
+    dataset = DatasetWrapper(Dataset.from_list([{"x": i} for i in range(20)]))
+
+    rows = list(
+        pipeline.stream_from_dataset(dataset, executor=executor, max_inflight_samples=3)
+    )
+
+    assert sorted(row["x"] for row in rows) == list(range(20))
+    assert all(row["test_root.block.unit[Map]_score"] == row["x"] * 2 for row in rows)
+    assert len(pipeline.executor.outputs) == 0
+
+    stream = pipeline.stream_from_dataset(dataset, executor=executor)
+    assert "x" in next(stream)
+    stream.close()
+    assert pipeline.executor.is_complete.is_set()
+
+
+def test_checkpoint_resume(tmp_path):
+    from datasets import Dataset
+
+    from verdict.dataset import DatasetWrapper
+
+    calls = []
+
+    def double(input):
+        calls.append(input.x)
+        return Schema.of(score=input.x * 2)
+
+    def pipeline() -> Pipeline:
+        return Pipeline("test") >> MapUnit(double) >> MeanPoolUnit("score")
+
+    dataset = DatasetWrapper(Dataset.from_list([{"x": i} for i in range(10)]))
+    df, leaf_node_prefixes = (
+        pipeline().checkpoint(tmp_path / "run.ckpt").run_from_dataset(dataset)
+    )
+    assert len(calls) == 10
+
+    # simulate a crash while writing the next record
+    with open(tmp_path / "run.ckpt", "ab") as f:
+        f.write(b"\x80\x04\x95")
+
+    calls.clear()
+    resumed_df, _ = pipeline().restore(tmp_path / "run.ckpt").run_from_dataset(dataset)
+    assert calls == []
+    assert resumed_df[leaf_node_prefixes].equals(df[leaf_node_prefixes])
+
+
+def test_checkpoint_resume_reordered(tmp_path):
+    import pandas as pd
+    from PIL import Image
+
+    from verdict.dataset import DatasetWrapper
+
+    calls = []
+
+    def double(input):
+        calls.append(input.x)
+        return Schema.of(score=input.x * 2)
+
+    def pipeline() -> Pipeline:
+        return Pipeline("test") >> MapUnit(double) >> MeanPoolUnit("score")
+
+    def dataset(rows) -> DatasetWrapper:
+        # a fresh image per row, whose repr includes its memory address
+        return DatasetWrapper(
+            pd.DataFrame(rows).assign(
+                image=[Image.new("L", (2, 2), row["x"]) for row in rows]
+            ),
+            columns=["x"],
+        )
+
+    rows = [{"x": i % 5} for i in range(10)]  # every row appears twice
+    df, leaf_node_prefixes = (
+        pipeline().checkpoint(tmp_path / "run.ckpt").run_from_dataset(dataset(rows))
+    )
+    assert len(calls) == 10
+
+    calls.clear()
+    resumed_df, _ = (
+        pipeline().restore(tmp_path / "run.ckpt").run_from_dataset(dataset(rows[::-1]))
+    )
+    assert calls == []
+    assert resumed_df["x"].tolist() == [row["x"] for row in rows[::-1]]
+    assert (resumed_df[leaf_node_prefixes[0]] == resumed_df["x"] * 2).all()
+
+
+class Reason(Schema):
+    text: str
+
+
+class Rating(Schema):
+    score: int
+    reason: Reason
+
+
+def test_checkpoint_keeps_schema_classes(tmp_path):
+    from verdict.core.checkpoint import CheckpointLog
+
+    rating = Rating(score=3, reason=Reason(text="ok"))
+    log = CheckpointLog(tmp_path / "run.ckpt")
+    log.record(1, "rating", rating)
+    log.record(1, "inferred", Schema.of(rating=rating, total=3))
+    log.close()
+
+    outputs = CheckpointLog(tmp_path / "run.ckpt").load()
+    assert outputs[(1, "rating")] == rating
+    assert type(outputs[(1, "rating")].reason) is Reason
+    assert outputs[(1, "inferred")].rating == rating
+    assert outputs[(1, "inferred")].total == 3
+
+
+@pytest.mark.parametrize("max_inflight_samples", [None, 2])
+def test_dedup(max_inflight_samples):
+    calls = []
+
+    def double(input):
+        calls.append(input.x)
+        return Schema.of(score=input.x * 2)
+
+    pipeline = (Pipeline("test") >> MapUnit(double) >> MeanPoolUnit("score")).dedup()
+    df, leaf_node_prefixes = pipeline.run_from_list(
+        [Schema.of(x=i % 3) for i in range(12)],
+        max_inflight_samples=max_inflight_samples,
+    )
+
+    assert sorted(calls) == [0, 1, 2]
+    assert df["x"].tolist() == [i % 3 for i in range(12)]
+    assert (df[leaf_node_prefixes[0]] == df["x"] * 2).all()
+    assert pipeline.dedup_stats == {"rows": 12, "duplicates": 9, "calls_saved": 18}
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_stream_dedup(executor):
+    from datasets import Dataset
+
+    from verdict.dataset import DatasetWrapper
+
+    calls = []
+
+    def double(input):
+        calls.append(input.x)
+        return Schema.of(score=input.x * 2)
+
+    pipeline = (Pipeline("test") >> MapUnit(double)).dedup()
+    dataset = DatasetWrapper(
+        Dataset.from_list([{"x": i % 4, "id": i} for i in range(20)]),
+        columns=["x"],
+    )
+
+    rows = list(
+        pipeline.stream_from_dataset(dataset, executor=executor, max_inflight_samples=2)
+    )
+
+    assert sorted(calls) == [0, 1, 2, 3]
+    assert sorted(row["id"] for row in rows) == list(range(20))
+    assert all(row["test_root.block.unit[Map]_score"] == row["x"] * 2 for row in rows)
+    assert pipeline.dedup_stats["calls_saved"] == 16
+
+
+def test_run_sharded_preserves_order():
+    def double(input):
+        return Schema.of(score=input.x * 2, pid=os.getpid())
+
+    pipeline = (Pipeline("test") >> MapUnit(double)).dedup()
+    samples = [Schema.of(x=i % 7) for i in range(30)]
+    df, leaf_node_prefixes = pipeline.run_from_list(samples, processes=3)
+
+    expected_df, expected_prefixes = (
+        Pipeline("test") >> MapUnit(double)
+    ).run_from_list(samples)
+    assert leaf_node_prefixes == expected_prefixes
+    assert df["x"].tolist() == expected_df["x"].tolist()
+    assert (df["test_root.block.unit[Map]_score"] == df["x"] * 2).all()
+    assert df["test_root.block.unit[Map]_pid"].nunique() == 3
+    assert os.getpid() not in set(df["test_root.block.unit[Map]_pid"])
+    assert pipeline.dedup_stats["rows"] == 30
+
+
+def test_run_sharded_resume(tmp_path, monkeypatch):
+    from verdict.core.checkpoint import CheckpointLog
+
+    loads = tmp_path / "loads"
+    load = CheckpointLog.load
+
+    def logged_load(self):
+        with open(loads, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        return load(self)
+
+    monkeypatch.setattr(CheckpointLog, "load", logged_load)
+
+    def double(input):
+        return Schema.of(score=input.x * 2, pid=os.getpid())
+
+    samples = [Schema.of(x=i) for i in range(10)]
+    (Pipeline("test") >> MapUnit(double)).checkpoint(
+        tmp_path / "run.ckpt"
+    ).run_from_list(samples[:6])
+    with open(tmp_path / "run.ckpt", "ab") as f:
+        f.write(b"\x80\x04\x95")  # torn record
+
+    df, _ = (
+        (Pipeline("test") >> MapUnit(double))
+        .restore(tmp_path / "run.ckpt")
+        .run_from_list(samples, processes=2)
+    )
+
+    # loaded (and repaired) once by the parent; the workers only run the rest
+    assert loads.read_text().split() == [str(os.getpid())]
+    pids = df["test_root.block.unit[Map]_pid"].tolist()
+    assert pids[:6] == [os.getpid()] * 6
+    assert os.getpid() not in pids[6:]
+    assert (df["test_root.block.unit[Map]_score"] == df["x"] * 2).all()
+    assert len(CheckpointLog(tmp_path / "run.ckpt").load()) == 10
+
+
+def test_run_sharded_reports_worker_errors():
+    def fail(input):
+        if input.x == 5:
+            os._exit(1)
+        return Schema.of(score=input.x)
+
+    pipeline = Pipeline("test") >> MapUnit(fail)
+    with pytest.raises(VerdictSystemError, match="exited with code 1"):
+        pipeline.run_from_list([Schema.of(x=i) for i in range(10)], processes=2)
@@ -0,0 +1,193 @@
+import asyncio
+import math
+import threading
+import time
+
+import pytest
+
+from verdict import Layer, Pipeline, Unit
+from verdict.extractor import RawExtractor
+from verdict.model import Client, ModelSelectionPolicy
+from verdict.schema import Schema
+from verdict.util import ratelimit
+from verdict.util.cache import CacheScope, cache_scope
+from verdict.util.coalesce import in_flight
+from verdict.util.log import logger
+from verdict.util.ratelimit import (
+    RateLimitPolicy,
+    TokenBucketRateLimiter,
+    UnlimitedRateLimiter,
+)
+
+
+def test_get_clients_reuses_client_wrappers():
+    policy = ModelSelectionPolicy.from_name("gpt-4o-mini", retries=2)
+    first, retry = policy.get_clients()
+
+    assert first is retry
+    assert next(policy.get_clients()) is first
+
+
+def test_get_clients_follows_rate_limiter_toggle():
+    policy = ModelSelectionPolicy.from_name("gpt-4o-mini")
+    client = next(policy.get_clients())
+
+    ratelimit.disable()
+    try:
+        assert next(policy.get_clients()) is client
+        assert isinstance(
+            next(iter(client.model.rate_limit.rate_limiters)), UnlimitedRateLimiter
+        )
+    finally:
+        ratelimit.enable()
+
+    next(policy.get_clients())
+    assert not isinstance(
+        next(iter(client.model.rate_limit.rate_limiters)), UnlimitedRateLimiter
+    )
+
+
+def test_client_defaults_are_scoped():
+    client = next(ModelSelectionPolicy.from_name("gpt-4o-mini").get_clients())
+    raw_client = client.raw_client
+    seen = {}
+
+    def other_thread() -> None:
+        seen["other"] = raw_client._inference_parameters()
+
+    with raw_client.defaults(temperature=0.0):
+        seen["inside"] = raw_client._inference_parameters()
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+    assert seen["inside"] == {"temperature": 0.0}
+    assert seen["other"] == {}
+    assert raw_client._inference_parameters() == {}
+
+
+def test_token_counts_are_memoized():
+    client = next(ModelSelectionPolicy.from_name("gpt-4o-mini").get_clients())
+    text = "Evaluate the following response. " * 10
+
+    count = client.count_tokens(text)
+    assert count == len(client.encode(text))
+    assert client.count_tokens(text) == count
+    assert client.tokenizer.count.cache_info().hits >= 1
+
+    assert client.tokenizer.estimate(text, chars_per_token=4) == math.ceil(
+        len(text) / 4
+    )
+    assert len(client.encode("x" * 1_000)) < 10  # long base64-like runs are truncated
+
+
+def coalescing_client(temperature: float):
+    calls = []
+    started = threading.Event()
+
+    def complete(**parameters):
+        calls.append(parameters)
+        started.set()
+        time.sleep(0.2)
+        return {"content": "hello"}
+
+    model = ModelSelectionPolicy.from_name("gpt-4o-mini").client_configs[0][0]
+    return Client(complete, model, {"temperature": temperature}), calls, started
+
+
+def test_identical_requests_are_coalesced():
+    client, calls, started = coalescing_client(temperature=0)
+    tokens = TokenBucketRateLimiter(100, 60, smoothing_factor=1)
+    policy = RateLimitPolicy.using(tokens=tokens)
+    messages = [{"role": "user", "content": "hi"}]
+    stats = in_flight.stats
+
+    def call(results: list) -> None:
+        scope = CacheScope(None, "unit", policy.acquire({"tokens": 10}))
+        with cache_scope(scope):
+            results.append((client(logger, messages), scope.refunded))
+
+    results: list = []
+    leader = threading.Thread(target=call, args=(results,))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=call, args=(results,)) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert in_flight.stats["coalesced"] - stats["coalesced"] == 3
+    assert all(response == {"content": "hello"} for response, _ in results)
+    assert len({id(response) for response, _ in results}) == 4  # copies
+    assert sorted(refunded for _, refunded in results) == [False, True, True, True]
+    assert tokens.level == pytest.approx(90, abs=1)  # charged once
+
+
+def test_repeated_units_are_coalesced(monkeypatch):
+    """Test that a Layer's repeated Units share one call despite their nonces."""
+    import litellm.main
+
+    calls = []
+    completion = litellm.main.completion
+
+    def counted(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.2)
+        return completion(**kwargs)
+
+    monkeypatch.setattr(litellm.main, "completion", counted)
+
+    class EchoUnit(Unit):
+        class ResponseSchema(Schema):
+            output: str
+
+    ratelimit.disable()
+    try:
+        pipeline = Pipeline("test") >> Layer(
+            EchoUnit()
+            .prompt("Repeat {input.x}")
+            .extract(RawExtractor())
+            .via("gpt-4o-mini", temperature=0, mock_response="hello"),
+            4,
+        )
+        df, _ = pipeline.run_from_list([Schema.of(x=1)], executor="thread")
+    finally:
+        ratelimit.enable()
+
+    assert len(calls) == 1
+    assert (df["test_root.block.layer[0].unit[Unit]_output"] == "hello").all()
+
+
+def test_sampled_requests_are_not_coalesced():
+    client, calls, _ = coalescing_client(temperature=0.7)
+    messages = [{"role": "user", "content": "hi"}]
+
+    threads = [
+        threading.Thread(target=client, args=(logger, messages)) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 3
+
+
+def test_identical_async_requests_are_coalesced():
+    client, calls, _ = coalescing_client(temperature=0)
+
+    async def complete(**parameters):
+        calls.append(parameters)
+        await asyncio.sleep(0.1)
+        return {"content": "hello"}
+
+    client.complete = complete
+    messages = [{"role": "user", "content": "hi"}]
+
+    async def main():
+        return await asyncio.gather(*(client(logger, messages) for _ in range(4)))
+
+    assert asyncio.run(main()) == [{"content": "hello"}] * 4
+    assert len(calls) == 1
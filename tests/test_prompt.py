@@ -0,0 +1,65 @@
+import pytest
+
+from verdict import Unit
+from verdict.prompt import Placeholder, Prompt, compile_template
+from verdict.schema import Schema
+from verdict.util.exceptions import PromptError
+
+
+def test_compile_template():
+    segments = compile_template("Rate {input.x} from {min(input.scale)} {{raw}}")
+
+    assert segments[0] == "Rate "
+    assert isinstance(segments[1], Placeholder) and segments[1].path == ("input", "x")
+    assert isinstance(segments[3], Placeholder) and segments[3].path is None
+    assert segments[-1] == " {{raw}}"  # escaped braces are left as is
+    assert (
+        compile_template("Rate {input.x} from {min(input.scale)} {{raw}}") is segments
+    )
+
+
+def test_auto_format():
+    context = {"input": Schema.of(x="a", scale=[3, 1, 2]), "n": 2}
+
+    assert (
+        Prompt.auto_format("{input.x} {min(input.scale)} {n * 2} {input.x}", context)
+        == "a 1 4 a"
+    )
+    with pytest.raises(PromptError):
+        Prompt.auto_format("{input.missing}", context)
+    with pytest.raises(PromptError):
+        Prompt.auto_format("{undefined}", context)
+    with pytest.raises(PromptError):
+        Prompt.auto_format("{input.x +}", context)
+
+
+def test_prompt_captures_referenced_locals():
+    examples = "few-shot examples"
+    unused = object()  # noqa: F841
+
+    unit = Unit().prompt("{examples}\n{input.x}")
+
+    assert unit._prompt.caller_locals == {"examples": examples}
+    message = unit._prompt.format(Schema.of(x="a"), unit, None, Schema.of())
+    assert message.user == "few-shot examples\na"
+
+
+def test_prompt_captures_functions_in_placeholders():
+    def helper(value):
+        return value + "!"
+
+    unit = Unit().prompt("Value: {helper(input.x).upper()}")
+
+    assert unit._prompt.caller_locals == {"helper": helper}
+    message = unit._prompt.format(Schema.of(x="hi"), unit, None, Schema.of())
+    assert message.user == "Value: HI!"
+
+
+def test_prompt_keeps_all_locals_for_unresolved_names():
+    items = ["a", "b"]
+
+    unit = Unit().prompt("{', '.join(item.upper() for item in items)}")
+
+    assert unit._prompt.caller_locals["items"] is items
+    message = unit._prompt.format(Schema.of(), unit, None, Schema.of())
+    assert message.user == "A, B"
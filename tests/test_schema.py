@@ -1,6 +1,6 @@
 import pytest
 
-from verdict.schema import Field, Schema
+from verdict.schema import Field, Schema, _conform_plan
 from verdict.util.exceptions import VerdictDeclarationTimeError
 
 
@@ -23,6 +23,29 @@ def test_schema_conform():
     )
 
 
+def test_schema_conform_plan_is_reused():
+    class SchemaA(Schema):
+        a: str
+        x: int
+
+    class SchemaB(Schema):
+        y: int
+        tags: list = Field(default_factory=list)
+        b: str
+
+    hits = _conform_plan.cache_info().hits
+    first = SchemaA(a="first", x=1).conform(SchemaB)
+    second = SchemaA(a="second", x=2).conform(SchemaB)
+
+    assert _conform_plan.cache_info().hits == hits + 1
+    assert type(first) is type(second)
+    assert (second.a, second.x, second.y, second.b) == ("second", 2, 2, "second")
+    assert first.tags == second.tags == [] and first.tags is not second.tags
+
+    instance = SchemaB(y=1, b="b")
+    assert instance.conform(SchemaB) is instance
+
+
 def test_schema_conform_fail():
     class SchemaA(Schema):
         a: int
@@ -36,3 +59,36 @@ def test_schema_conform_fail():
     input_instance = SchemaA(a=42, b=42)
     with pytest.raises(VerdictDeclarationTimeError):
         input_instance.conform(SchemaB)
+
+
+def test_dynamic_schema_classes_are_reused():
+    first, second = Schema.of(score=5, name="a"), Schema.of(score=3, name="b")
+    assert type(first) is type(second)
+    assert (first.score, first.name) == (5, "a")
+    assert (second.score, second.name) == (3, "b")
+
+    assert type(Schema.of(score="5")) is not type(Schema.of(score=5))
+    assert type(Schema.of(name="a", score=5)) is not type(first)  # field order
+    assert Schema.inline(score=int) is Schema.inline(score=int)
+    assert type(Schema.empty()) is type(Schema.empty())
+
+
+def test_extended_schema_classes_are_reused():
+    class Judgement(Schema):
+        score: int
+
+    extended = Judgement.append(explanation=str)
+    assert extended is Judgement.append(explanation=str)
+    assert list(extended.model_fields) == ["score", "explanation"]
+    assert list(Judgement.prepend(explanation=str).model_fields) == [
+        "explanation",
+        "score",
+    ]
+
+    instance = Judgement(score=1).add(explanation="ok")
+    assert type(instance) is type(Judgement(score=2).add(explanation="fine"))
+    assert (instance.score, instance.explanation) == (1, "ok")
+
+    # unhashable field definitions are built, but not cached
+    with_default = Judgement.append(explanation=(str, Field(default="none")))
+    assert with_default(score=1).explanation == "none"
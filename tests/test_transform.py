@@ -0,0 +1,129 @@
+import os
+import statistics
+
+import numpy as np
+import pytest
+
+from verdict import Layer, Pipeline
+from verdict.schema import Schema
+from verdict.transform import (
+    ArrayMeanPoolUnit,
+    ArrayMeanVariancePoolUnit,
+    MajorityVotePoolUnit,
+    MapUnit,
+    MaxPoolUnit,
+    MeanVariancePoolUnit,
+    QuantilePoolUnit,
+    TrimmedMeanPoolUnit,
+    WeightedVotePoolUnit,
+    vote,
+)
+from verdict.util.exceptions import ConfigurationError, VerdictExecutionTimeError
+from verdict.util.misc import cpu_bound
+
+SCORES = [1, 4, 2, 5, 3, 4]
+LABELS = ["no", "yes", "no", "yes", "maybe", "no"]
+
+
+@pytest.fixture
+def members() -> MapUnit.InputSchema:
+    return MapUnit.InputSchema(
+        values=[
+            Schema.of(score=score, label=label) for score, label in zip(SCORES, LABELS)
+        ]
+    )
+
+
+def test_array_pools_match_statistics(members):
+    assert ArrayMeanPoolUnit("score").execute(members).score == statistics.mean(SCORES)
+
+    pooled = ArrayMeanVariancePoolUnit("score").execute(members).score
+    expected = MeanVariancePoolUnit("score").execute(members).score
+    assert pooled.mean == pytest.approx(expected.mean)
+    assert pooled.variance == pytest.approx(expected.variance)
+
+    assert MajorityVotePoolUnit(["score", "label"]).execute(members).model_dump() == (
+        MaxPoolUnit(["score", "label"]).execute(members).model_dump()
+    )
+
+
+def test_array_pool_output_classes_are_reused(members):
+    unit = ArrayMeanPoolUnit("score")
+    assert type(unit.execute(members)) is type(unit.execute(members))
+
+
+def test_quantile_and_trimmed_mean(members):
+    quantiles = QuantilePoolUnit("score", quantiles=(0.5, 0.9)).execute(members)
+    assert quantiles.score.p50 == statistics.median(SCORES)
+    assert quantiles.score.p90 == pytest.approx(4.5)
+
+    # drops one value from each end
+    trimmed = TrimmedMeanPoolUnit("score", proportion=0.2).execute(members)
+    assert trimmed.score == statistics.mean(sorted(SCORES)[1:-1])
+
+    with pytest.raises(ConfigurationError):
+        TrimmedMeanPoolUnit("score", proportion=0.5)
+
+
+def test_weighted_vote(members):
+    assert MajorityVotePoolUnit("label").execute(members).label == "no"
+    assert (
+        WeightedVotePoolUnit([1, 3, 1, 1, 1, 1], "label").execute(members).label
+        == "yes"
+    )
+
+    with pytest.raises(VerdictExecutionTimeError):
+        WeightedVotePoolUnit([1, 1], "label").execute(members)
+
+
+def test_vote_breaks_ties_by_first_member():
+    stacked = np.array(
+        [[1, "b"], [2, "a"], [2, "b"], [1, "a"], [None, 3.0]], dtype=object
+    )
+    assert vote(stacked).tolist() == [1, "b"]
+    assert vote(stacked, np.array([1, 1, 1, 1, 3])).tolist() == [None, 3.0]
+    assert vote(np.array([[2.0], [1], [1.0], [2]], dtype=object)).tolist() == [2.0]
+
+
+class Vote(Schema):
+    label: str
+    weight: float = 1.0
+
+
+def test_schema_pickler_keeps_importable_classes():
+    import dill
+
+    from verdict.util.process import dumps
+
+    vote = Vote(label="yes")
+    assert type(dill.loads(dumps(vote))) is Vote
+
+    # dynamic classes are restored from their values, nested importable ones by class
+    restored = dill.loads(dumps(Schema.of(votes=[vote], total=1)))
+    assert type(restored.votes[0]) is Vote
+    assert restored.total == 1
+
+
+def test_cpu_bound_map_runs_in_worker_process():
+    offset = 10
+
+    @cpu_bound
+    def score(input: Schema) -> Schema:
+        return Schema.of(score=input.x + offset, pid=os.getpid())
+
+    pipeline = (
+        Pipeline("test")
+        >> Layer(MapUnit(score), 2)
+        >> MapUnit(
+            lambda outputs: Schema.of(
+                total=sum(output.score for output in outputs),
+                pids=[output.pid for output in outputs],
+            ),
+            cpu_bound=True,
+        )
+    )
+    outputs, leaf_node_prefixes = pipeline.run(Schema.of(x=1))
+    prefix = leaf_node_prefixes[0].rsplit("_", 1)[0]
+
+    assert outputs[f"{prefix}_total"] == 22
+    assert os.getpid() not in outputs[f"{prefix}_pids"]
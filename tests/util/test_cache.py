@@ -0,0 +1,222 @@
+"""
+Tests for verdict.util.cache module.
+
+Tests cover:
+- SQLiteCache / ShardedDiskCache get, set, TTL and size eviction
+- Request keys ignore the nonce and connection-only parameters
+- Pipeline.cache serving repeated runs from the cache
+"""
+
+import os
+import time
+
+import pytest
+
+from verdict import Layer, Pipeline, Unit
+from verdict.extractor import RawExtractor
+from verdict.schema import Schema
+from verdict.util import ratelimit
+from verdict.util.cache import ShardedDiskCache, SQLiteCache, new_nonce, request_key
+
+
+@pytest.fixture(params=["sqlite", "sharded"])
+def make_cache(request, tmp_path):
+    def make(**kwargs):
+        if request.param == "sqlite":
+            return SQLiteCache(tmp_path / "cache.sqlite", **kwargs)
+        return ShardedDiskCache(tmp_path / "cache", **kwargs)
+
+    return make
+
+
+# === Store Tests ===
+
+
+def test_get_set(make_cache):
+    """Test that stored values are returned and persist across instances."""
+    cache = make_cache()
+    assert cache.get("a" * 64) is None
+
+    cache.set("a" * 64, "value")
+    assert cache.get("a" * 64) == "value"
+    assert make_cache().get("a" * 64) == "value"
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_ttl(make_cache):
+    """Test that expired entries are misses and removed."""
+    cache = make_cache(ttl=0.05)
+    cache.set("a" * 64, "value")
+    time.sleep(0.1)
+
+    assert cache.get("a" * 64) is None
+    assert cache.stats["evictions"] == 1
+
+
+def test_size_eviction(make_cache):
+    """Test that the least recently used entries are evicted past max_bytes."""
+    cache = make_cache(max_bytes=250)
+    for key in "abc":
+        cache.set(key * 64, "x" * 100)
+        time.sleep(0.01)
+        cache.get("a" * 64)  # keep `a` recently used
+
+    assert cache.get("a" * 64) is not None
+    assert cache.get("b" * 64) is None
+    assert cache.get("c" * 64) is not None
+
+
+def test_eviction_low_water_mark(make_cache):
+    """Test that eviction frees room below max_bytes instead of evicting per insert."""
+    cache = make_cache(max_bytes=1_000)
+    for i in range(11):
+        cache.set(f"{i:064d}", "x" * 100)
+        time.sleep(0.01)
+
+    assert cache.evictions == 2
+    assert cache.size == 900
+    assert cache.get(f"{0:064d}") is None
+
+    cache.set("a" * 64, "x" * 100)
+    assert cache.evictions == 2
+
+
+def test_overwrite_size(make_cache):
+    """Test that overwriting an entry does not count its previous size."""
+    cache = make_cache()
+    for _ in range(10):
+        cache.set("a" * 64, "x" * 100)
+    cache.set("b" * 64, "y" * 100)
+
+    assert cache.size == 200
+    assert cache.get("a" * 64) == "x" * 100
+
+
+# === Key Tests ===
+
+
+def test_request_key_ignores_nonce():
+    """Test that the nonce and connection-only parameters do not change the key."""
+
+    def parameters(nonce: str, timeout: int) -> dict:
+        return {
+            "model": "gpt-4o-mini",
+            "timeout": timeout,
+            "temperature": 0.0,
+            "messages": [
+                {"role": "system", "content": f"{nonce}system"},
+                {"role": "user", "content": [{"type": "text", "text": f"{nonce}hi"}]},
+            ],
+        }
+
+    nonce = new_nonce()
+    key = request_key(parameters(nonce, 10), use_nonce=True, namespace="unit")
+    assert key == request_key(
+        parameters(new_nonce(), 60), use_nonce=True, namespace="unit"
+    )
+    assert key != request_key(
+        parameters(new_nonce(), 60), use_nonce=True, namespace="other"
+    )
+    assert key != request_key(
+        {**parameters(nonce, 10), "temperature": 1.0},
+        use_nonce=True,
+        namespace="unit",
+    )
+
+
+def test_request_key_keeps_first_line():
+    """Test that only the nonce line is stripped, not an ordinary first line."""
+
+    def parameters(content: str) -> dict:
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    assert request_key(
+        parameters("Evaluation\nIs it polite?"), use_nonce=True
+    ) != request_key(parameters("Assessment\nIs it polite?"), use_nonce=True)
+
+
+# === Pipeline Tests ===
+
+
+class EchoUnit(Unit):
+    class ResponseSchema(Schema):
+        output: str
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_pipeline_cache(executor, tmp_path):
+    ratelimit.disable()
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+
+    def run():
+        pipeline = (
+            Pipeline("test")
+            >> Layer(
+                EchoUnit()
+                .prompt("Repeat {input.x}")
+                .extract(RawExtractor())
+                .via("gpt-4o-mini", mock_response="hello"),
+                2,
+            )
+        ).cache(cache)
+        df, _ = pipeline.run_from_list(
+            [Schema.of(x=i) for i in range(5)], executor=executor
+        )
+        return df
+
+    try:
+        run()
+        assert cache.stats == {"hits": 0, "misses": 10, "evictions": 0}
+
+        df = run()
+        assert cache.stats["hits"] == 10
+        assert (df["test_root.block.layer[0].unit[Unit]_output"] == "hello").all()
+    finally:
+        ratelimit.enable()
+
+
+def test_pipeline_cache_sharded(tmp_path, monkeypatch):
+    """Test that forked shard workers use their own connection to a SQLite cache."""
+    connects = tmp_path / "connects"
+    connect = SQLiteCache._connect
+
+    def logged_connect(self):
+        if self.path.parent == tmp_path:  # not the caches of other tests
+            with open(connects, "a") as f:
+                f.write(f"{os.getpid()}\n")
+        connect(self)
+
+    monkeypatch.setattr(SQLiteCache, "_connect", logged_connect)
+
+    ratelimit.disable()
+    cache = SQLiteCache(tmp_path / "cache.sqlite")
+    parent_connection = cache.connection
+
+    def run(processes):
+        pipeline = (
+            Pipeline("test")
+            >> EchoUnit()
+            .prompt("Repeat {input.x}")
+            .extract(RawExtractor())
+            .via("gpt-4o-mini", mock_response="hello")
+        ).cache(cache)
+        df, _ = pipeline.run_from_list(
+            [Schema.of(x=i) for i in range(6)], processes=processes
+        )
+        return df
+
+    try:
+        df = run(processes=2)
+        assert (df["test_root.block.unit[Unit]_output"] == "hello").all()
+        assert cache.connection is parent_connection
+        pids = connects.read_text().split()
+        assert len(pids) == 3 and len(set(pids)) == 3  # the parent and both workers
+
+        run(processes=None)
+        assert cache.stats["hits"] == 6
+        assert cache.connection.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+    finally:
+        ratelimit.enable()
@@ -0,0 +1,123 @@
+"""
+Tests for verdict.util.log module.
+
+Tests cover:
+- enabled() following the minimum level of the sinks
+- UnitLogger binding the Unit and formatting messages only when they are recorded
+- Expensive hot-path messages not being built with logging off
+- The run log sink's level, JSONL format and rotation
+- The background writer being flushed before and restarted after a fork
+"""
+
+import json
+import multiprocessing
+
+import pytest
+from loguru._file_sink import FileSink
+
+from verdict import Pipeline, config
+from verdict.schema import Schema
+from verdict.transform import MapUnit
+from verdict.util import background
+from verdict.util.log import BackgroundSink, UnitLogger, enabled, init_logger, logger
+
+
+@pytest.fixture
+def records():
+    logger.remove()
+    logger.add(lambda _: None, level="CRITICAL")
+    records = []
+    yield records
+    logger.remove()
+
+
+def test_enabled_follows_sinks(records):
+    assert enabled("CRITICAL")
+    assert not enabled("DEBUG")
+
+    logger.add(records.append, level="INFO")
+    assert enabled("INFO")
+    assert not enabled("DEBUG")
+
+
+def test_unit_logger(records):
+    class Loud:
+        def __str__(self) -> str:
+            raise AssertionError("formatted a dropped message")
+
+    unit_logger = UnitLogger(["root", "unit"], thread_id=3)
+    unit_logger.debug("dropped {}", Loud())
+
+    logger.add(
+        records.append,
+        level="DEBUG",
+        format="{extra[unit]} {extra[thread_id]} {message}",
+    )
+    unit_logger.debug("recorded {}", 1)
+    assert records == ["root.unit 3 recorded 1\n"]
+
+
+def test_hot_paths_skip_messages(records, monkeypatch):
+    def escape(self) -> str:
+        raise AssertionError("built a dropped message")
+
+    monkeypatch.setattr(Schema, "escape", escape)
+    pipeline = Pipeline("test") >> MapUnit(lambda input: Schema.of(score=input.x))
+    monkeypatch.setattr("verdict.core.pipeline.init_logger", lambda name=None: None)
+
+    outputs, leaf_node_prefixes = pipeline.run(Schema.of(x=1))
+    assert outputs[leaf_node_prefixes[0]] == 1
+
+
+@pytest.fixture
+def run_log(tmp_path, monkeypatch):
+    monkeypatch.delenv("VERDICT_NO_LOG", raising=False)
+    monkeypatch.setattr(config, "VERDICT_LOG_DIR", tmp_path)
+    yield tmp_path
+    logger.remove()
+
+
+def test_run_log_jsonl(run_log, monkeypatch):
+    monkeypatch.setattr(config, "RUN_LOG_FORMAT", "jsonl")
+    monkeypatch.setattr(config, "RUN_LOG_LEVEL", "INFO")
+
+    pipeline = Pipeline("test") >> MapUnit(lambda input: Schema.of(score=input.x))
+    pipeline.run_from_list([Schema.of(x=i) for i in range(3)])
+    assert not enabled("DEBUG")
+    logger.remove()  # writes the queued messages
+
+    (path,) = run_log.glob("test_*.jsonl")
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entries and all(entry["level"] != "DEBUG" for entry in entries)
+    assert {"time", "level", "unit", "thread", "function", "message"} <= set(entries[0])
+
+
+def test_run_log_rotation(run_log, monkeypatch):
+    monkeypatch.setattr(config, "RUN_LOG_ROTATION", "1 KB")
+    monkeypatch.setattr(config, "RUN_LOG_COMPRESSION", "gz")
+
+    init_logger("rotated")
+    for i in range(100):
+        logger.info(f"message {i}")
+    logger.remove()
+
+    assert len(list(run_log.glob("rotated_*.log.gz"))) > 1
+
+
+def test_background_sink_fork(tmp_path):
+    sink = BackgroundSink(FileSink(str(tmp_path / "run.log")))
+    sink.write("parent\n")
+    background.quiesce()
+    assert (tmp_path / "run.log").read_text() == "parent\n"
+
+    def child():
+        sink.write("child\n")
+        sink.flush()
+
+    process = multiprocessing.get_context("fork").Process(target=child)
+    process.start()
+    process.join()
+    sink.stop()
+
+    assert process.exitcode == 0
+    assert (tmp_path / "run.log").read_text() == "parent\nchild\n"
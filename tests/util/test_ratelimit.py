@@ -0,0 +1,427 @@
+"""
+Tests for verdict.util.ratelimit module.
+
+Tests cover:
+- TokenBucketRateLimiter burst, FIFO wake-up timing and refunds
+- Limiters sharing a single timer thread
+- Atomic RateLimitPolicy acquisition and cancellation
+- SharedTokenBucketRateLimiter state shared across instances and processes
+- AdaptiveRateLimiter AIMD updates, also against a fake provider with hidden limits
+- Splitting budgets across the worker processes of a sharded run
+"""
+
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import pytest
+
+from verdict.util import ratelimit
+from verdict.util.ratelimit import (
+    AdaptiveRateLimiter,
+    ConcurrentRateLimiter,
+    RateLimiter,
+    RateLimitPolicy,
+    SharedTokenBucketRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+# === TokenBucketRateLimiter Tests ===
+
+
+def test_token_bucket_burst_then_refill():
+    """Test that a full bucket is admitted at once and the next request waits for the refill."""
+    limiter = TokenBucketRateLimiter(max_value=10, window_seconds=1, smoothing_factor=1)
+
+    assert all(limiter.acquire(1).is_set() for _ in range(10))
+
+    start = time.monotonic()
+    event = limiter.acquire(1)
+    assert not event.is_set()
+    assert event.wait(timeout=1)
+    assert 0.05 <= time.monotonic() - start < 0.5
+
+
+def test_token_bucket_fifo():
+    """Test that a large queued request is not starved by later small ones."""
+    limiter = TokenBucketRateLimiter(max_value=10, window_seconds=1, smoothing_factor=1)
+    limiter.acquire(10)
+
+    large = limiter.acquire(5)
+    small = limiter.acquire(1)
+    assert small.wait(timeout=1)
+    assert large.is_set()
+
+
+def test_token_bucket_oversized_request():
+    """Test that a request larger than the bucket is admitted once the bucket is full."""
+    limiter = TokenBucketRateLimiter(max_value=10, window_seconds=1, smoothing_factor=1)
+
+    assert limiter.acquire(25).is_set()
+    assert limiter.acquire(1).wait(timeout=3)
+
+
+def test_token_bucket_release_refund():
+    """Test that a negative release refunds budget to queued requests."""
+    limiter = TokenBucketRateLimiter(
+        max_value=10, window_seconds=60, smoothing_factor=1
+    )
+    limiter.acquire(10)
+
+    event = limiter.acquire(5)
+    assert not event.is_set()
+    limiter.release(-5)
+    assert event.is_set()
+
+
+def test_token_bucket_shares_timer_thread():
+    """Test that limiters do not start a thread each."""
+    policies = [RateLimitPolicy.of(rpm=60, tpm=1_000) for _ in range(5)]
+    threads = threading.active_count()
+
+    policies += [policy.copy() for policy in policies]
+    for policy in policies:
+        policy.acquire({"requests": 60, "tokens": 10})
+
+    assert threading.active_count() <= threads + 1
+
+
+# === SharedTokenBucketRateLimiter Tests ===
+
+
+def test_shared_token_bucket_instances(tmp_path):
+    """Test that limiters with the same name draw from one bucket."""
+    first, second = (
+        SharedTokenBucketRateLimiter(
+            "test", 10, 60, smoothing_factor=1, directory=tmp_path
+        )
+        for _ in range(2)
+    )
+    assert first.acquire(6).is_set()
+    assert not second.acquire(6).is_set()
+
+    other = SharedTokenBucketRateLimiter(
+        "other", 10, 60, smoothing_factor=1, directory=tmp_path
+    )
+    assert other.acquire(6).is_set()
+
+
+def acquire_for(
+    limiter: SharedTokenBucketRateLimiter, seconds: float, admitted
+) -> None:
+    deadline = time.monotonic() + seconds
+    while (remaining := deadline - time.monotonic()) > 0:
+        if limiter.acquire(1).wait(timeout=remaining):
+            with admitted.get_lock():
+                admitted.value += 1
+
+
+def test_shared_token_bucket_processes(tmp_path):
+    """Test that forked processes jointly respect the limit of one bucket."""
+    context = multiprocessing.get_context("fork")
+    limiter = SharedTokenBucketRateLimiter(
+        "test", 20, 1, smoothing_factor=1, directory=tmp_path
+    )
+    limiter.acquire(0)  # opens the state file before forking
+
+    admitted = context.Value("i", 0)
+    processes = [
+        context.Process(target=acquire_for, args=(limiter, 0.5, admitted))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # a full bucket plus half a window of refill, instead of 4x that
+    assert 25 <= admitted.value <= 32
+
+
+# === RateLimitPolicy Tests ===
+
+
+def saturated_policies(atomic: bool):
+    shared = ConcurrentRateLimiter(max_concurrent=1)
+
+    def policy(max_tokens: int) -> RateLimitPolicy:
+        return RateLimitPolicy(
+            {
+                shared: "requests",
+                TokenBucketRateLimiter(max_tokens, 60, smoothing_factor=1): "tokens",
+            },
+            atomic=atomic,
+        )
+
+    return policy(10), policy(1_000)
+
+
+def test_policy_atomic_acquire():
+    """Test that a request queued on one limiter does not hold budget on another."""
+    exhausted, available = saturated_policies(atomic=True)
+    assert exhausted.acquire({"requests": 1, "tokens": 10}).is_set()
+    exhausted.release({"tokens": 0})
+
+    queued = exhausted.acquire({"requests": 1, "tokens": 10})
+    assert not queued.is_set()
+    assert available.acquire({"requests": 1, "tokens": 10}).is_set()
+
+
+def test_policy_independent_acquire():
+    """Test that atomic=False keeps acquiring each limiter on its own."""
+    exhausted, available = saturated_policies(atomic=False)
+    exhausted.acquire({"requests": 1, "tokens": 10})
+    exhausted.release({"tokens": 0})
+
+    exhausted.acquire({"requests": 1, "tokens": 10})  # holds the shared slot
+    assert not available.acquire({"requests": 1, "tokens": 10}).is_set()
+
+
+def test_policy_with_plain_limiter_is_not_atomic():
+    """Test that a limiter without the reservation interface disables atomic acquire."""
+
+    class Plain(RateLimiter):
+        def acquire(self, value=None):
+            return ConcurrentRateLimiter(1).acquire(value)
+
+        def release(self, value=None):
+            pass
+
+        def copy(self):
+            return Plain()
+
+    policy = RateLimitPolicy(
+        {Plain(): "requests", TokenBucketRateLimiter(10, 60): "tokens"}
+    )
+    assert not policy.atomic
+    assert policy.acquire({"requests": 1, "tokens": 1}).is_set()
+
+
+def test_policy_cancel():
+    """Test that cancelling frees queued and admitted requests."""
+    tokens = TokenBucketRateLimiter(100, 60, smoothing_factor=1)
+    policy = RateLimitPolicy.using(
+        requests=ConcurrentRateLimiter(max_concurrent=1), tokens=tokens
+    )
+    admitted = policy.acquire({"requests": 1, "tokens": 60})
+    queued = policy.acquire({"requests": 1, "tokens": 60})
+    behind = policy.acquire({"requests": 1, "tokens": 10})
+    assert admitted.is_set() and not queued.is_set() and not behind.is_set()
+
+    queued.cancel()
+    assert not behind.is_set()  # the slot is still taken
+    admitted.cancel()  # refunds the slot and the tokens
+    assert behind.is_set()
+    assert tokens.level == pytest.approx(90, abs=1)
+
+
+# === AdaptiveRateLimiter Tests ===
+
+
+def test_adaptive_follows_headers():
+    """Test that the estimate follows the reported limit and remaining budget."""
+    policy = RateLimitPolicy.adaptive(rpm=5, tpm=1_000, window_seconds=60)
+    policy.observe(
+        {
+            "llm_provider-x-ratelimit-limit-requests": "500",
+            "llm_provider-x-ratelimit-remaining-requests": "100",
+        },
+        values={"requests": 1, "tokens": 100},
+    )
+
+    requests, tokens = policy.rate_limiters
+    assert policy.estimate == {"requests": 500, "tokens": pytest.approx(1_010)}
+    assert requests.level == pytest.approx(500 * 0.9 - 400, abs=1)
+
+
+def test_adaptive_aimd():
+    """Test additive increase on success and one multiplicative decrease per 429 burst."""
+    limiter = AdaptiveRateLimiter(100, 1, smoothing_factor=1, increase=10, cooldown=60)
+    policy = RateLimitPolicy({limiter: "requests"})
+
+    for _ in range(100):  # a full window of successes
+        policy.observe(values={"requests": 1})
+    assert limiter.estimate == pytest.approx(110, abs=0.5)
+
+    policy.observe({"retry-after": "0.2"}, rate_limited=True)
+    policy.observe({"retry-after": "0.2"}, rate_limited=True)  # within the cooldown
+    assert limiter.estimate == pytest.approx(55, abs=0.5)
+
+    start = time.monotonic()
+    assert limiter.acquire(1).wait(timeout=1)
+    assert time.monotonic() - start >= 0.2
+
+
+def test_adaptive_rate_limited_by_other_metric():
+    """Test that a 429 only backs off the metric without remaining budget."""
+    policy = RateLimitPolicy.adaptive(rpm=100, tpm=10_000)
+    policy.observe(
+        {"x-ratelimit-remaining-requests": "50", "x-ratelimit-remaining-tokens": "0"},
+        rate_limited=True,
+    )
+    assert policy.estimate == {"requests": 100, "tokens": 5_000}
+
+
+class FakeProvider(ThreadingHTTPServer):
+    """An OpenAI-compatible server that allows `limit` requests per sliding second."""
+
+    def __init__(self, limit: int, send_headers: bool) -> None:
+        super().__init__(("127.0.0.1", 0), FakeProviderHandler)
+        self.limit = limit
+        self.send_headers = send_headers
+        self.lock = threading.Lock()
+        self.sent: List[float] = []
+        self.rejected = 0
+
+
+class FakeProviderHandler(BaseHTTPRequestHandler):
+    server: FakeProvider
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["content-length"]))
+        with self.server.lock:
+            now = time.monotonic()
+            self.server.sent = [t for t in self.server.sent if now - t < 1]
+            if allowed := len(self.server.sent) < self.server.limit:
+                self.server.sent.append(now)
+            else:
+                self.server.rejected += 1
+            remaining = self.server.limit - len(self.server.sent)
+
+        if allowed:
+            body = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "fake",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "hello"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 5,
+                    "completion_tokens": 1,
+                    "total_tokens": 6,
+                },
+            }
+        else:
+            body = {"error": {"message": "Rate limit reached", "type": "requests"}}
+        content = json.dumps(body).encode()
+
+        self.send_response(200 if allowed else 429)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(content)))
+        if self.server.send_headers:
+            self.send_header("x-ratelimit-limit-requests", str(self.server.limit))
+            self.send_header("x-ratelimit-remaining-requests", str(remaining))
+        if not allowed:
+            self.send_header("retry-after", "0.2")
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def fake_provider(request):
+    server = FakeProvider(*request.param)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def run_against(provider: FakeProvider, policy: RateLimitPolicy, rows: int) -> None:
+    from verdict import Layer, Pipeline, Unit
+    from verdict.extractor import RawExtractor
+    from verdict.model import vLLMModel
+    from verdict.schema import Schema
+
+    model = vLLMModel(
+        name="fake",
+        api_base=f"http://127.0.0.1:{provider.server_port}/v1",
+        api_key="fake",
+        rate_limiter=policy,
+    )
+
+    class EchoUnit(Unit):
+        class ResponseSchema(Schema):
+            output: str
+
+    pipeline = Pipeline("test") >> Layer(
+        EchoUnit()
+        .prompt("Say hello to {input.x}")
+        .extract(RawExtractor())
+        .via(model, 10),
+        1,
+    )
+    df, _ = pipeline.run_from_list([Schema.of(x=i) for i in range(rows)])
+    assert len(df) == rows
+
+
+@pytest.mark.parametrize("fake_provider", [(10, True)], indirect=True)
+def test_adaptive_learns_limit_from_headers(fake_provider):
+    """Test that a low initial estimate is raised to the provider's reported limit."""
+    policy = RateLimitPolicy.adaptive(rpm=2, tpm=1_000_000, window_seconds=1)
+
+    start = time.monotonic()
+    run_against(fake_provider, policy, rows=30)
+    assert policy.estimate["requests"] == 10
+    assert time.monotonic() - start < 10  # 2 rps would take 15s
+
+
+@pytest.mark.parametrize("fake_provider", [(10, False)], indirect=True)
+def test_adaptive_backs_off_on_429(fake_provider):
+    """Test that an overestimated limit is cut on 429s without any headers."""
+    policy = RateLimitPolicy.adaptive(rpm=100, tpm=1_000_000, window_seconds=1)
+
+    run_against(fake_provider, policy, rows=30)
+    assert fake_provider.rejected > 0
+    assert policy.estimate["requests"] < 100
+
+
+# === Split Tests ===
+
+
+def test_split_budgets():
+    """Test that every limiter keeps its share of the budget, once per limiter."""
+    tokens = TokenBucketRateLimiter(1_000, 60, smoothing_factor=1)
+    concurrent = ConcurrentRateLimiter(10)
+    policies = [
+        RateLimitPolicy({concurrent: "requests", tokens: "tokens"}),
+        RateLimitPolicy({tokens: "tokens"}),
+    ]
+    ratelimit.split(policies, 4)
+
+    assert concurrent.max_concurrent == 2
+    assert tokens.max_value == 250
+    assert tokens.level == pytest.approx(250)
+    assert tokens.rate == pytest.approx(250 / 60)
+
+
+def test_split_shared_and_adaptive(tmp_path):
+    """Test that shared buckets are left as is and adaptive limiters scale the headers."""
+    shared = SharedTokenBucketRateLimiter("split", 100, 60, directory=tmp_path)
+    ratelimit.split([RateLimitPolicy({shared: "requests"})], 4)
+    assert shared.max_value == 100
+
+    limiter = AdaptiveRateLimiter(100, 60, smoothing_factor=1)
+    policy = RateLimitPolicy({limiter: "requests"})
+    ratelimit.split([policy], 4)
+    assert limiter.estimate == 25
+
+    policy.observe(
+        {"x-ratelimit-limit-requests": "400", "x-ratelimit-remaining-requests": "400"},
+        values={"requests": 1},
+    )
+    assert limiter.estimate == pytest.approx(100)
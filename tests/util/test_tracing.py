@@ -7,9 +7,11 @@ Tests cover:
 - NoOpTracer context propagation
 - ConsoleTracer output and formatting
 - TracingManager multi-tracer coordination
-- ExecutionContext behavior
+- ExecutionContext behavior, including sampling and reusing an open span
+- BatchExportTracer batching, flushing and dropping
 - Utility functions
 - Concurrency and thread safety
+- One span per Unit and per-row sampling in pipeline runs
 """
 
 import threading
@@ -20,6 +22,7 @@ from unittest.mock import MagicMock, Mock
 import pytest
 
 from verdict.util.tracing import (
+    BatchExportTracer,
     Call,
     ConsoleTracer,
     ExecutionContext,
@@ -502,6 +505,35 @@ def test_execution_context_with_custom_tracer():
     assert context.tracer == custom_tracer
 
 
+def test_execution_context_within_reuses_call():
+    """Test ExecutionContext.within() yields the open call instead of a new span."""
+    mock_tracer = MagicMock(spec=Tracer)
+    context = ExecutionContext(tracer=mock_tracer)
+    call = Call(name="unit", inputs={})
+
+    with context.within(call).trace_call("unit", {}) as inner:
+        assert inner is call
+    with context.within(None).trace_call("unit", {}) as inner:
+        assert inner is None
+
+    mock_tracer.start_call.assert_not_called()
+
+
+def test_execution_context_sampling():
+    """Test that unsampled contexts never call the tracer."""
+    mock_tracer = MagicMock(spec=Tracer)
+    context = ExecutionContext(tracer=mock_tracer, sampled=False)
+
+    with context.trace_call("test_operation", {}) as call:
+        assert call is None
+    mock_tracer.start_call.assert_not_called()
+    assert not context.child().sampled
+    assert not context.sample()
+
+    assert ExecutionContext(tracer=TracingManager([NoOpTracer()], 1.0)).sample()
+    assert not ExecutionContext(tracer=TracingManager([NoOpTracer()], 0.0)).sample()
+
+
 # === Utility Function Tests ===
 
 
@@ -914,3 +946,160 @@ def test_transform_units_context_propagation():
 
     finally:
         current_trace_context.reset(token)
+
+
+# === BatchExportTracer Tests ===
+
+
+class RecordingTracer(BatchExportTracer):
+    def __init__(self, **kwargs) -> None:
+        self.batches = []
+        self.threads = set()
+        super().__init__(**kwargs)
+
+    def export(self, calls):
+        self.batches.append(calls)
+        self.threads.add(threading.current_thread().name)
+
+
+def test_batch_export_tracer_batches():
+    """Test that calls are exported in batches from the exporter thread."""
+    tracer = RecordingTracer(max_batch_size=4, flush_interval=60)
+
+    with tracer.start_call("outer", {}) as outer:
+        for i in range(9):
+            with tracer.start_call(f"inner_{i}", {}) as call:
+                assert call.parent_id == outer.call_id
+    tracer.flush()
+
+    assert [len(batch) for batch in tracer.batches] == [4, 4, 2]
+    assert tracer.batches[-1][-1] is outer
+    assert outer.duration is not None
+    assert tracer.threads == {"verdict-trace-exporter"}
+
+    tracer.shutdown()
+    assert not tracer.worker.thread.is_alive()
+
+
+def test_batch_export_tracer_flush_interval():
+    """Test that partial batches are exported after flush_interval."""
+    tracer = RecordingTracer(flush_interval=0.05)
+    with tracer.start_call("test", {}):
+        pass
+
+    deadline = time.monotonic() + 5
+    while not tracer.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [call.name for call in tracer.batches[0]] == ["test"]
+    tracer.shutdown()
+
+
+def test_batch_export_tracer_drops_when_full():
+    """Test that a slow exporter drops calls instead of blocking the workers."""
+    release = threading.Event()
+
+    class SlowTracer(RecordingTracer):
+        def export(self, calls):
+            release.wait()
+            super().export(calls)
+
+    tracer = SlowTracer(max_batch_size=1, max_queue_size=2)
+    for i in range(10):
+        with tracer.start_call(f"call_{i}", {}):
+            pass
+    release.set()
+    tracer.shutdown()
+
+    assert tracer.dropped > 0
+    assert sum(len(batch) for batch in tracer.batches) + tracer.dropped == 10
+
+
+def test_batch_export_tracer_counts_drops_across_threads():
+    """Test that calls dropped by concurrent workers are all counted."""
+    release = threading.Event()
+
+    class SlowTracer(RecordingTracer):
+        def export(self, calls):
+            release.wait()
+            super().export(calls)
+
+    tracer = SlowTracer(max_batch_size=1, max_queue_size=1)
+
+    def trace(i):
+        with tracer.start_call(f"call_{i}", {}):
+            pass
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(trace, range(400)))
+    release.set()
+    tracer.shutdown()
+
+    assert sum(len(batch) for batch in tracer.batches) + tracer.dropped == 400
+
+
+def test_console_tracer_releases_calls():
+    """Test that ConsoleTracer does not keep finished calls alive."""
+    tracer = ConsoleTracer()
+    with tracer.start_call("outer", {"input": "x"}):
+        with tracer.start_call("inner", {}):
+            assert len(tracer._call_registry) == 2
+    assert tracer._call_registry == {}
+
+
+# === Pipeline Tracing Tests ===
+
+
+def traced_pipeline():
+    from verdict import Layer, Pipeline
+    from verdict.schema import Schema
+    from verdict.transform import MapUnit, MeanPoolUnit
+
+    return (
+        Pipeline("test")
+        >> Layer(MapUnit(lambda input: Schema.of(score=input.x)), 2)
+        >> MeanPoolUnit("score")
+    )
+
+
+@pytest.mark.parametrize("executor", ["thread", "async"])
+def test_pipeline_one_span_per_unit(executor):
+    """Test that each Unit execution is traced by a single span."""
+    from verdict.schema import Schema
+
+    tracer = RecordingTracer()
+    traced_pipeline().run_from_list(
+        [Schema.of(x=i) for i in range(3)], tracers=tracer, executor=executor
+    )
+    tracer.shutdown()
+
+    calls = [call for batch in tracer.batches for call in batch]
+    (pipeline_call,) = [call for call in calls if "unit" not in call.inputs]
+    units = [call for call in calls if call is not pipeline_call]
+    assert len(units) == 3 * 3  # rows * Units
+    assert all(isinstance(call.inputs["unit"], str) for call in units)
+    assert all(call.outputs is not None for call in units)
+
+    call_ids = {call.call_id for call in calls}
+    assert all(call.parent_id in call_ids for call in units)
+
+
+def test_pipeline_sampling():
+    """Test that rows are sampled as a whole."""
+    from verdict.schema import Schema
+
+    tracer = RecordingTracer()
+    traced_pipeline().run_from_list(
+        [Schema.of(x=i) for i in range(20)],
+        tracers=TracingManager([tracer], sample_rate=0.5),
+    )
+    tracer.shutdown()
+
+    calls = [call for batch in tracer.batches for call in batch]
+    units = [call for call in calls if "unit" in call.inputs]
+    roots = [call for call in units if call.inputs["unit"].endswith("unit[Map]")]
+    pools = [call for call in units if "MeanPool" in call.inputs["unit"]]
+
+    # a sampled row traces all 3 Units and an unsampled row none
+    assert len(units) == 3 * len(pools)
+    assert len(roots) == 2 * len(pools)
+    assert 0 < len(pools) < 20
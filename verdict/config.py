@@ -1,13 +1,13 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from verdict.model import ModelSelectionPolicy
 from verdict.util.ratelimit import (
     ConcurrentRateLimiter,
     RateLimitPolicy,
-    TimeWindowRateLimiter,
+    TokenBucketRateLimiter,
 )
 
 
@@ -28,11 +28,11 @@ PROVIDER_RATE_LIMITER: Dict[str, RateLimitPolicy] = {
     "together_ai": RateLimitPolicy.of(rpm=600, tpm=180_000),
     "openai": RateLimitPolicy(
         {  # tier 1 for gpt-4o-mini
-            TimeWindowRateLimiter(max_value=5, window_seconds=60): "requests",
-            TimeWindowRateLimiter(
+            TokenBucketRateLimiter(max_value=5, window_seconds=60): "requests",
+            TokenBucketRateLimiter(
                 max_value=10_000, window_seconds=60 * 60 * 24
             ): "requests",
-            TimeWindowRateLimiter(max_value=200_000, window_seconds=60): "tokens",
+            TokenBucketRateLimiter(max_value=200_000, window_seconds=60): "tokens",
         }
     ),
     # TODO: add other providers
@@ -40,6 +40,13 @@ PROVIDER_RATE_LIMITER: Dict[str, RateLimitPolicy] = {
 
 DEFAULT_RATE_LIMITER: RateLimitPolicy = PROVIDER_RATE_LIMITER["openai"]
 
+# if set, rate limits estimate prompt tokens as len(text) / ratio instead of tokenizing
+RATE_LIMIT_CHARS_PER_TOKEN: Optional[float] = None
+
+## Request coalescing
+# identical concurrent requests with temperature=0 share one provider call
+COALESCE_REQUESTS: bool = True
+
 ## Connection parameters
 DEFAULT_PROVIDER_TIMEOUT: int = 120
 DEFAULT_PROVIDER_STREAM_TIMEOUT: int = 120
@@ -62,7 +69,24 @@ Do not explain your answer. {scale_prompt}
 ## Logging
 DEBUG: bool = bool(os.getenv("DEBUG", False))
 
+# run log ({pipeline.name}_{time}.log under VERDICT_LOG_DIR), written by a background
+# thread; messages below RUN_LOG_LEVEL are not built at all (see util.log.enabled), so
+# the populated prompts (DEBUG) are only logged if VERDICT_RUN_LOG_LEVEL=DEBUG
+RUN_LOG_LEVEL: str = os.getenv("VERDICT_RUN_LOG_LEVEL", "INFO")
+# "text" (verbose format) or "jsonl" (one compact JSON object per message)
+RUN_LOG_FORMAT: str = os.getenv("VERDICT_RUN_LOG_FORMAT", "text")
+# passed to loguru, e.g., "500 MB" / "1 hour", "10 files" / "1 week", "gz"
+RUN_LOG_ROTATION: Optional[str] = None
+RUN_LOG_RETENTION: Optional[str] = None
+RUN_LOG_COMPRESSION: Optional[str] = None
+
+## Tracing
+# fraction of rows whose spans are recorded (see util.tracing.TracingManager)
+TRACE_SAMPLE_RATE: float = float(os.getenv("VERDICT_TRACE_SAMPLE_RATE", 1.0))
+
 LIGHTWEIGHT_EXECUTOR_WORKER_COUNT: int = 32
+# worker processes for @cpu_bound units
+CPU_BOUND_WORKER_COUNT: int = os.cpu_count() or 1
 
 VERDICT_LOG_DIR: Path = Path.cwd() / ".verdict"
 VERDICT_LOG_DIR.mkdir(parents=True, exist_ok=True)
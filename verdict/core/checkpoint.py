@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import IO, Dict, Optional, Tuple, Union
+
+import dill  # type: ignore[import-untyped]
+
+from verdict.schema import Schema
+from verdict.util.log import logger
+from verdict.util.process import dumps
+
+CheckpointKey = Tuple[int, str]  # (hash(row), unit prefix)
+
+
+class CheckpointLog:
+    """
+    Append-only log of completed Unit outputs, keyed by `hash(row)` and Unit prefix.
+
+    Each Unit output is appended (and flushed) as its own dill record as soon as the
+    Unit completes, so a crashed run only loses the Units that were in flight. Outputs
+    are pickled with `SchemaPickler`, so they are restored with their Schema class
+    unless it is a dynamic one (e.g., from `Schema.of`).
+    """
+
+    path: Path
+    lock: threading.Lock
+
+    _file: Optional[IO[bytes]]
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> Dict[CheckpointKey, Schema]:
+        outputs: Dict[CheckpointKey, Schema] = {}
+        if not self.path.exists():
+            return outputs
+
+        with self.lock, open(self.path, "rb") as f:
+            valid_size = 0
+            while True:
+                try:
+                    key, payload = dill.load(f)
+                except EOFError:
+                    break
+                except Exception:
+                    # partially written record from an interrupted run; drop it so
+                    # new records are appended after the last complete one
+                    logger.warning(
+                        f"Truncating incomplete checkpoint record in {self.path} at byte {valid_size}"
+                    )
+                    os.truncate(self.path, valid_size)
+                    break
+
+                valid_size = f.tell()
+                try:
+                    outputs[key] = dill.loads(payload)
+                except Exception:
+                    # e.g., its Schema class no longer exists; the Unit runs again
+                    logger.opt(exception=True).warning(
+                        f"Could not restore output of {key[1]} for row {key[0]}"
+                    )
+
+        logger.info(f"Restored {len(outputs)} Unit outputs from {self.path}")
+        return outputs
+
+    def record(self, row_id: int, prefix: str, output: Schema) -> None:
+        try:
+            record = dill.dumps(((row_id, prefix), dumps(output)))
+        except Exception:
+            logger.opt(exception=True).warning(
+                f"Could not checkpoint output of {prefix} for row {row_id}"
+            )
+            return
+
+        with self.lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "ab")
+
+            self._file.write(record)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
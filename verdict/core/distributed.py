@@ -0,0 +1,490 @@
+"""
+Coordinator/worker protocol to run a Pipeline on a dataset across several hosts.
+
+The coordinator owns the dataset and leases batches of rows to workers over a small
+JSON-over-HTTP protocol:
+
+    GET  /job        the pipeline to run, as an importable `module:attribute` reference
+    POST /lease      {"worker"} -> {"lease", "rows"}, {"retry_after"} or {"done"}
+    POST /heartbeat  {"lease"} -> {"ok"}, renews the lease
+    POST /complete   {"lease", "outputs", "leaf_node_prefixes"} or {"lease", "error"}
+
+A lease expires unless its worker renews it, so the rows of a worker that died are
+leased again to another worker.
+
+    python -m verdict.core.distributed http://coordinator:8000 [--max-workers N]
+"""
+
+import argparse
+import importlib
+import json
+import socket
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from typing_extensions import Self
+
+from verdict.core.pipeline import Pipeline
+from verdict.dataset import DatasetWrapper
+from verdict.util.exceptions import ConfigurationError, VerdictSystemError
+from verdict.util.log import logger
+
+# column holding the coordinator's row index in a worker's batch
+ROW_COLUMN = "row(coordinator)"
+
+
+def load_pipeline(reference: str) -> Pipeline:
+    """
+    Import the Pipeline referenced by `module:attribute`. The attribute is either a
+    Pipeline or a function returning one.
+    """
+    module_name, _, attribute = reference.partition(":")
+    if not module_name or not attribute:
+        raise ConfigurationError(
+            f"Pipeline reference must be of the form 'module:attribute', got '{reference}'."
+        )
+
+    pipeline = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(pipeline, Pipeline):
+        pipeline = pipeline()
+    if not isinstance(pipeline, Pipeline):
+        raise ConfigurationError(f"'{reference}' is not a Pipeline.")
+    return pipeline
+
+
+def _json_default(value: Any) -> Any:
+    # numpy/pandas values from the dataset and the output DataFrame
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, default=_json_default).encode()
+
+
+@dataclass
+class Lease:
+    id: str
+    worker: str
+    rows: List[int]
+    expires: float
+
+
+class Coordinator:
+    """
+    Owns a dataset and leases batches of its rows to workers (see `Worker`) running
+    the referenced pipeline, until every row has completed.
+
+    Usage:
+        with Coordinator("evals.judge:pipeline", dataset, port=8000) as coordinator:
+            df, leaf_node_prefixes = coordinator.run()
+    """
+
+    pipeline: str
+    batch_size: int
+    lease_seconds: float
+    max_attempts: int
+
+    def __init__(
+        self,
+        pipeline: str,
+        dataset: DatasetWrapper,
+        batch_size: int = 32,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            pipeline: `module:attribute` reference to the Pipeline (or a function
+                returning it) that every worker imports and runs.
+            dataset: The dataset to run on.
+            batch_size: Number of rows per lease.
+            lease_seconds: A lease expires (and its rows are leased again) unless its
+                worker renews it within this many seconds.
+            max_attempts: Number of times a row is leased before the run fails.
+            host: Interface to serve on. Use "0.0.0.0" to accept remote workers.
+            port: Port to serve on (0 picks a free port; see `url`).
+        """
+        if batch_size < 1:
+            raise ConfigurationError("batch_size must be at least 1.")
+        if lease_seconds <= 0:
+            raise ConfigurationError("lease_seconds must be positive.")
+
+        self.pipeline = pipeline
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self.inputs = [input_data.model_dump() for _, input_data in dataset]
+
+        self.condition = threading.Condition()
+        self.pending: Deque[int] = deque(range(len(self.inputs)))
+        self.leases: Dict[str, Lease] = {}
+        self.attempts = [0] * len(self.inputs)
+        self.completed = [False] * len(self.inputs)
+        self.remaining = len(self.inputs)
+        self.outputs: Dict[int, Dict[str, Any]] = {}
+        self.leaf_node_prefixes: Set[str] = set()
+        self.workers: Set[str] = set()  # that have not been told the run is done
+        self.error: Optional[str] = None
+
+        self.server = ThreadingHTTPServer((host, port), _CoordinatorHandler)
+        self.server.daemon_threads = True
+        self.server.coordinator = self  # type: ignore[attr-defined]
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        if host in ("0.0.0.0", ""):
+            host = socket.gethostname()
+        return f"http://{host}:{port}"
+
+    def start(self) -> Self:
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.server.serve_forever,
+                name="verdict-coordinator",
+                daemon=True,
+            )
+            self.thread.start()
+            logger.info(
+                f"Coordinating {len(self.inputs)} rows of {self.pipeline} at {self.url}"
+            )
+        return self
+
+    def stop(self, grace_seconds: float = 5.0) -> None:
+        """Stop serving, after giving polling workers up to `grace_seconds` to exit."""
+        with self.condition:
+            self.condition.wait_for(lambda: not self.workers, timeout=grace_seconds)
+        if self.thread is not None:
+            self.server.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def run(self) -> Tuple["pd.DataFrame", List[str]]:  # type: ignore[name-defined]
+        """
+        Serve leases until every row has completed.
+
+        Returns:
+            Tuple of DataFrame (in dataset order) and leaf node prefixes, as returned
+            by `Pipeline.run_from_dataset`.
+        """
+        import pandas as pd
+
+        self.start()
+        with self.condition:
+            while self.remaining > 0 and self.error is None:
+                self.condition.wait(timeout=self.lease_seconds / 4)
+                self._reclaim()
+            if self.error is not None:
+                raise VerdictSystemError(f"Distributed run failed:\n{self.error}")
+
+        samples = (
+            self.dataset.samples.iloc[: len(self.inputs)]
+            .reset_index(drop=True)
+            .drop(columns=["hash(row)"])
+        )
+        if self.outputs:
+            # like run_from_dataset, rows without outputs (graceful failures) are dropped
+            outputs = pd.DataFrame.from_dict(self.outputs, orient="index").sort_index()
+            result_df = samples.join(outputs, how="inner").reset_index(drop=True)
+        else:
+            result_df = samples
+        return result_df, sorted(self.leaf_node_prefixes)
+
+    # protocol, called by the handler threads
+    def job(self) -> Dict[str, Any]:
+        return {
+            "pipeline": self.pipeline,
+            "columns": list(self.inputs[0]) if self.inputs else [],
+            "heartbeat_seconds": self.lease_seconds / 3,
+        }
+
+    def lease(self, worker: str) -> Dict[str, Any]:
+        with self.condition:
+            self._reclaim()
+            if self.remaining == 0 or self.error is not None:
+                self.workers.discard(worker)
+                self.condition.notify_all()
+                return {"done": True}
+
+            self.workers.add(worker)
+            rows = []
+            while self.pending and len(rows) < self.batch_size:
+                row = self.pending.popleft()
+                if self.completed[row]:
+                    continue
+                if self.attempts[row] >= self.max_attempts:
+                    self.error = f"row {row} was leased {self.attempts[row]} times without completing"
+                    self.condition.notify_all()
+                    return {"done": True}
+                self.attempts[row] += 1
+                rows.append(row)
+
+            if not rows:  # the remaining rows are leased to other workers
+                return {"retry_after": min(self.lease_seconds / 4, 1.0)}
+
+            lease = Lease(
+                uuid.uuid4().hex, worker, rows, time.monotonic() + self.lease_seconds
+            )
+            self.leases[lease.id] = lease
+            logger.debug(f"Leased {len(rows)} rows to {worker} ({lease.id})")
+            return {
+                "lease": lease.id,
+                "rows": [[row, self.inputs[row]] for row in rows],
+            }
+
+    def heartbeat(self, lease: str) -> Dict[str, Any]:
+        with self.condition:
+            if (current := self.leases.get(lease)) is None:
+                return {"ok": False}
+            current.expires = time.monotonic() + self.lease_seconds
+            return {"ok": True}
+
+    def complete(
+        self,
+        lease: str,
+        outputs: Optional[List[Tuple[int, Dict[str, Any]]]] = None,
+        leaf_node_prefixes: Optional[List[str]] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        with self.condition:
+            current = self.leases.pop(lease, None)
+            if error is not None:
+                logger.warning(f"Lease {lease} failed:\n{error}")
+                if current is not None:
+                    self._release(current)
+                    if any(
+                        self.attempts[row] >= self.max_attempts for row in current.rows
+                    ):
+                        self.error = error
+                self.condition.notify_all()
+                return {"ok": True}
+
+            # outputs of an expired lease are still used for rows not completed since
+            rows = current.rows if current is not None else []
+            for row, row_outputs in outputs or []:
+                self.outputs.setdefault(row, row_outputs)
+            for row in {*rows, *(row for row, _ in outputs or [])}:
+                if not self.completed[row]:
+                    self.completed[row] = True
+                    self.remaining -= 1
+            self.leaf_node_prefixes.update(leaf_node_prefixes or [])
+            self.condition.notify_all()
+            return {"ok": True}
+
+    def _release(self, lease: Lease) -> None:
+        self.pending.extendleft(
+            row for row in reversed(lease.rows) if not self.completed[row]
+        )
+
+    def _reclaim(self) -> None:
+        now = time.monotonic()
+        for lease in [lease for lease in self.leases.values() if lease.expires < now]:
+            logger.warning(
+                f"Lease {lease.id} of {lease.worker} expired, leasing its rows again"
+            )
+            del self.leases[lease.id]
+            self._release(lease)
+
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path == "/job":
+            self._reply(self.server.coordinator.job())  # type: ignore[attr-defined]
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        coordinator: Coordinator = self.server.coordinator  # type: ignore[attr-defined]
+        routes = {
+            "/lease": coordinator.lease,
+            "/heartbeat": coordinator.heartbeat,
+            "/complete": coordinator.complete,
+        }
+        if (route := routes.get(self.path)) is None:
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._reply(route(**body))
+
+    def _reply(self, body: Dict[str, Any]) -> None:
+        payload = _dumps(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.trace(format % args)
+
+
+class Worker:
+    """
+    Leases batches of rows from a `Coordinator`, runs them through the coordinator's
+    pipeline with `Pipeline.run_from_dataset` and reports their outputs, until the
+    coordinator is done.
+    """
+
+    url: str
+    name: str
+    retry_seconds: float
+
+    def __init__(
+        self,
+        url: str,
+        name: Optional[str] = None,
+        retry_seconds: float = 30.0,
+        **run_kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            url: The coordinator's URL (see `Coordinator.url`).
+            name: Name reported to the coordinator (default: hostname and a random id).
+            retry_seconds: How long to retry an unreachable coordinator.
+            **run_kwargs: Passed to `Pipeline.run_from_dataset` for every batch (e.g.,
+                `max_workers`, `executor`).
+        """
+        self.url = url.rstrip("/")
+        self.name = name or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.retry_seconds = retry_seconds
+        self.run_kwargs = run_kwargs
+
+    def run(self) -> int:
+        """Process leases until the coordinator is done. Returns the number of rows."""
+        from datasets import Dataset  # type: ignore[import-untyped]
+
+        job = self._request("/job")
+        pipeline = load_pipeline(job["pipeline"])
+        logger.info(f"Worker {self.name} running {job['pipeline']} for {self.url}")
+
+        processed = 0
+        while True:
+            reply = self._request("/lease", {"worker": self.name})
+            if reply.get("done"):
+                return processed
+            if "retry_after" in reply:
+                time.sleep(reply["retry_after"])
+                continue
+
+            lease, rows = reply["lease"], reply["rows"]
+            with self._heartbeat(lease, job["heartbeat_seconds"]):
+                try:
+                    dataset = DatasetWrapper(
+                        Dataset.from_list(
+                            [{ROW_COLUMN: row, **values} for row, values in rows]
+                        ),
+                        columns=job["columns"],
+                    )
+                    result_df, leaf_node_prefixes = pipeline.run_from_dataset(
+                        dataset, **self.run_kwargs
+                    )
+                except Exception:
+                    self._request(
+                        "/complete", {"lease": lease, "error": traceback.format_exc()}
+                    )
+                    continue
+
+            output_columns = [
+                column
+                for column in result_df.columns
+                if column != ROW_COLUMN and column not in job["columns"]
+            ]
+            outputs = [
+                [row, dict(zip(output_columns, values))]
+                for row, *values in result_df[[ROW_COLUMN, *output_columns]].itertuples(
+                    index=False
+                )
+            ]
+            self._request(
+                "/complete",
+                {
+                    "lease": lease,
+                    "outputs": outputs,
+                    "leaf_node_prefixes": leaf_node_prefixes,
+                },
+            )
+            processed += len(rows)
+
+    @contextmanager
+    def _heartbeat(self, lease: str, interval: float) -> Iterator[None]:
+        stop = threading.Event()
+
+        def renew() -> None:
+            while not stop.wait(interval):
+                try:
+                    if not self._request("/heartbeat", {"lease": lease})["ok"]:
+                        logger.warning(f"Lease {lease} expired before it completed")
+                        return
+                except VerdictSystemError:
+                    return
+
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _request(
+        self, path: str, body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            self.url + path,
+            data=None if body is None else _dumps(body),
+            headers={"Content-Type": "application/json"},
+        )
+        deadline = time.monotonic() + self.retry_seconds
+        delay = 0.1
+        while True:
+            try:
+                with urllib.request.urlopen(request, timeout=self.retry_seconds) as f:
+                    return json.loads(f.read())
+            except (urllib.error.URLError, ConnectionError) as e:
+                if time.monotonic() + delay > deadline:
+                    raise VerdictSystemError(
+                        f"Coordinator at {self.url} is unreachable"
+                    ) from e
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a worker for a verdict Coordinator."
+    )
+    parser.add_argument("url", help="URL of the coordinator")
+    parser.add_argument("--name", help="worker name reported to the coordinator")
+    parser.add_argument("--max-workers", type=int, default=128)
+    parser.add_argument("--executor", choices=["thread", "async"], default="thread")
+    args = parser.parse_args()
+
+    Worker(
+        args.url, name=args.name, max_workers=args.max_workers, executor=args.executor
+    ).run()
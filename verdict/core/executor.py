@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
+import contextvars
 import copy
+import functools
 import itertools
+import os
 import resource
+import sys
 import threading
 from abc import ABC, abstractmethod
+from collections import deque
 from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
 from enum import Enum
+from operator import itemgetter
 from pathlib import Path
 from typing import (
     Any,
     Callable,
     Collection,
     ContextManager,
+    Deque,
     Dict,
     Generic,
     List,
@@ -33,11 +42,13 @@ from typing_extensions import Self
 from verdict import config
 from verdict.extractor import Extractor, StructuredOutputExtractor
 from verdict.schema import Schema
+from verdict.util.cache import ResponseCache
 from verdict.util.exceptions import (
     ConfigurationError,
     VerdictExecutionTimeError,
     VerdictSystemError,
 )
+from verdict.util.log import UnitLogger, enabled
 from verdict.util.log import logger as base_logger
 from verdict.util.tracing import ExecutionContext
 
@@ -100,6 +111,9 @@ class Node(ABC):
     )
     stream = CascadingSetter("should_stream_output")
 
+    response_cache = CascadingProperty("_response_cache")
+    cache = CascadingSetter("response_cache", attr_type=ResponseCache)
+
     propagator = CascadingProperty("_propagator", lambda graph: graph.leaf_nodes)
     propagate = CascadingSetter("propagator")
 
@@ -210,6 +224,29 @@ class ExecutionState(Enum):
 thread_counter = itertools.count()
 
 
+@dataclass
+class CompletionWatcher:
+    remaining: int
+    callback: Callable[[], None]
+
+
+@dataclass
+class AccumulateBuffer:
+    """
+    The inputs of an `accumulate` task, one per completed dependency. They are ordered
+    by the dependencies' `_ordering_timestamp` once, when the task is dispatched.
+    """
+
+    entries: List[Tuple[float, Schema]] = field(default_factory=list)
+
+    def add(self, value: Schema, ordering_timestamp: float = 0) -> None:
+        self.entries.append((ordering_timestamp, value))
+
+    def values(self) -> List[Schema]:
+        # stable, so equal timestamps keep their completion order
+        return [value for _, value in sorted(self.entries, key=itemgetter(0))]
+
+
 class GraphExecutor:
     class State(Enum):
         SUCCESS = 1
@@ -243,6 +280,9 @@ class GraphExecutor:
             max_workers=config.LIGHTWEIGHT_EXECUTOR_WORKER_COUNT
         )
 
+        self._init_state(execution_context)
+
+    def _init_state(self, execution_context: Optional["ExecutionContext"]) -> None:
         self.lock = threading.RLock()
 
         self.is_complete = threading.Event()
@@ -252,9 +292,10 @@ class GraphExecutor:
         self.execution_pool: Set[Task] = set()
 
         self.outputs: Dict[Task, Schema] = {}
-        self.input_data_map: Dict[Task, Schema] = {}
+        self.input_data_map: Dict[Task, Union[Schema, AccumulateBuffer]] = {}
         self.task_to_call_id: Dict[Task, str] = {}  # Track call_id for each task
-        self.task_to_trace_id: Dict[Task, str] = {}  # Track trace_id for each task
+        # context each task was submitted with (trace_id, sampling decision)
+        self.task_contexts: Dict[Task, "ExecutionContext"] = {}
 
         from verdict.util.tracing import ExecutionContext
 
@@ -262,13 +303,84 @@ class GraphExecutor:
             execution_context or ExecutionContext()
         )
 
-        self.pending_tasks: Set[Task] = set()
+        # number of incomplete dependencies per task; initialized on first use
+        self.remaining_dependencies: Dict[Task, int] = {}
         self.active_task_count = 0
+        self.open_submissions = 0
+
+        self.completion_watchers: Dict[Task, List[CompletionWatcher]] = {}
+        self.restored_outputs: Dict[Task, Schema] = {}
 
     def graceful_shutdown(self) -> None:
         self.execution_state = GraphExecutor.State.TERMINATED
         self.is_complete.set()
 
+    @contextmanager
+    def submitting(self) -> ContextManager[None]:  # type: ignore
+        """
+        Keep the executor from completing while multiple `submit` calls are made, e.g.,
+        while rows are admitted incrementally. Otherwise, the executor may be marked
+        complete as soon as the tasks submitted so far have finished.
+        """
+        with self.lock:
+            self.open_submissions += 1
+        try:
+            yield
+        finally:
+            self._close_submission()
+
+    def _close_submission(self) -> None:
+        with self.lock:
+            self.open_submissions -= 1
+            self._check_complete()
+
+    def _check_complete(self) -> None:
+        with self.lock:
+            if self.active_task_count == 0 and self.open_submissions == 0:
+                # the state stays SUCCESS unless a task failed or the run was shut down
+                self.is_complete.set()
+
+    def on_complete(
+        self,
+        tasks: Collection["Unit"],  # noqa: F821 # type: ignore
+        callback: Callable[[], None],
+    ) -> None:  # noqa: F821 # type: ignore[name-defined]
+        """
+        Call `callback` (from a worker thread) once all `tasks` have completed.
+        """
+        with self.lock:
+            watcher = CompletionWatcher(
+                remaining=sum(not task.completed for task in tasks), callback=callback
+            )
+            for task in tasks:
+                if not task.completed:
+                    self.completion_watchers.setdefault(task, []).append(watcher)
+
+        if watcher.remaining == 0:
+            callback()
+
+    def restore(self, task: "Unit", output: Schema) -> None:  # noqa: F821 # type: ignore[name-defined]
+        """
+        Complete `task` with a previously computed `output` instead of executing it once
+        it becomes ready.
+        """
+        with self.lock:
+            self.restored_outputs[task] = output
+
+    def evict(self, tasks: Collection["Unit"]) -> None:  # noqa: F821 # type: ignore[name-defined]
+        """
+        Drop all per-task state (including outputs) held for completed `tasks`.
+        """
+        with self.lock:
+            for task in tasks:
+                self.outputs.pop(task, None)
+                self.input_data_map.pop(task, None)
+                self.task_to_call_id.pop(task, None)
+                self.task_contexts.pop(task, None)
+                self.remaining_dependencies.pop(task, None)
+                self.completion_watchers.pop(task, None)
+                self.restored_outputs.pop(task, None)
+
     def submit(
         self,
         tasks: List["Unit"],  # noqa: F821 # type: ignore
@@ -277,32 +389,34 @@ class GraphExecutor:
         execution_context: Optional["ExecutionContext"] = None,
         trace_id: str = None,
         parent_id: str = None,
+        sampled: bool = True,
     ) -> None:  # noqa: F821 # type: ignore[name-defined]
         execution_context = execution_context or self.execution_context
         with self.lock:
             for task in tasks:
                 if getattr(task, "accumulate", False):
-                    self.input_data_map[task] = Schema.of(values=[(input_data,)])
+                    self.input_data_map[task] = AccumulateBuffer()
+                    self.input_data_map[task].add(input_data)
                 else:
                     self.input_data_map[task] = input_data
 
                 # If trace_id or parent_id are provided, create a new ExecutionContext for this task
                 task_execution_context = execution_context
-                if trace_id is not None or parent_id is not None:
+                if trace_id is not None or parent_id is not None or not sampled:
                     task_execution_context = ExecutionContext(
                         tracer=execution_context.tracer,
                         trace_id=trace_id or execution_context.trace_id,
                         parent_id=parent_id
                         if parent_id is not None
                         else execution_context.parent_id,
+                        sampled=sampled and execution_context.sampled,
                     )
 
-                self.task_to_trace_id[task] = task_execution_context.trace_id
-
-                base_logger.debug(
-                    f"Submitting task with input: {input_data.escape()}",
-                    unit=".".join(task.prefix),
-                )
+                if enabled("DEBUG"):
+                    base_logger.debug(
+                        f"Submitting task with input: {input_data.escape()}",
+                        unit=".".join(task.prefix),
+                    )
                 self._try_execute(
                     task, leader, execution_context=task_execution_context
                 )
@@ -314,40 +428,74 @@ class GraphExecutor:
         execution_context: Optional["ExecutionContext"] = None,
     ) -> None:  # noqa: F821 # type: ignore[name-defined]
         execution_context = execution_context or self.execution_context
-        logger = base_logger.bind(unit=".".join(task.prefix))
+        logger = UnitLogger(task.prefix)
         with self.lock:
             if self.is_complete.is_set():
                 logger.error("Exiting early since executor has been marked is_complete")
                 return
 
+            self.task_contexts[task] = execution_context
+
             task.leader = leader
             task.shared.branch.update(ExecutionState.WAITING_FOR_RESOURCES, task)
 
-            if task.is_ready() and task not in self.execution_pool:
+            # tasks that are not ready yet are dispatched by _on_task_complete once
+            # their last dependency completes
+            if (
+                self._remaining_dependencies(task) == 0
+                and task not in self.execution_pool
+            ):
                 self.execution_pool.add(task)
                 self.active_task_count += 1
 
-                input_data = self.input_data_map.get(task, Schema.empty())
-                if getattr(task, "accumulate", False):
-                    input_data = Schema.of(values=[x[0] for x in input_data.values])  # type: ignore
-                    logger.debug(f"Accumulated {len(input_data.values)} values")
+                if task in self.restored_outputs:
+                    logger.debug("Restored output from checkpoint")
+                    self.outputs[task] = task.output = self.restored_outputs.pop(task)
+                    self._on_task_complete(task)
+                    return
+
+                input_data = self.input_data_map.get(task)
+                if isinstance(input_data, AccumulateBuffer):
+                    input_data = Schema.of(values=input_data.values())
+                    logger.debug("Accumulated {} values", len(input_data.values))
+                elif input_data is None:
+                    input_data = (
+                        Schema.of(values=[])
+                        if getattr(task, "accumulate", False)
+                        else Schema.empty()
+                    )
 
                 task.thread_id = next(thread_counter)
+                self._dispatch(task, input_data, leader, execution_context)
 
-                if getattr(task, "lightweight", False):
-                    future = self.lightweight_executor.submit(
-                        self._execute_task, task, input_data, leader, execution_context
-                    )
-                    logger.debug("Submitted to lightweight ThreadPoolExecutor")
-                else:
-                    future = self.executor.submit(
-                        self._execute_task, task, input_data, leader, execution_context
-                    )
-                    logger.debug("Submitted to I/O ThreadPoolExecutor")
+    def _remaining_dependencies(self, task: "Unit") -> int:  # noqa: F821 # type: ignore[name-defined]
+        remaining = self.remaining_dependencies.get(task)
+        if remaining is None:
+            remaining = self.remaining_dependencies[task] = sum(
+                not dep.completed for dep in task.dependencies
+            )
+        return remaining
 
-                future.add_done_callback(lambda _: self._on_task_complete(task))
-            else:
-                self.pending_tasks.add(task)
+    def _dispatch(
+        self,
+        task: "Unit",  # noqa: F821 # type: ignore
+        input_data: Schema,
+        leader: bool,
+        execution_context: "ExecutionContext",
+    ) -> None:  # noqa: F821 # type: ignore[name-defined]
+        logger = UnitLogger(task.prefix)
+        if getattr(task, "lightweight", False):
+            future = self.lightweight_executor.submit(
+                self._execute_task, task, input_data, leader, execution_context
+            )
+            logger.debug("Submitted to lightweight ThreadPoolExecutor")
+        else:
+            future = self.executor.submit(
+                self._execute_task, task, input_data, leader, execution_context
+            )
+            logger.debug("Submitted to I/O ThreadPoolExecutor")
+
+        future.add_done_callback(lambda _: self._on_task_complete(task))
 
     @base_logger.catch()
     def _execute_task(
@@ -358,7 +506,7 @@ class GraphExecutor:
         execution_context: Optional["ExecutionContext"] = None,
     ) -> None:  # noqa: F821 # type: ignore[name-defined]
         execution_context = execution_context or self.execution_context
-        logger = base_logger.bind(unit=".".join(task.prefix), thread_id=task.thread_id)
+        logger = UnitLogger(task.prefix, task.thread_id)
         if self.is_complete.is_set():
             logger.error("Exiting early since executor has been marked is_complete")
             return
@@ -367,131 +515,149 @@ class GraphExecutor:
         task.shared.branch.update(ExecutionState.RUNNING, task)
 
         try:
-            # don't allow pinning if the prompt references the source sample
-            if task.should_pin_output and "source" in task._prompt.get_all_keys():
-                raise ConfigurationError(
-                    "Prompt references source input. Cannot pin result across all samples."
-                )
+            self._check_pinning(task)
 
             if not task.should_pin_output or leader:
                 if task.should_pin_output:
                     logger.debug("Elected as leader.")
-                # Start the trace for this unit execution and store the call_id
-                call_name = (
-                    getattr(task, "_char", None)
-                    or getattr(task, "char", None)
-                    or task.__class__.__name__
-                )
+                # Start the trace for this unit execution and store the call_id. The
+                # Unit records its outputs on this span instead of opening its own,
+                # and is referenced by name so that spans do not keep it alive.
                 with execution_context.trace_call(
-                    name=call_name,
-                    inputs={"input": input_data, "unit": task},
+                    name=task._call_name(),
+                    inputs={"input": input_data, "unit": ".".join(task.prefix)},
                 ) as call:
                     if call is not None:
                         self.task_to_call_id[task] = call.call_id
                     output = task.execute(
-                        input_data, execution_context=execution_context
+                        input_data, execution_context=execution_context.within(call)
                     )
-                    with task.shared.shared_output:
-                        task.shared.output = output
-                        task.shared.shared_output.notify_all()
+                    self._publish_shared_output(task, output)
             else:
                 logger.debug("Waiting for leader to complete.")
-                with task.shared.shared_output:
-                    while task.shared.output is None:
-                        task.shared.shared_output.wait()  # timeout=0.1)
-
-                output = task.shared.output
+                output = self._wait_for_leader(task)
                 logger.debug("Gathered output from leader.")
 
             with self.lock:
                 self.outputs[task] = task.output = output
         except Exception as e:
-            task.shared.branch.update(ExecutionState.FAILED, task)
+            self._mark_failed(task)
+            raise VerdictExecutionTimeError() from e
 
-            with self.execution_state_lock:
-                self.execution_state = GraphExecutor.State.FAILURE
-            self.is_complete.set()
+    def _check_pinning(self, task: "Unit") -> None:  # noqa: F821 # type: ignore[name-defined]
+        # don't allow pinning if the prompt references the source sample
+        if task.should_pin_output and "source" in task._prompt.get_all_keys():
+            raise ConfigurationError(
+                "Prompt references source input. Cannot pin result across all samples."
+            )
 
-            raise VerdictExecutionTimeError() from e
+    def _publish_shared_output(self, task: "Unit", output: Schema) -> None:  # noqa: F821 # type: ignore[name-defined]
+        with task.shared.shared_output:
+            task.shared.output = output
+            task.shared.shared_output.notify_all()
+
+    def _wait_for_leader(self, task: "Unit") -> Schema:  # noqa: F821 # type: ignore[name-defined]
+        with task.shared.shared_output:
+            while task.shared.output is None:
+                task.shared.shared_output.wait()  # timeout=0.1)
+
+        return task.shared.output
+
+    def _mark_failed(self, task: "Unit") -> None:  # noqa: F821 # type: ignore[name-defined]
+        task.shared.branch.update(ExecutionState.FAILED, task)
+
+        with self.execution_state_lock:
+            self.execution_state = GraphExecutor.State.FAILURE
+        self.is_complete.set()
 
     def _on_task_complete(self, task: "Unit") -> None:  # noqa: F821 # type: ignore[name-defined]
-        logger = base_logger.bind(unit=".".join(task.prefix), thread_id=task.thread_id)
+        logger = UnitLogger(task.prefix, task.thread_id)
         if self.is_complete.is_set():
             logger.error("Exiting early since executor has been marked is_complete")
             return
 
+        completed_watchers: List[CompletionWatcher] = []
         with self.lock:
             output = self.outputs[task]
             task.shared.branch.update(ExecutionState.COMPLETE, task)
 
             for dependent in task.dependents:
                 if getattr(dependent, "accumulate", False):
-                    if dependent not in self.input_data_map:
-                        self.input_data_map[dependent] = Schema.of(values=[])
-                    self.input_data_map[dependent].values.append(
-                        (output, getattr(task, "_ordering_timestamp", 0))
-                    )  # type: ignore
-                    self.input_data_map[dependent].values.sort(key=lambda x: x[1])  # type: ignore
+                    buffer = self.input_data_map.get(dependent)
+                    if not isinstance(buffer, AccumulateBuffer):
+                        buffer = self.input_data_map[dependent] = AccumulateBuffer()
+                    buffer.add(output, getattr(task, "_ordering_timestamp", 0))
                 else:
                     self.input_data_map[dependent] = output
 
             task.completed = True
 
-            trace_id = self.task_to_trace_id.get(task, None)
-
+            # O(out-degree): only dependents can become ready as a result of this task
+            ready: Deque[Task] = deque()
             for dependent in task.dependents:
-                if all(dep.completed for dep in dependent.dependencies):
+                if dependent in self.remaining_dependencies:
+                    self.remaining_dependencies[dependent] -= 1
+                if self._remaining_dependencies(dependent) == 0:
+                    ready.append(dependent)
+                elif enabled("DEBUG"):
                     logger.debug(
-                        f"Submitting dependent {'.'.join(dependent.prefix)} since all dependencies are complete."
-                    )
-                    parent_call_id = self.task_to_call_id.get(task, None)
-                    dependent_execution_context = ExecutionContext(
-                        tracer=self.execution_context.tracer,
-                        trace_id=self.task_to_trace_id.get(
-                            task, self.execution_context.trace_id
-                        ),
-                        parent_id=parent_call_id,
-                    )
-                    self._try_execute(
-                        dependent,
-                        task.leader,
-                        execution_context=dependent_execution_context,
+                        "Skipping dependent {} since not all dependencies are complete.",
+                        ".".join(dependent.prefix),
                     )
-                else:
+
+            while ready:
+                dependent = ready.popleft()
+                if enabled("DEBUG"):
                     logger.debug(
-                        f"Skipping dependent {'.'.join(dependent.prefix)} since not all dependencies are complete."
+                        "Submitting dependent {} since all dependencies are complete.",
+                        ".".join(dependent.prefix),
                     )
-
-            ready_tasks = [
-                pending for pending in list(self.pending_tasks) if pending.is_ready()
-            ]
-            for ready_task in ready_tasks:
-                self.pending_tasks.remove(ready_task)
-                logger.debug(
-                    f"Submitting unrelated ready task {'.'.join(ready_task.prefix)}",
-                    unit="",
+                task_execution_context = self.task_contexts.get(
+                    task, self.execution_context
+                )
+                dependent_execution_context = ExecutionContext(
+                    tracer=self.execution_context.tracer,
+                    trace_id=task_execution_context.trace_id,
+                    parent_id=self.task_to_call_id.get(task, None),
+                    sampled=task_execution_context.sampled,
                 )
                 self._try_execute(
-                    ready_task,
-                    ready_task.leader,
-                    execution_context=self.execution_context,
+                    dependent,
+                    task.leader,
+                    execution_context=dependent_execution_context,
                 )
 
+            for watcher in self.completion_watchers.pop(task, []):
+                watcher.remaining -= 1
+                if watcher.remaining == 0:
+                    completed_watchers.append(watcher)
+
+            self.remaining_dependencies.pop(task, None)
             self.execution_pool.remove(task)
-            self.active_task_count -= 1
 
-            if self.active_task_count == 0:
-                with self.execution_state_lock:
-                    self.execution_state = GraphExecutor.State.SUCCESS
-                self.is_complete.set()
+        # run callbacks while this task still counts as active so that the executor is
+        # not marked complete before they finish
+        for watcher in completed_watchers:
+            try:
+                watcher.callback()
+            except Exception:
+                # e.g., a row whose outputs could not be collected; fail the run
+                # instead of returning results without it
+                logger.exception("Completion callback failed")
+                self._mark_failed(task)
+
+        with self.lock:
+            self.active_task_count -= 1
+            self._check_complete()
 
     def wait_for_completion(self, graceful: bool = False) -> None:
         self.is_complete.wait()
 
-        base_logger.info(f"GraphExecutor completed in state {self.execution_state}")
+        base_logger.info(
+            f"{self.__class__.__name__} completed in state {self.execution_state}"
+        )
 
-        self.executor.shutdown(wait=False, cancel_futures=True)
-        self.lightweight_executor.shutdown(wait=False, cancel_futures=True)
+        self.shutdown()
 
         if self.execution_state == GraphExecutor.State.FAILURE:
             base_logger.critical("GraphExecutor failed.")
@@ -514,6 +680,10 @@ class GraphExecutor:
                 return
             raise VerdictSystemError("Executor terminated.")
 
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.lightweight_executor.shutdown(wait=False, cancel_futures=True)
+
     def save(self, path: Path) -> None:
         with open(path, "wb") as f:
             dill.dump(self, f)
@@ -524,6 +694,172 @@ class GraphExecutor:
             return dill.load(f)
 
 
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_pid: Optional[int] = None
+_event_loop_lock = threading.Lock()
+
+
+def background_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the process-wide asyncio event loop used by AsyncGraphExecutor, starting it
+    on a daemon thread on first use. A single long-lived loop lets LiteLLM reuse its
+    async HTTP clients (which are bound to a loop) across pipeline runs.
+    """
+    global _event_loop, _event_loop_pid
+    with _event_loop_lock:
+        if _event_loop is None or _event_loop_pid != os.getpid():
+            _event_loop = asyncio.new_event_loop()
+            _event_loop_pid = os.getpid()
+            threading.Thread(
+                target=_event_loop.run_forever, name="verdict-event-loop", daemon=True
+            ).start()
+    return _event_loop
+
+
+class AsyncGraphExecutor(GraphExecutor):
+    """
+    Schedules the same Unit DAG as GraphExecutor, but as coroutines on a background
+    asyncio event loop instead of one blocking thread per Unit.
+
+    Rate limits and inference calls are awaited (see `Unit.aexecute`), so `max_workers`
+    bounds the number of in-flight Units rather than threads and can be set in the
+    thousands. Lightweight units (e.g., MapUnit) and sync user code are offloaded to a
+    small thread pool so existing pipelines run unchanged.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        execution_context: Optional["ExecutionContext"] = None,
+    ) -> None:
+        self.max_concurrency = max_workers
+        self.loop = background_event_loop()
+        self.lightweight_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.LIGHTWEIGHT_EXECUTOR_WORKER_COUNT
+        )
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running: Set[asyncio.Task] = set()
+
+        self._init_state(execution_context)
+
+    def submit(self, *args, **kwargs) -> None:
+        # all scheduling state is only touched from the event loop thread; submissions
+        # are queued in order without waiting on the loop
+        self.loop.call_soon_threadsafe(self._submit_on_loop, args, kwargs)
+
+    def _submit_on_loop(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        try:
+            super().submit(*args, **kwargs)
+        except Exception:
+            base_logger.exception("Failed to submit tasks to AsyncGraphExecutor")
+            with self.execution_state_lock:
+                self.execution_state = GraphExecutor.State.FAILURE
+            self.is_complete.set()
+
+    def _close_submission(self) -> None:
+        # queued behind any submissions that have not yet reached the loop
+        self.loop.call_soon_threadsafe(super()._close_submission)
+
+    def _dispatch(
+        self,
+        task: "Unit",  # noqa: F821 # type: ignore
+        input_data: Schema,
+        leader: bool,
+        execution_context: "ExecutionContext",
+    ) -> None:  # noqa: F821 # type: ignore[name-defined]
+        running = self.loop.create_task(
+            self._run_task(task, input_data, leader, execution_context)
+        )
+        self._running.add(running)
+        running.add_done_callback(self._running.discard)
+
+    async def _run_task(
+        self,
+        task: "Unit",  # noqa: F821 # type: ignore
+        input_data: Schema,
+        leader: bool,
+        execution_context: "ExecutionContext",
+    ) -> None:  # noqa: F821 # type: ignore[name-defined]
+        try:
+            if getattr(task, "lightweight", False):
+                await self.loop.run_in_executor(
+                    self.lightweight_executor,
+                    functools.partial(
+                        contextvars.copy_context().run,
+                        self._execute_task,
+                        task,
+                        input_data,
+                        leader,
+                        execution_context,
+                    ),
+                )
+            else:
+                if self._semaphore is None:
+                    self._semaphore = asyncio.Semaphore(
+                        self.max_concurrency or sys.maxsize
+                    )
+                async with self._semaphore:
+                    await self._aexecute_task(
+                        task, input_data, leader, execution_context
+                    )
+        finally:
+            self._on_task_complete(task)
+
+    @base_logger.catch()
+    async def _aexecute_task(
+        self,
+        task: "Unit",  # noqa: F821 # type: ignore
+        input_data: Schema,
+        leader: bool,
+        execution_context: Optional["ExecutionContext"] = None,
+    ) -> None:  # noqa: F821 # type: ignore[name-defined]
+        execution_context = execution_context or self.execution_context
+        logger = UnitLogger(task.prefix, task.thread_id)
+        if self.is_complete.is_set():
+            logger.error("Exiting early since executor has been marked is_complete")
+            return
+
+        logger.debug("Started executor coroutine")
+        task.shared.branch.update(ExecutionState.RUNNING, task)
+
+        try:
+            self._check_pinning(task)
+
+            if not task.should_pin_output or leader:
+                if task.should_pin_output:
+                    logger.debug("Elected as leader.")
+                with execution_context.trace_call(
+                    name=task._call_name(),
+                    inputs={"input": input_data, "unit": ".".join(task.prefix)},
+                ) as call:
+                    if call is not None:
+                        self.task_to_call_id[task] = call.call_id
+                    output = await task.aexecute(
+                        input_data, execution_context=execution_context.within(call)
+                    )
+                    self._publish_shared_output(task, output)
+            else:
+                logger.debug("Waiting for leader to complete.")
+                output = await asyncio.to_thread(self._wait_for_leader, task)
+                logger.debug("Gathered output from leader.")
+
+            with self.lock:
+                self.outputs[task] = task.output = output
+        except Exception as e:
+            self._mark_failed(task)
+            raise VerdictExecutionTimeError() from e
+
+    def shutdown(self) -> None:
+        def cancel() -> None:
+            for running in list(self._running):
+                running.cancel()
+
+        if self.execution_state != GraphExecutor.State.SUCCESS:
+            self.loop.call_soon_threadsafe(cancel)
+        self.lightweight_executor.shutdown(wait=False, cancel_futures=True)
+
+
 T = TypeVar("T", bound="Node")
 
 
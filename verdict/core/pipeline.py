@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import functools
+import multiprocessing
+import queue
+import threading
+import traceback
 from contextlib import nullcontext
+from multiprocessing.connection import Connection, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import rich.console
 import rich.layout
@@ -12,15 +18,24 @@ import rich.tree
 from PIL import Image
 from typing_extensions import Self
 
-from verdict.core.executor import GraphExecutor
+from verdict import config
+from verdict.core.checkpoint import CheckpointKey, CheckpointLog
+from verdict.core.executor import AsyncGraphExecutor, Graph, GraphExecutor
 from verdict.core.primitive import Block, Layer, MaterializationContext, Unit
 from verdict.core.visualization import StreamingLayoutManager
 from verdict.dataset import DatasetWrapper
 from verdict.model import ModelSelectionPolicy
 from verdict.schema import Schema
-from verdict.util.exceptions import VerdictDeclarationTimeError
+from verdict.util import background, ratelimit
+from verdict.util.cache import ResponseCache
+from verdict.util.exceptions import (
+    ConfigurationError,
+    VerdictDeclarationTimeError,
+    VerdictSystemError,
+)
 from verdict.util.log import init_logger, logger
 from verdict.util.misc import keyboard_interrupt_safe
+from verdict.util.ratelimit import RateLimitPolicy
 from verdict.util.tracing import (
     ExecutionContext,
     Tracer,
@@ -28,12 +43,22 @@ from verdict.util.tracing import (
     ensure_tracing_manager,
 )
 
+EXECUTORS: Dict[str, Type[GraphExecutor]] = {
+    "thread": GraphExecutor,
+    "async": AsyncGraphExecutor,
+}
+
 
 class Pipeline:
     name: str
     block: Block
     executor: GraphExecutor
     default_tracer: Optional[Union[Tracer, List[Tracer]]]
+    checkpoint_log: Optional[CheckpointLog]
+    resume: bool
+    restored_outputs: Optional[Dict[CheckpointKey, Schema]]
+    deduplicate: bool
+    dedup_stats: Dict[str, int]
 
     def __init__(
         self,
@@ -51,6 +76,11 @@ class Pipeline:
         self.name = name
         self.block = Block()
         self.default_tracer: TracingManager = ensure_tracing_manager(tracer)
+        self.checkpoint_log = None
+        self.resume = False
+        self.restored_outputs = None  # loaded by the parent of a sharded run
+        self.deduplicate = False
+        self.dedup_stats = {}
 
     def add_tracer(self, tracer: Tracer) -> None:
         """
@@ -79,6 +109,52 @@ class Pipeline:
         self.block.via(policy_or_name, retries, **inference_parameters)
         return self
 
+    def cache(self, cache: Optional[ResponseCache] = None) -> Self:
+        """
+        Cache provider responses for every Unit that has not configured its own cache
+        (`Unit.cache(...)`). Responses are keyed on the model, connection and inference
+        parameters, response_model schema and messages (excluding the nonce), so
+        repeated runs only call the provider for new or changed requests.
+
+        Args:
+            cache: The response cache to use. Defaults to a SQLiteCache under
+                `config.VERDICT_LOG_DIR`.
+        """
+
+        def set_default(graph: Graph) -> None:
+            # unlike Graph.set, keep caches configured on nested Layers/Blocks
+            for node in graph.nodes:
+                if isinstance(node, Graph):
+                    set_default(node)
+                else:
+                    node.set("response_cache", cache or True)
+
+        set_default(self.block)
+        return self
+
+    def dedup(self, enabled: bool = True) -> Self:
+        """
+        Execute each distinct input Schema (as produced by the dataset's `input_fn`)
+        only once in `run_from_dataset` / `stream_from_dataset`, and fan its outputs
+        out to every row with the same input. After a run, `dedup_stats` reports the
+        number of rows, duplicate rows and Unit calls saved.
+
+        Args:
+            enabled: Whether to deduplicate rows.
+        """
+        self.deduplicate = enabled
+        return self
+
+    def _report_dedup(self, rows: int, duplicates: int, prototype: Block) -> None:
+        self.dedup_stats = {
+            "rows": rows,
+            "duplicates": duplicates,
+            "calls_saved": duplicates * len(prototype.nodes),
+        }
+        logger.info(
+            f"Deduplicated {duplicates} of {rows} rows, saving {self.dedup_stats['calls_saved']} Unit calls"
+        )
+
     def collect_outputs(
         self, executor: GraphExecutor, block_instance: Block
     ) -> Tuple[Dict[str, Schema], List[str]]:
@@ -109,6 +185,18 @@ class Pipeline:
 
         return outputs, sorted(list(leaf_node_prefixes))
 
+    @staticmethod
+    def create_executor(
+        executor: str, max_workers: int, execution_context: ExecutionContext
+    ) -> GraphExecutor:
+        if executor not in EXECUTORS:
+            raise ConfigurationError(
+                f"Unknown executor '{executor}'. Expected one of {list(EXECUTORS)}."
+            )
+        return EXECUTORS[executor](
+            max_workers=max_workers, execution_context=execution_context
+        )
+
     @keyboard_interrupt_safe
     def run(
         self,
@@ -117,6 +205,7 @@ class Pipeline:
         display: bool = False,
         graceful: bool = False,
         tracers: Optional[Union[Tracer, List[Tracer]]] = None,
+        executor: str = "thread",
     ) -> Tuple[Dict[str, Schema], List[str]]:
         """
         Run the pipeline.
@@ -127,6 +216,8 @@ class Pipeline:
             display: Whether to display live output.
             graceful: Whether to shut down gracefully.
             tracers: Optional tracer(s) to override the pipeline's tracers for this run.
+            executor: "thread" (GraphExecutor) or "async" (AsyncGraphExecutor). With
+                "async", max_workers bounds in-flight Units rather than threads.
 
         Returns:
             Tuple of outputs and leaf node prefixes.
@@ -141,15 +232,14 @@ class Pipeline:
             tracer=tracer_to_use,
             parent_id=None,
         )
-        self.executor = GraphExecutor(
-            max_workers=max_workers, execution_context=execution_context
-        )
+        self.executor = self.create_executor(executor, max_workers, execution_context)
 
         with execution_context.trace_call(
             name=f"{getattr(self, 'name', None) or self.__class__.__name__}",
             inputs={
                 "input_data": input_data,
                 "max_workers": max_workers,
+                "executor": executor,
                 "display": display,
                 "graceful": graceful,
             },
@@ -194,6 +284,7 @@ class Pipeline:
                     parent_id=call.call_id
                     if call is not None
                     else execution_context.call_id,
+                    sampled=execution_context.sample(),
                 )  # type: ignore
                 self.executor.wait_for_completion(graceful=graceful)
 
@@ -212,6 +303,10 @@ class Pipeline:
         display: bool = False,
         graceful: bool = False,
         tracers: Optional[Union[Tracer, List[Tracer]]] = None,
+        executor: str = "thread",
+        max_inflight_samples: Optional[int] = None,
+        resume: bool = False,
+        processes: Optional[int] = None,
     ) -> Tuple["pd.DataFrame", List[str]]:
         """
         Run the pipeline on a dataset.
@@ -223,10 +318,38 @@ class Pipeline:
             display: Whether to display live output.
             graceful: Whether to shut down gracefully.
             tracers: Optional tracer(s) to override the pipeline's tracers for this run.
+            executor: "thread" (GraphExecutor) or "async" (AsyncGraphExecutor). With
+                "async", max_workers bounds in-flight Units rather than threads.
+            max_inflight_samples: If set, only this many rows are materialized and
+                executing at a time; a new row is admitted as each earlier row
+                completes, and its Units are released once its outputs are collected.
+            resume: Skip Units whose outputs were recorded by the checkpoint log (see
+                `checkpoint`) and only run the remaining ones.
+            processes: If set, split the dataset into this many contiguous shards and
+                run each in a forked worker process with 1/`processes` of every rate
+                limit (except shared rate limiters, which are already coordinated).
+                Rows are deduplicated within each shard. POSIX only.
 
         Returns:
             Tuple of DataFrame and leaf node prefixes.
         """
+        if max_inflight_samples is not None and max_inflight_samples < 1:
+            raise ConfigurationError("max_inflight_samples must be at least 1.")
+        if processes is not None and processes > 1 and len(dataset) > 1:
+            if display:
+                raise ConfigurationError("Cannot display a run with processes > 1.")
+            return self._run_sharded(
+                dataset,
+                processes,
+                max_workers=max_workers,
+                graceful=graceful,
+                tracers=tracers,
+                executor=executor,
+                max_inflight_samples=max_inflight_samples,
+                resume=resume,
+            )
+        restored_outputs = self._restore_outputs(resume)
+
         self.block = self.block.copy()
         init_logger(self.name)
         logger.info(f"Running pipeline {self.name} on dataset (len={len(dataset)})")
@@ -237,9 +360,7 @@ class Pipeline:
             tracer=tracer_to_use,
             parent_id=None,
         )
-        self.executor = GraphExecutor(
-            max_workers=max_workers, execution_context=execution_context
-        )
+        self.executor = self.create_executor(executor, max_workers, execution_context)
 
         dataset_df = dataset.samples.copy()
         with execution_context.trace_call(
@@ -247,6 +368,8 @@ class Pipeline:
             inputs={
                 "dataset": dataset_df,
                 "max_workers": max_workers,
+                "executor": executor,
+                "max_inflight_samples": max_inflight_samples,
                 "experiment_config": experiment_config,
                 "display": display,
                 "graceful": graceful,
@@ -256,6 +379,8 @@ class Pipeline:
                 rich.live.Live(auto_refresh=True) if display else nullcontext()
             ) as live:  # type: ignore
                 block_instances: Dict[str, Block] = {}
+                row_outputs: Dict[str, Optional[Dict[str, Any]]] = {}
+                leaf_node_prefixes = set()
 
                 context = MaterializationContext(n_instances=len(dataset))
                 if display:
@@ -296,37 +421,90 @@ class Pipeline:
 
                 prototype, _ = self.block._materialize(context)
 
-                for idx, (row, input_data) in enumerate(dataset):
-                    block_instance = block_instances[row["hash(row)"]] = (
-                        prototype.clone()
+                def collect_row(row_id: str, block_instance: Block) -> None:
+                    outputs, _leaf_node_prefixes = self.collect_outputs(
+                        self.executor, block_instance
                     )
-                    block_instance.source_input = input_data
-                    block_instance.executor = self.executor
-
-                    self.executor.submit(
-                        block_instance.root_nodes,
-                        input_data,
-                        trace_id=execution_context.trace_id,
-                        parent_id=call.call_id
-                        if call is not None
-                        else execution_context.call_id,
-                    )  # type: ignore
+                    row_outputs[row_id] = {"hash(row)": row_id, **outputs}
+                    leaf_node_prefixes.update(_leaf_node_prefixes)
 
-                self.executor.wait_for_completion(graceful=graceful)
+                def release_row(row_id: str, block_instance: Block) -> None:
+                    try:
+                        collect_row(row_id, block_instance)
+                        self.executor.evict(block_instance.nodes)
+                        for node in block_instance.nodes:
+                            node.shared.remove(node)
+                    finally:
+                        inflight_samples.release()
+
+                if max_inflight_samples is not None:
+                    inflight_samples = threading.Semaphore(max_inflight_samples)
+
+                leaders: Dict[int, int] = {}  # input hash -> row executed for it
+                duplicates: Dict[int, int] = {}  # row -> row executed for its input
+                with self.executor.submitting():
+                    for idx, (row, input_data) in enumerate(dataset):
+                        row_id = row["hash(row)"]
+                        if self.deduplicate:
+                            leader = leaders.setdefault(
+                                DatasetWrapper.hash_input(input_data), row_id
+                            )
+                            if leader != row_id:
+                                duplicates[row_id] = leader
+                                row_outputs.setdefault(row_id, None)
+                                continue
+
+                        if max_inflight_samples is not None and not self._admit(
+                            inflight_samples
+                        ):
+                            break
+
+                        block_instance = prototype.clone()
+                        block_instance.source_input = input_data
+                        block_instance.executor = self.executor
+
+                        row_outputs.setdefault(row_id, None)
+                        self._checkpoint_units(row_id, block_instance, restored_outputs)
+                        if max_inflight_samples is not None:
+                            self.executor.on_complete(
+                                block_instance.nodes,
+                                functools.partial(release_row, row_id, block_instance),
+                            )
+                        else:
+                            block_instances[row_id] = block_instance
+
+                        self.executor.submit(
+                            block_instance.root_nodes,
+                            input_data,
+                            trace_id=execution_context.trace_id,
+                            parent_id=call.call_id
+                            if call is not None
+                            else execution_context.call_id,
+                            sampled=execution_context.sample(),
+                        )  # type: ignore
+
+                try:
+                    self.executor.wait_for_completion(graceful=graceful)
+                finally:
+                    if self.checkpoint_log is not None:
+                        self.checkpoint_log.close()
 
-                output = []
-                leaf_node_prefixes = set()
                 for row_id, block_instance in block_instances.items():
-                    row_output = {"hash(row)": row_id}
-                    outputs, _leaf_node_prefixes = self.collect_outputs(
-                        self.executor, block_instance
+                    collect_row(row_id, block_instance)
+
+                if self.deduplicate:
+                    for row_id, leader in duplicates.items():
+                        if (outputs := row_outputs.get(leader)) is not None:
+                            row_outputs[row_id] = {**outputs, "hash(row)": row_id}
+                    self._report_dedup(
+                        len(leaders) + len(duplicates), len(duplicates), prototype
                     )
 
-                    row_output.update(outputs)
-                    leaf_node_prefixes.update(_leaf_node_prefixes)
-
-                    if len(row_output) > 1:
-                        output.append(row_output)
+                output = [
+                    row_output
+                    for row_output in row_outputs.values()
+                    if row_output is not None and len(row_output) > 1
+                ]
 
                 if len(output) > 0:
                     import pandas as pd
@@ -347,6 +525,330 @@ class Pipeline:
 
                 return result_df, sorted(list(leaf_node_prefixes))
 
+    def _run_sharded(
+        self, dataset: DatasetWrapper, processes: int, **kwargs
+    ) -> Tuple["pd.DataFrame", List[str]]:
+        import pandas as pd
+
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ConfigurationError(
+                "processes requires the 'fork' start method, which is only available on POSIX."
+            )
+
+        shares = min(processes, len(dataset))
+        bounds = [len(dataset) * i // shares for i in range(shares + 1)]
+        logger.info(
+            f"Running pipeline {self.name} on dataset (len={len(dataset)}) in {shares} processes"
+        )
+        # load (and repair) the checkpoint log once, before the workers append to it
+        restored_outputs = self._restore_outputs(kwargs.pop("resume"))
+
+        # forked, so the pipeline (including its locks and lambdas) is not pickled; see
+        # verdict.util.background for why that is safe
+        background.quiesce()
+        context = multiprocessing.get_context("fork")
+        workers: Dict[Any, Tuple[int, Any]] = {}
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            shard = dataset.shard(start, end)
+            row_ids = set(shard.samples["hash(row)"])
+            reader, writer = context.Pipe(duplex=False)
+            worker = context.Process(
+                target=self._run_shard,
+                args=(
+                    shard,
+                    shares,
+                    writer,
+                    {
+                        key: output
+                        for key, output in restored_outputs.items()
+                        if key[0] in row_ids
+                    },
+                    kwargs,
+                ),
+                name=f"{self.name}-shard-{index}",
+            )
+            worker.start()
+            writer.close()
+            workers[reader] = (index, worker)
+
+        results: Dict[int, Tuple[str, Any]] = {}
+        pending = list(workers)
+        while pending:
+            for reader in wait(pending):
+                index, worker = workers[reader]
+                try:
+                    results[index] = reader.recv()
+                except EOFError:
+                    worker.join()
+                    results[index] = (
+                        "error",
+                        f"exited with code {worker.exitcode} before sending its results",
+                    )
+                reader.close()
+                pending.remove(reader)
+
+        for _, worker in workers.values():
+            worker.join()
+
+        errors = [
+            f"shard {index}: {result}"
+            for index, (status, result) in sorted(results.items())
+            if status == "error"
+        ]
+        if errors:
+            raise VerdictSystemError("Worker processes failed:\n" + "\n".join(errors))
+
+        # contiguous shards, so concatenating them in order keeps the dataset order
+        frames, leaf_node_prefixes = [], set()
+        dedup_stats: Dict[str, int] = {}
+        for index in range(shares):
+            result_df, prefixes, shard_dedup_stats = results[index][1]
+            frames.append(result_df)
+            leaf_node_prefixes.update(prefixes)
+            for key, value in shard_dedup_stats.items():
+                dedup_stats[key] = dedup_stats.get(key, 0) + value
+        if self.deduplicate:
+            self.dedup_stats = dedup_stats
+
+        return pd.concat(frames, ignore_index=True), sorted(leaf_node_prefixes)
+
+    def _run_shard(
+        self,
+        shard: DatasetWrapper,
+        shares: int,
+        connection: Connection,
+        restored_outputs: Dict[CheckpointKey, Schema],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        try:
+            self.restored_outputs = restored_outputs
+            ratelimit.split(self._rate_limit_policies(), shares)
+            result_df, leaf_node_prefixes = self.run_from_dataset(shard, **kwargs)
+            connection.send(("ok", (result_df, leaf_node_prefixes, self.dedup_stats)))
+        except BaseException:
+            connection.send(("error", traceback.format_exc()))
+        finally:
+            connection.close()
+
+    def _rate_limit_policies(self) -> List[RateLimitPolicy]:
+        policies = [*config.PROVIDER_RATE_LIMITER.values(), config.DEFAULT_RATE_LIMITER]
+        model_selection_policies = [config.DEFAULT_MODEL_SELECTION_POLICY]
+
+        def visit(graph: Graph) -> None:
+            for node in graph.nodes:
+                if isinstance(node, Graph):
+                    visit(node)
+                elif getattr(node, "model_selection_policy", None) is not None:
+                    model_selection_policies.append(node.model_selection_policy)
+
+        visit(self.block)
+        for model_selection_policy in model_selection_policies:
+            for model, _, _ in model_selection_policy.client_configs:
+                policies.append(model.rate_limit)
+        return policies
+
+    def stream_from_dataset(
+        self,
+        dataset: DatasetWrapper,
+        max_workers: int = 128,
+        graceful: bool = False,
+        tracers: Optional[Union[Tracer, List[Tracer]]] = None,
+        executor: str = "thread",
+        max_inflight_samples: Optional[int] = None,
+        resume: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run the pipeline on a dataset, yielding each row as soon as its leaf nodes
+        complete (i.e., in completion order, not dataset order).
+
+        Each yielded dict has the dataset columns of the row plus the output columns
+        named as in `collect_outputs` -- the same columns as a row of the DataFrame
+        returned by `run_from_dataset`. Outputs are released from the executor once a
+        row is yielded.
+
+        Args:
+            dataset: The dataset wrapper.
+            max_workers: Number of workers.
+            graceful: Whether to shut down gracefully.
+            tracers: Optional tracer(s) to override the pipeline's tracers for this run.
+            executor: "thread" (GraphExecutor) or "async" (AsyncGraphExecutor).
+            max_inflight_samples: If set, only this many rows are executing at a time.
+            resume: Skip Units recorded by the checkpoint log (see `checkpoint`).
+
+        Returns:
+            Iterator of per-row output dicts.
+        """
+        if max_inflight_samples is not None and max_inflight_samples < 1:
+            raise ConfigurationError("max_inflight_samples must be at least 1.")
+        restored_outputs = self._restore_outputs(resume)
+
+        self.block = self.block.copy()
+        init_logger(self.name)
+        logger.info(f"Streaming pipeline {self.name} on dataset (len={len(dataset)})")
+        if tracers is not None:
+            self.default_tracer = ensure_tracing_manager(tracers)
+        execution_context = ExecutionContext(
+            tracer=self.default_tracer,
+            parent_id=None,
+        )
+        self.executor = self.create_executor(executor, max_workers, execution_context)
+
+        dataset_columns = [
+            column for column in dataset.samples.columns if column != "hash(row)"
+        ]
+        results: queue.Queue[Dict[str, Any]] = queue.Queue()
+        inflight_samples = threading.Semaphore(
+            max_inflight_samples or len(dataset) or 1
+        )
+        admitted = 0
+        admitted_all = threading.Event()
+
+        # with dedup, rows whose input is already scheduled wait for that row instead
+        dedup_lock = threading.Lock()
+        leaders: Dict[int, int] = {}  # input hash -> row executed for it
+        followers: Dict[int, List[Dict[str, Any]]] = {}  # row -> duplicate rows
+        completed: Dict[int, Dict[str, Schema]] = {}  # outputs of executed rows
+        duplicates = 0
+
+        def put_row(row: Dict[str, Any], outputs: Dict[str, Schema]) -> None:
+            results.put(
+                {
+                    **{column: row.get(column) for column in dataset_columns},
+                    **outputs,
+                }
+            )
+
+        def release_row(row: Dict[str, Any], block_instance: Block) -> None:
+            try:
+                outputs, _ = self.collect_outputs(self.executor, block_instance)
+                self.executor.evict(block_instance.nodes)
+                for node in block_instance.nodes:
+                    node.shared.remove(node)
+
+                rows = [row]
+                if self.deduplicate:
+                    with dedup_lock:
+                        completed[row["hash(row)"]] = outputs
+                        rows += followers.pop(row["hash(row)"], [])
+                for released in rows:
+                    put_row(released, outputs)
+            finally:
+                inflight_samples.release()
+
+        def is_duplicate(row: Dict[str, Any], input_data: Schema) -> bool:
+            nonlocal admitted, duplicates
+            input_id = DatasetWrapper.hash_input(input_data)
+            with dedup_lock:
+                leader = leaders.setdefault(input_id, row["hash(row)"])
+                if leader == row["hash(row)"]:
+                    return False
+
+                admitted += 1
+                duplicates += 1
+                if (outputs := completed.get(leader)) is None:
+                    followers.setdefault(leader, []).append(row)
+                    return True
+            put_row(row, outputs)
+            return True
+
+        def admit(call_id: str) -> None:
+            nonlocal admitted
+            try:
+                with self.executor.submitting():
+                    for row, input_data in dataset:
+                        if self.deduplicate and is_duplicate(row, input_data):
+                            continue
+                        if not self._admit(inflight_samples):
+                            break
+
+                        block_instance = prototype.clone()
+                        block_instance.source_input = input_data
+                        block_instance.executor = self.executor
+
+                        self._checkpoint_units(
+                            row["hash(row)"], block_instance, restored_outputs
+                        )
+                        self.executor.on_complete(
+                            block_instance.leaf_nodes,
+                            functools.partial(release_row, row, block_instance),
+                        )
+                        admitted += 1
+                        self.executor.submit(
+                            block_instance.root_nodes,
+                            input_data,
+                            trace_id=execution_context.trace_id,
+                            parent_id=call_id,
+                            sampled=execution_context.sample(),
+                        )  # type: ignore
+            except Exception:
+                logger.exception("Failed to admit rows")
+                self.executor.graceful_shutdown()
+            finally:
+                if self.deduplicate:
+                    self._report_dedup(len(leaders) + duplicates, duplicates, prototype)
+                admitted_all.set()
+
+        with execution_context.trace_call(
+            name=f"{getattr(self, 'name', None) or self.__class__.__name__}",
+            inputs={
+                "dataset": dataset.samples,
+                "max_workers": max_workers,
+                "executor": executor,
+                "max_inflight_samples": max_inflight_samples,
+                "graceful": graceful,
+            },
+        ) as call:
+            prototype, _ = self.block._materialize(
+                MaterializationContext(n_instances=len(dataset))
+            )
+            threading.Thread(
+                target=admit,
+                args=(call.call_id if call is not None else execution_context.call_id,),
+                name=f"{self.name}-admit",
+                daemon=True,
+            ).start()
+
+            yielded = 0
+            finished = False
+            try:
+                while not (admitted_all.is_set() and yielded == admitted):
+                    try:
+                        row_output = results.get(timeout=0.1)
+                    except queue.Empty:
+                        if (
+                            self.executor.is_complete.is_set()
+                            and self.executor.execution_state
+                            != GraphExecutor.State.SUCCESS
+                        ):
+                            break
+                        continue
+
+                    yielded += 1
+                    yield row_output
+                finished = True
+            except KeyboardInterrupt:
+                self.executor.graceful_shutdown()
+            finally:
+                # the last row is yielded before its task is marked complete
+                if not finished and not self.executor.is_complete.is_set():
+                    # consumer stopped iterating early
+                    self.executor.graceful_shutdown()
+                    self.executor.shutdown()
+
+            try:
+                self.executor.wait_for_completion(graceful=graceful)
+            finally:
+                if self.checkpoint_log is not None:
+                    self.checkpoint_log.close()
+            logger.info(f"Pipeline {self.name} completed")
+
+    def _admit(self, inflight_samples: threading.Semaphore) -> bool:
+        # stop admitting rows if the executor fails or is shut down
+        while not inflight_samples.acquire(timeout=0.1):
+            if self.executor.is_complete.is_set():
+                return False
+        return True
+
     @keyboard_interrupt_safe
     def run_from_list(
         self,
@@ -356,6 +858,10 @@ class Pipeline:
         display: bool = False,
         graceful: bool = False,
         tracers: Optional[Union[Tracer, List[Tracer]]] = None,
+        executor: str = "thread",
+        max_inflight_samples: Optional[int] = None,
+        resume: bool = False,
+        processes: Optional[int] = None,
     ) -> Tuple[Dict[str, Schema], List[str]]:
         """
         Run the pipeline on a list of Schemas.
@@ -367,6 +873,12 @@ class Pipeline:
             display: Whether to display live output.
             graceful: Whether to shut down gracefully.
             tracers: Optional tracer(s) to override the pipeline's tracers for this run.
+            executor: "thread" (GraphExecutor) or "async" (AsyncGraphExecutor). With
+                "async", max_workers bounds in-flight Units rather than threads.
+            max_inflight_samples: If set, only this many rows are executing at a time.
+            resume: Skip Units recorded by the checkpoint log (see `checkpoint`).
+            processes: If set, run shards of the list in this many worker processes
+                (see `run_from_dataset`).
 
         Returns:
             Tuple of outputs and leaf node prefixes.
@@ -383,15 +895,72 @@ class Pipeline:
             display,
             graceful,
             tracers=tracers,
+            executor=executor,
+            max_inflight_samples=max_inflight_samples,
+            resume=resume,
+            processes=processes,
         )
 
-    def checkpoint(self, path: Path):
-        # TODO
-        pass
+    def checkpoint(self, path: Union[str, Path]) -> Self:
+        """
+        Record each Unit output to an append-only checkpoint log as soon as it completes
+        in `run_from_dataset` / `stream_from_dataset`. Records are keyed by `hash(row)`
+        and Unit prefix, so an interrupted run can be resumed with `resume=True` (or
+        `restore`) without repeating completed Units. `hash(row)` depends on the values
+        of the row, not its position, so the dataset may be reordered in between.
+
+        Args:
+            path: The checkpoint log file. Appended to if it already exists.
+        """
+        self.checkpoint_log = CheckpointLog(path)
+        return self
+
+    def restore(self, path: Union[str, Path]) -> Self:
+        """
+        Resume from the checkpoint log at `path`: the next `run_from_dataset` /
+        `stream_from_dataset` only schedules Units that have not been recorded, and
+        continues to record new outputs to the same log.
+
+        Args:
+            path: The checkpoint log file written by a previous run.
+        """
+        self.checkpoint(path)
+        self.resume = True
+        return self
 
-    def restore(self, path: Path):
-        # TODO
-        pass
+    def _restore_outputs(self, resume: bool) -> Dict[CheckpointKey, Schema]:
+        if self.restored_outputs is not None:
+            return self.restored_outputs
+        if not (resume or self.resume):
+            return {}
+
+        if self.checkpoint_log is None:
+            raise ConfigurationError(
+                "Cannot resume without a checkpoint log. Use .checkpoint(path) first."
+            )
+        return self.checkpoint_log.load()
+
+    def _checkpoint_units(
+        self,
+        row_id: int,
+        block_instance: Block,
+        restored_outputs: Dict[CheckpointKey, Schema],
+    ) -> None:
+        if self.checkpoint_log is None:
+            return
+
+        for node in block_instance.nodes:
+            prefix = ".".join(node.prefix)
+            if (row_id, prefix) in restored_outputs:
+                self.executor.restore(node, restored_outputs[(row_id, prefix)])
+            else:
+                self.executor.on_complete(
+                    [node],
+                    functools.partial(self._record_output, row_id, prefix, node),
+                )
+
+    def _record_output(self, row_id: int, prefix: str, node: Unit) -> None:
+        self.checkpoint_log.record(row_id, prefix, node.output)  # type: ignore
 
     def plot(self, display=False) -> Image.Image:
         return self.block.materialize().plot(display)
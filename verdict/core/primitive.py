@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import operator
 import time
@@ -6,6 +7,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from itertools import cycle
 from typing import (
+    Any,
     Callable,
     Dict,
     Generic,
@@ -39,10 +41,11 @@ import verdict.config as config
 from verdict.core.executor import ExecutionState, Graph, Node, Task
 from verdict.core.synchronization import SynchronizationState, UserState
 from verdict.core.visualization import BranchManager, StreamingLayoutManager
-from verdict.extractor import Extractor
-from verdict.model import ModelConfigurable, ModelSelectionPolicy
+from verdict.extractor import Extractor, Usage
+from verdict.model import ClientWrapper, ModelConfigurable, ModelSelectionPolicy
 from verdict.prompt import Promptable, PromptMessage
 from verdict.schema import Schema
+from verdict.util.cache import CacheScope, ResponseCache, cache_scope
 from verdict.util.exceptions import (
     ConfigurationError,
     PostProcessError,
@@ -51,8 +54,10 @@ from verdict.util.exceptions import (
     VerdictDeclarationTimeError,
     VerdictExecutionTimeError,
 )
+from verdict.util.log import enabled
 from verdict.util.log import logger as base_logger
 from verdict.util.misc import DisableLogger, shorten_string
+from verdict.util.ratelimit import MultiEvent
 from verdict.util.tracing import ExecutionContext
 
 
@@ -306,161 +311,324 @@ class Unit(
         """
         if execution_context is None:
             execution_context = ExecutionContext()
-        call_name = (
-            getattr(self, "_char", None)
-            or getattr(self, "char", None)
-            or self.__class__.__name__
-        )
         with execution_context.trace_call(
-            name=call_name,
+            name=self._call_name(),
             inputs={"input": input, "unit": self},
         ) as call:
-            logger = base_logger.bind(
-                thread_id=self.thread_id, unit=".".join(self.prefix)
-            )
-            logger.info("Started Unit.execute()")
-
-            if self.model_selection_policy is None:
-                self.model_selection_policy = config.DEFAULT_MODEL_SELECTION_POLICY
-                logger.debug(
-                    f"Using default model selection policy: {self.model_selection_policy}"
-                )
-
-            if self.should_stream_output and self.streaming_layout_manager:
-                streaming_layout = self.streaming_layout_manager.add(self)
+            logger, streaming_layout = self._start_execution()
 
             exceptions: List[Exception] = []
             for attempt_num, client in enumerate(
                 self.model_selection_policy.get_clients()
             ):
                 logger.info(
-                    f"Starting attempt {attempt_num + 1} of {len(self.model_selection_policy)}"
+                    "Starting attempt {} of {}",
+                    attempt_num + 1,
+                    len(self.model_selection_policy),
                 )
 
                 try:
-                    logger.debug(f"Received input: {input.escape()}")
+                    conformed_input, prompt_message = self._prepare_attempt(
+                        input, logger
+                    )
+
+                    ready, out_tokens_estimate = self._acquire_rate_limit(
+                        client, prompt_message, logger
+                    )
+                    # the Client only waits on the rate limit if it calls the provider
+                    scope = self._call_scope(ready)
 
-                    conformed_input: Schema = input
-                    if not self.InputSchema.is_empty():
-                        conformed_input = input.conform(self.InputSchema, logger)
-                        logger.debug(
-                            f"Conformed input to {self.InputSchema}: {conformed_input.escape()}"
+                    extractor = self._resolve_extractor(logger)
+
+                    # exit early right before the inference call
+                    if self.executor.is_complete.is_set():
+                        logger.error(
+                            "Exiting early since executor has been marked is_complete"
                         )
+                        ready.cancel()
+                        return  # type: ignore
 
-                    if not hasattr(self, "_prompt"):
-                        raise ConfigurationError("Unit must define a prompt.")
+                    try:
+                        with DisableLogger("LiteLLM"), cache_scope(scope):
+                            response_stream, usage = extractor.extract(
+                                client, prompt_message, logger
+                            )
+                            logger.info("Inference call succeeded")
+                    except Exception as e:
+                        logger.error("Inference call failed: {}", e)
+                        raise VerdictExecutionTimeError() from e
 
-                    prompt_message: PromptMessage = self.populate_prompt_message(
-                        conformed_input, logger
+                    response = self._consume_response(
+                        response_stream, streaming_layout, logger
                     )
-                    logger.debug(f"Populated system prompt: {prompt_message.system}")
-                    logger.debug(
-                        f"Populated user prompt: {shorten_string(prompt_message.user)}"
+                    self._release_rate_limit(
+                        client, scope, response, usage, out_tokens_estimate, logger
                     )
 
-                    in_tokens = len(client.encode(prompt_message.user))
-                    out_tokens_estimate = np.mean(
-                        self.shared.output_tokens or [0.0]
-                    ).item()
-                    ready = client.model.rate_limit.acquire(
-                        {"requests": 1, "tokens": int(in_tokens + out_tokens_estimate)}
-                    )
-                    logger.debug(
-                        f"Prepared in_tokens={in_tokens}, estimated out_tokens={out_tokens_estimate}"
+                    result = self._postprocess(conformed_input, response, logger)
+                    if call is not None:
+                        call.set_outputs(result)
+                    return result
+                except VerdictDeclarationTimeError as e:
+                    logger.info("User-code/configuration error detected.")
+                    raise e
+                except Exception as e:
+                    exceptions.append(e)
+                    logger.info("Retrying after exception encountered: {}", e)
+
+            raise VerdictExecutionTimeError(
+                f"Model Selection Policy {self.model_selection_policy} exhausted"
+            ) from exceptions[-1]
+
+    async def aexecute(
+        self, input: InputSchemaT, execution_context: Optional[ExecutionContext] = None
+    ) -> OutputSchemaT:
+        """
+        Execute the unit on an asyncio event loop. Rate limits and inference calls are
+        awaited; user code (`validate`, `process`, propagators) and units that override
+        `execute` (e.g., MapUnit) are offloaded to a worker thread.
+
+        Args:
+            input: The input schema.
+            execution_context: The execution context for this execution (tracing, IDs, etc).
+
+        Returns:
+            The output schema.
+        """
+        if type(self).execute is not Unit.execute:
+            return await asyncio.to_thread(self.execute, input, execution_context)
+
+        if execution_context is None:
+            execution_context = ExecutionContext()
+        with execution_context.trace_call(
+            name=self._call_name(),
+            inputs={"input": input, "unit": self},
+        ) as call:
+            logger, streaming_layout = self._start_execution()
+
+            exceptions: List[Exception] = []
+            for attempt_num, client in enumerate(
+                self.model_selection_policy.get_clients()
+            ):
+                logger.info(
+                    "Starting attempt {} of {}",
+                    attempt_num + 1,
+                    len(self.model_selection_policy),
+                )
+
+                try:
+                    conformed_input, prompt_message = self._prepare_attempt(
+                        input, logger
                     )
-                    if waiting := not ready.is_set():
-                        logger.debug("Rate limit reached. Waiting...")
-                    ready.wait()
-                    if waiting:
-                        logger.debug("Below rate limit again. Resuming...")
-
-                    extractor: Extractor = (
-                        self.extractor()
-                        if isinstance(self.extractor, type)
-                        else self.extractor
+
+                    ready, out_tokens_estimate = self._acquire_rate_limit(
+                        client, prompt_message, logger
                     )
-                    extractor.inject(unit=self)
-                    logger.debug(f"Using extractor: {extractor}")
+                    # the Client only waits on the rate limit if it calls the provider
+                    scope = self._call_scope(ready)
+
+                    extractor = self._resolve_extractor(logger)
 
                     # exit early right before the inference call
                     if self.executor.is_complete.is_set():
                         logger.error(
                             "Exiting early since executor has been marked is_complete"
                         )
+                        ready.cancel()
                         return  # type: ignore
 
                     try:
-                        with DisableLogger("LiteLLM"):
-                            response_stream, usage = extractor.extract(
+                        with DisableLogger("LiteLLM"), cache_scope(scope):
+                            response_stream, usage = await extractor.aextract(
                                 client, prompt_message, logger
                             )
                             logger.info("Inference call succeeded")
                     except Exception as e:
-                        logger.error(f"Inference call failed: {e}")
+                        logger.error("Inference call failed: {}", e)
                         raise VerdictExecutionTimeError() from e
 
                     if isinstance(response_stream, Iterator):
-                        logger.debug("Received streaming response")
-                        for response in response_stream:
-                            if (
-                                self.should_stream_output
-                                and self.streaming_layout_manager
-                                and streaming_layout
-                            ):
-                                streaming_layout.update(response)
+                        response = await asyncio.to_thread(
+                            self._consume_response,
+                            response_stream,
+                            streaming_layout,
+                            logger,
+                        )
                     else:
-                        response = response_stream
-                    logger.debug(f"Received response: {response.escape()}")
-
-                    out_tokens = usage.out_tokens
-                    if usage.is_unknown() or usage.out_tokens == -1:
-                        out_tokens = len(
-                            client.encode(
-                                str(response.model_dump())
-                                if isinstance(response, Schema)
-                                else response
-                            )
+                        response = self._consume_response(
+                            response_stream, streaming_layout, logger
                         )
-                    self.shared.output_tokens.append(out_tokens)
-                    client.model.rate_limit.release(
-                        {"tokens": min(int(out_tokens - out_tokens_estimate), 0)}
+                    self._release_rate_limit(
+                        client, scope, response, usage, out_tokens_estimate, logger
                     )
-                    logger.debug(f"Received out_tokens={out_tokens}")
 
-                    try:
-                        self.validate(conformed_input, response)
-                    except Exception as e:
-                        raise PostValidationError() from e
-                    logger.debug("Unit.validate() successful")
-
-                    try:
-                        output = self.process(conformed_input, response)
-                    except Exception as e:
-                        raise PostProcessError() from e
-                    logger.debug("Unit.process() successful")
-
-                    try:
-                        result = self._propagator(
-                            self, Previous(self.dependencies), conformed_input, output
-                        )  # type: ignore
-                        logger.debug(f"Propagated result: {result}")
-                        logger.info("Unit.execute() successful")
-                        if call is not None:
-                            call.set_outputs(result)
-                        return result
-                    except Exception as e:
-                        raise PropagateError() from e
+                    result = await asyncio.to_thread(
+                        self._postprocess, conformed_input, response, logger
+                    )
+                    if call is not None:
+                        call.set_outputs(result)
+                    return result
                 except VerdictDeclarationTimeError as e:
                     logger.info("User-code/configuration error detected.")
                     raise e
                 except Exception as e:
                     exceptions.append(e)
-                    logger.info(f"Retrying after exception encountered: {e}")
+                    logger.info("Retrying after exception encountered: {}", e)
 
             raise VerdictExecutionTimeError(
                 f"Model Selection Policy {self.model_selection_policy} exhausted"
             ) from exceptions[-1]
 
+    def _call_name(self) -> str:
+        return (
+            getattr(self, "_char", None)
+            or getattr(self, "char", None)
+            or self.__class__.__name__
+        )
+
+    def _start_execution(self) -> Tuple[Logger, Optional[Any]]:
+        logger = base_logger.bind(thread_id=self.thread_id, unit=".".join(self.prefix))
+        logger.info("Started Unit.execute()")
+
+        if self.model_selection_policy is None:
+            self.model_selection_policy = config.DEFAULT_MODEL_SELECTION_POLICY
+            logger.debug(
+                "Using default model selection policy: {}", self.model_selection_policy
+            )
+
+        streaming_layout = None
+        if self.should_stream_output and self.streaming_layout_manager:
+            streaming_layout = self.streaming_layout_manager.add(self)
+
+        return logger, streaming_layout
+
+    def _prepare_attempt(
+        self, input: Schema, logger: Logger
+    ) -> Tuple[Schema, PromptMessage]:
+        debug = enabled("DEBUG")
+        if debug:
+            logger.debug(f"Received input: {input.escape()}")
+
+        conformed_input: Schema = input
+        if not self.InputSchema.is_empty():
+            conformed_input = input.conform(self.InputSchema, logger)
+            if debug:
+                logger.debug(
+                    f"Conformed input to {self.InputSchema}: {conformed_input.escape()}"
+                )
+
+        if not hasattr(self, "_prompt"):
+            raise ConfigurationError("Unit must define a prompt.")
+
+        prompt_message: PromptMessage = self.populate_prompt_message(
+            conformed_input, logger
+        )
+        if debug:
+            logger.debug("Populated system prompt: {}", prompt_message.system)
+            logger.debug(
+                "Populated user prompt: {}", shorten_string(prompt_message.user)
+            )
+
+        return conformed_input, prompt_message
+
+    def _acquire_rate_limit(
+        self, client: ClientWrapper, prompt_message: PromptMessage, logger: Logger
+    ) -> Tuple[MultiEvent, float]:
+        in_tokens = client.estimate_tokens(prompt_message.user)
+        out_tokens_estimate = np.mean(self.shared.output_tokens or [0.0]).item()
+        ready = client.model.rate_limit.acquire(
+            {"requests": 1, "tokens": int(in_tokens + out_tokens_estimate)}
+        )
+        logger.debug(
+            "Prepared in_tokens={}, estimated out_tokens={}",
+            in_tokens,
+            out_tokens_estimate,
+        )
+        return ready, out_tokens_estimate
+
+    def _call_scope(self, ready: MultiEvent) -> CacheScope:
+        cache = (
+            ResponseCache.default()
+            if self.response_cache is True
+            else self.response_cache or None
+        )
+        return CacheScope(cache, ".".join(self.prefix), ready)
+
+    def _resolve_extractor(self, logger: Logger) -> Extractor:
+        extractor: Extractor = (
+            self.extractor() if isinstance(self.extractor, type) else self.extractor
+        )
+        extractor.inject(unit=self)
+        logger.debug("Using extractor: {}", extractor)
+        return extractor
+
+    def _consume_response(
+        self,
+        response_stream: Union[Schema, Iterator[Schema]],
+        streaming_layout: Optional[Any],
+        logger: Logger,
+    ) -> Schema:
+        if isinstance(response_stream, Iterator):
+            logger.debug("Received streaming response")
+            for response in response_stream:
+                if (
+                    self.should_stream_output
+                    and self.streaming_layout_manager
+                    and streaming_layout
+                ):
+                    streaming_layout.update(response)
+        else:
+            response = response_stream
+        if enabled("DEBUG"):
+            logger.debug(f"Received response: {response.escape()}")
+        return response
+
+    def _release_rate_limit(
+        self,
+        client: ClientWrapper,
+        scope: CacheScope,
+        response: Schema,
+        usage: Usage,
+        out_tokens_estimate: float,
+        logger: Logger,
+    ) -> None:
+        out_tokens = usage.out_tokens
+        if usage.is_unknown() or usage.out_tokens == -1:
+            out_tokens = client.estimate_tokens(
+                str(response.model_dump()) if isinstance(response, Schema) else response
+            )
+        self.shared.output_tokens.append(out_tokens)
+        if not scope.refunded:  # the response was reused, not charged
+            client.model.rate_limit.release(
+                {"tokens": min(int(out_tokens - out_tokens_estimate), 0)}
+            )
+        logger.debug("Received out_tokens={}", out_tokens)
+
+    def _postprocess(
+        self, conformed_input: Schema, response: Schema, logger: Logger
+    ) -> Schema:
+        try:
+            self.validate(conformed_input, response)  # type: ignore
+        except Exception as e:
+            raise PostValidationError() from e
+        logger.debug("Unit.validate() successful")
+
+        try:
+            output = self.process(conformed_input, response)  # type: ignore
+        except Exception as e:
+            raise PostProcessError() from e
+        logger.debug("Unit.process() successful")
+
+        try:
+            result = self._propagator(
+                self, Previous(self.dependencies), conformed_input, output
+            )  # type: ignore
+            logger.debug("Propagated result: {}", result)
+            logger.info("Unit.execute() successful")
+            return result
+        except Exception as e:
+            raise PropagateError() from e
+
     def validate(self, input: InputSchemaT, response: ResponseSchemaT) -> None:
         pass
 
@@ -50,6 +50,10 @@ class SynchronizationState:
             self.shared = True
         return self
 
+    def remove(self, peer: "Unit") -> None:  # noqa: F821 # type: ignore[name-defined]
+        with self.lock:
+            self.peers.discard(peer)
+
 
 class UserState:
     def __init__(self) -> None:
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import dill  # type: ignore[import-untyped]
+import numpy as np
 from typing_extensions import Self
 
 from verdict.schema import Schema
@@ -12,6 +16,39 @@ from verdict.util.exceptions import ConfigurationError
 InputFn = Callable[[Dict[str, Any]], Schema]
 
 
+def _encode(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (bytes, bytearray)):
+        data = bytes(value)
+    elif hasattr(value, "tobytes"):  # e.g., np.ndarray or PIL.Image.Image
+        data = value.tobytes()
+    else:
+        return repr(value)
+
+    return [
+        type(value).__name__,
+        str(getattr(value, "shape", getattr(value, "size", ""))),
+        hashlib.blake2b(data, digest_size=16).hexdigest(),
+    ]
+
+
+def stable_hash(value: Any) -> int:
+    """
+    A hash of `value` that is stable across processes and runs (unlike `hash(str)`, or
+    a `repr` with memory addresses in it). Bytes, arrays and images are hashed by their
+    contents.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(
+            json.dumps(value, sort_keys=True, default=_encode).encode(),
+            digest_size=8,
+        ).digest(),
+        "big",
+        signed=True,
+    )
+
+
 class DatasetWrapper(Iterator[Tuple[Dict[str, Any], Schema]]):
     dataset: "pd.DataFrame"  # type: ignore
     samples: "pd.DataFrame"  # type: ignore
@@ -33,9 +70,17 @@ class DatasetWrapper(Iterator[Tuple[Dict[str, Any], Schema]]):
         import pandas as pd
 
         self.dataset = pd.DataFrame(dataset)
-        self.dataset["hash(row)"] = self.dataset.apply(
-            lambda row: hash(str(row)), axis=1
+        hashes = pd.Series(
+            [DatasetWrapper.hash_row(row) for _, row in self.dataset.iterrows()],
+            index=self.dataset.index,
+            dtype="int64",
         )
+        # repeated rows are told apart by how many copies came before them
+        occurrence = hashes.groupby(hashes).cumcount()
+        self.dataset["hash(row)"] = [
+            row_hash if copies == 0 else stable_hash([row_hash, copies])
+            for row_hash, copies in zip(hashes, occurrence)
+        ]
         self.max_samples = int(max_samples) if max_samples else None
         self.samples = (
             self.dataset.sample(n=self.max_samples)
@@ -51,6 +96,17 @@ class DatasetWrapper(Iterator[Tuple[Dict[str, Any], Schema]]):
             lambda row: Schema.of(**{k: v for k, v in row.items() if k in columns})
         )
 
+    @staticmethod
+    def hash_row(row: "pd.Series") -> int:  # type: ignore
+        # the values only (not the index), so that checkpoints can be resumed on a
+        # reordered dataset
+        return stable_hash({str(column): value for column, value in row.items()})
+
+    @staticmethod
+    def hash_input(input_data: Schema) -> int:
+        # rows with the same input Schema are executed identically (see Pipeline.dedup)
+        return stable_hash(input_data.model_dump())
+
     def __iter__(self) -> Self:
         samples = []
         for idx, row in self.samples.iterrows():
@@ -80,6 +136,14 @@ class DatasetWrapper(Iterator[Tuple[Dict[str, Any], Schema]]):
     def __len__(self) -> int:
         return len(self.samples)
 
+    def shard(self, start: int, end: int) -> "DatasetWrapper":
+        """The samples [start, end), e.g., to run in a separate process."""
+        shard = copy.copy(self)
+        shard.samples = self.samples.iloc[start:end].copy()
+        shard._iter = None
+        shard._count = 0
+        return shard
+
     def save(self, path: Path) -> None:
         with open(path, "wb") as f:
             dill.dump(self, f)
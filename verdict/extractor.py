@@ -1,3 +1,4 @@
+import asyncio
 import math
 import random
 import re
@@ -15,7 +16,9 @@ from verdict.model import ClientWrapper, Model, ModelSelectionPolicy
 from verdict.prompt import PromptMessage
 from verdict.scale import DiscreteScale
 from verdict.schema import Schema
+from verdict.util.cache import NONCE_PATTERN
 from verdict.util.exceptions import ConfigurationError, VerdictExecutionTimeError
+from verdict.util.log import enabled
 
 
 @dataclass
@@ -53,6 +56,20 @@ class Extractor(ABC):
     ) -> Tuple[Union[Schema, Iterator[Schema]], Usage]:
         pass
 
+    async def aextract(
+        self,
+        client_wrapper: ClientWrapper,
+        prompt_message: PromptMessage,
+        logger: Logger,
+    ) -> Tuple[Union[Schema, Iterator[Schema]], Usage]:
+        """
+        Async variant of `extract` used by the AsyncGraphExecutor. Extractors without a
+        native async implementation are offloaded to a worker thread.
+        """
+        return await asyncio.to_thread(
+            self.extract, client_wrapper, prompt_message, logger
+        )
+
     def inject(self, unit) -> None:
         self.response_schema = unit.ResponseSchema
         if hasattr(unit, "scale"):
@@ -91,24 +108,57 @@ class StructuredOutputExtractor(Extractor):
             streaming=self.streaming,
         )
 
+        return response, self.usage(client_wrapper, messages, response)
+
+    async def aextract(
+        self,
+        client_wrapper: ClientWrapper,
+        prompt_message: PromptMessage,
+        logger: Logger,
+    ) -> Tuple[Union[Schema, Iterator[Schema]], Usage]:
+        if self.streaming:
+            return await super().aextract(client_wrapper, prompt_message, logger)
+
+        assert getattr(self, "response_schema") is not None, (
+            "StructuredOutputExtractor.response_schema must be set before calling extract()"
+        )
+        response = await client_wrapper.async_function_calling_client(
+            logger=logger,
+            messages=(
+                messages := prompt_message.to_messages(
+                    add_nonce=client_wrapper.model.use_nonce
+                )
+            ),
+            response_model=self.response_schema,
+        )
+
+        return response, self.usage(client_wrapper, messages, response)
+
+    def usage(
+        self,
+        client_wrapper: ClientWrapper,
+        messages: List[Dict[str, Any]],
+        response: Union[Schema, Iterator[Schema]],
+    ) -> Usage:
         # TODO: add support / ping LiteLLM for image token usage tracking
+        # counts are memoized per text, so strip the per-call nonce before counting
         in_tokens = 0
         for message in messages:
             for content in message["content"]:
                 if isinstance(content, str):
                     continue
                 if content["type"] == "text":
-                    in_tokens += len(client_wrapper.encode(content["text"]))
+                    in_tokens += client_wrapper.count_tokens(
+                        NONCE_PATTERN.sub("", content["text"])
+                    )
 
-        usage = Usage(
+        return Usage(
             in_tokens=in_tokens,
-            out_tokens=len(client_wrapper.encode(str(response.model_dump())))
+            out_tokens=client_wrapper.count_tokens(str(response.model_dump()))  # type: ignore
             if not self.streaming
             else -1,
         )
 
-        return response, usage
-
 
 class RawExtractor(Extractor):
     field_name: str
@@ -159,14 +209,34 @@ class RawExtractor(Extractor):
         if isinstance(output, Iterator):
             return streaming_extract(output, messages), Usage.unknown()
         else:
-            usage = Usage(
-                in_tokens=output.usage.prompt_tokens,
-                out_tokens=output.usage.completion_tokens,
-            )
+            return self.from_completion(output)
+
+    async def aextract(
+        self,
+        client_wrapper: ClientWrapper,
+        prompt_message: PromptMessage,
+        logger: Logger,
+    ) -> Tuple[Union[Schema, Iterator[Schema]], Usage]:
+        if self.streaming:
+            return await super().aextract(client_wrapper, prompt_message, logger)
+
+        output = await client_wrapper.async_raw_client(
+            logger=logger,
+            messages=prompt_message.to_messages(
+                add_nonce=client_wrapper.model.use_nonce
+            ),
+        )
+        return self.from_completion(output)
+
+    def from_completion(self, output: Any) -> Tuple[Schema, Usage]:
+        usage = Usage(
+            in_tokens=output.usage.prompt_tokens,
+            out_tokens=output.usage.completion_tokens,
+        )
 
-            return self.response_schema(
-                **{self.field_name: output.choices[0].message.content}
-            ), usage
+        return self.response_schema(
+            **{self.field_name: output.choices[0].message.content}
+        ), usage
 
 
 class CustomExtractor(RawExtractor, ABC):
@@ -190,9 +260,24 @@ class CustomExtractor(RawExtractor, ABC):
         logger: Logger,
     ) -> Tuple[Schema, Usage]:
         output, usage = super().extract(client_wrapper, prompt_message, logger)
-        logger.debug(
-            f"CustomExtractor {self.__class__.__name__} received output: {output.escape()}"
-        )
+        return self.post_extract_output(output, usage, logger)  # type: ignore
+
+    async def aextract(
+        self,
+        client_wrapper: ClientWrapper,
+        prompt_message: PromptMessage,
+        logger: Logger,
+    ) -> Tuple[Schema, Usage]:
+        output, usage = await super().aextract(client_wrapper, prompt_message, logger)
+        return self.post_extract_output(output, usage, logger)  # type: ignore
+
+    def post_extract_output(
+        self, output: Schema, usage: Usage, logger: Logger
+    ) -> Tuple[Schema, Usage]:
+        if enabled("DEBUG"):
+            logger.debug(
+                f"CustomExtractor {self.__class__.__name__} received output: {output.escape()}"
+            )
 
         extracted = self.post_extract(output.output, logger)  # type: ignore
         logger.debug(
@@ -336,9 +421,19 @@ Raw response:
                     {"tokens": usage.out_tokens}
                 )
 
-            logger.debug(f"Received response: {response.escape()}")
+            if enabled("DEBUG"):
+                logger.debug(f"Received response: {response.escape()}")
             return response, raw_usage
 
+    async def aextract(
+        self,
+        client_wrapper: ClientWrapper,
+        prompt_message: PromptMessage,
+        logger: Logger,
+    ) -> Tuple[Union[Schema, Iterator[Schema]], Usage]:
+        # multi-call extraction with its own rate limiting; run the sync path off-loop
+        return await Extractor.aextract(self, client_wrapper, prompt_message, logger)
+
     def format(self) -> str:
         if self.model_selection_policy is None:
             return f"{self.__class__.__name__.replace('Extractor', '')}({{model_name}} -> {{model_name}})"
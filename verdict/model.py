@@ -1,7 +1,10 @@
+import inspect
 import pprint
 import textwrap
+import threading
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from typing import (
     Any,
@@ -19,13 +22,23 @@ from loguru._logger import Logger
 from typing_extensions import Self
 
 from verdict.schema import Schema
+from verdict.util.cache import (
+    CacheScope,
+    current_scope,
+    decode_response,
+    encode_response,
+    request_key,
+)
+from verdict.util.coalesce import in_flight
 from verdict.util.exceptions import ConfigurationError
-from verdict.util.misc import DisableLogger, shorten_string
+from verdict.util.log import enabled
+from verdict.util.misc import DisableLogger
 from verdict.util.ratelimit import (
     RateLimitConfig,
     RateLimitPolicy,
     UnlimitedRateLimiter,
 )
+from verdict.util.tokenizer import Tokenizer
 
 
 class Model(ABC):
@@ -152,6 +165,11 @@ class vLLMModel(Model):
         }
 
 
+_inference_parameters_defaults: ContextVar[Dict[int, Dict[str, Any]]] = ContextVar(
+    "verdict_inference_parameters_defaults", default={}
+)
+
+
 @dataclass
 class Client:
     complete: Callable
@@ -196,15 +214,27 @@ class Client:
 
     @contextmanager
     def defaults(self, **inference_parameters_defaults) -> ContextManager[None]:  # type: ignore
-        original_inference_parameters = self.inference_parameters
+        # scoped to the current thread/task, since clients are shared (see ClientFactory)
+        all_defaults = _inference_parameters_defaults.get()
+        token = _inference_parameters_defaults.set(
+            {
+                **all_defaults,
+                id(self): {
+                    **inference_parameters_defaults,
+                    **all_defaults.get(id(self), {}),
+                },
+            }
+        )
+        try:
+            yield
+        finally:
+            _inference_parameters_defaults.reset(token)
 
-        self.inference_parameters = {
-            **inference_parameters_defaults,
-            **original_inference_parameters,
+    def _inference_parameters(self) -> dict[str, Any]:
+        return {
+            **_inference_parameters_defaults.get().get(id(self), {}),
+            **self.inference_parameters,
         }
-        yield
-
-        self.inference_parameters = original_inference_parameters
 
     def __call__(
         self,
@@ -215,29 +245,33 @@ class Client:
     ):
         from verdict import config
 
+        inference_parameters = self._inference_parameters()
+
         if self._has_image_content(messages) and not self._supports_image_input():
             raise ConfigurationError(
                 f"Model {self.model.name} does not support image inputs. "
                 f"Images were detected in the message content. "
             )
 
-        logger.debug(
-            textwrap.dedent(
-                f"""
-                Preparing parameters for {repr(self.model)} with
-                specified connection_parameters: {self.model.connection_parameters}
-                default inference_parameters: {config.DEFAULT_INFERENCE_PARAMS}
-                specified inference_parameters: {self.inference_parameters}
-                """
+        debug = enabled("DEBUG")
+        if debug:
+            logger.debug(
+                textwrap.dedent(
+                    f"""
+                    Preparing parameters for {repr(self.model)} with
+                    specified connection_parameters: {self.model.connection_parameters}
+                    default inference_parameters: {config.DEFAULT_INFERENCE_PARAMS}
+                    specified inference_parameters: {inference_parameters}
+                    """
+                )
             )
-        )
 
         # 1. add in messages, connection_parameters, and inference_parameters (defaults first)
         parameters = {
             "messages": messages,
             **self.model.connection_parameters,
             **config.DEFAULT_INFERENCE_PARAMS,
-            **self.inference_parameters,
+            **inference_parameters,
         }
 
         # 2. configure streaming
@@ -248,31 +282,242 @@ class Client:
                 from instructor import Partial  # type: ignore[import-untyped]
 
                 response_model = Partial[response_model]
-            if "timeout" in self.inference_parameters:
-                parameters["stream_timeout"] = self.inference_parameters["timeout"]
+            if "timeout" in inference_parameters:
+                parameters["stream_timeout"] = inference_parameters["timeout"]
 
         # 3. configure structured output
         if response_model is not None:
             parameters["response_model"] = response_model
 
-        parameters_no_api_key = {
-            p: v for p, v in parameters.items() if p not in ["api_key"]
-        }
-        logger.debug(
-            f"Sending parameters for {repr(self.model)}:  {pprint.pformat(parameters_no_api_key, width=80, depth=3)}"
+        if debug:
+            parameters_no_api_key = {
+                p: v for p, v in parameters.items() if p not in ["api_key"]
+            }
+            logger.debug(
+                f"Sending parameters for {repr(self.model)}:  {pprint.pformat(parameters_no_api_key, width=80, depth=3)}"
+            )
+
+        scope = current_scope()
+        # identical concurrent requests share one call if the response is deterministic
+        coalesce = (
+            config.COALESCE_REQUESTS
+            and not streaming
+            and parameters.get("temperature") == 0
         )
-        return self.complete(**parameters)
+        if scope is None and not coalesce and not self.model.rate_limit.is_adaptive:
+            return self.complete(**parameters)
+
+        # streamed responses are not cached
+        key = (
+            request_key(
+                parameters, response_model, self.model.use_nonce, scope.namespace
+            )
+            if scope is not None and scope.cache is not None and not streaming
+            else None
+        )
+        # the nonce and the namespace are ignored, since the response is deterministic
+        flight_key = (
+            request_key(parameters, response_model, self.model.use_nonce, "")
+            if coalesce
+            else None
+        )
+        if inspect.iscoroutinefunction(self.complete):
+            return self._acomplete(logger, scope, key, flight_key, parameters)
+        return self._complete(logger, scope, key, flight_key, parameters)
+
+    def _lookup(
+        self,
+        logger: Logger,
+        scope: Optional[CacheScope],
+        key: Optional[str],
+        parameters: Dict[str, Any],
+    ) -> Any:
+        if (
+            key is None
+            or scope is None
+            or scope.cache is None
+            or (value := scope.cache.get(key)) is None
+        ):
+            return None
+
+        logger.debug("Response cache hit for {!r} ({})", self.model, key[:12])
+        return decode_response(value, parameters.get("response_model"))
+
+    def _complete(
+        self,
+        logger: Logger,
+        scope: Optional[CacheScope],
+        key: Optional[str],
+        flight_key: Optional[str],
+        parameters: Dict[str, Any],
+    ) -> Any:
+        if (response := self._lookup(logger, scope, key, parameters)) is not None:
+            if scope is not None:
+                scope.refund()
+            return response
+
+        if flight_key is None:
+            return self._send(logger, scope, key, parameters)
+
+        flight, leader = in_flight.join(flight_key)
+        if not leader:
+            logger.debug("Coalesced with an identical request to {!r}", self.model)
+            if scope is not None:
+                scope.refund()
+            return flight.result()
+
+        try:
+            response = self._send(logger, scope, key, parameters)
+        except BaseException as e:
+            in_flight.land(flight_key, flight, error=e)
+            raise
+        in_flight.land(flight_key, flight, response)
+        return response
+
+    async def _acomplete(
+        self,
+        logger: Logger,
+        scope: Optional[CacheScope],
+        key: Optional[str],
+        flight_key: Optional[str],
+        parameters: Dict[str, Any],
+    ) -> Any:
+        if (response := self._lookup(logger, scope, key, parameters)) is not None:
+            if scope is not None:
+                scope.refund()
+            return response
+
+        if flight_key is None:
+            return await self._asend(logger, scope, key, parameters)
+
+        flight, leader = in_flight.join(flight_key)
+        if not leader:
+            logger.debug("Coalesced with an identical request to {!r}", self.model)
+            if scope is not None:
+                scope.refund()
+            return await flight.result_async()
+
+        try:
+            response = await self._asend(logger, scope, key, parameters)
+        except BaseException as e:
+            in_flight.land(flight_key, flight, error=e)
+            raise
+        in_flight.land(flight_key, flight, response)
+        return response
+
+    def _send(
+        self,
+        logger: Logger,
+        scope: Optional[CacheScope],
+        key: Optional[str],
+        parameters: Dict[str, Any],
+    ) -> Any:
+        if scope is not None and scope.ready is not None:
+            if waiting := not scope.ready.is_set():
+                logger.debug("Rate limit reached. Waiting...")
+            scope.ready.wait()
+            if waiting:
+                logger.debug("Below rate limit again. Resuming...")
+
+        try:
+            response = self.complete(**parameters)
+        except Exception as e:
+            self._observe(error=e)
+            raise
+        self._observe(response=response)
+        if scope is not None and scope.cache is not None and key is not None:
+            scope.cache.set(
+                key, encode_response(response, parameters.get("response_model"))
+            )
+        return response
+
+    async def _asend(
+        self,
+        logger: Logger,
+        scope: Optional[CacheScope],
+        key: Optional[str],
+        parameters: Dict[str, Any],
+    ) -> Any:
+        if scope is not None and scope.ready is not None:
+            if waiting := not scope.ready.is_set():
+                logger.debug("Rate limit reached. Waiting...")
+            await scope.ready.wait_async()
+            if waiting:
+                logger.debug("Below rate limit again. Resuming...")
+
+        try:
+            response = await self.complete(**parameters)
+        except Exception as e:
+            self._observe(error=e)
+            raise
+        self._observe(response=response)
+        if scope is not None and scope.cache is not None and key is not None:
+            scope.cache.set(
+                key, encode_response(response, parameters.get("response_model"))
+            )
+        return response
+
+    def _observe(
+        self, response: Optional[Any] = None, error: Optional[Exception] = None
+    ) -> None:
+        rate_limit = self.model.rate_limit
+        if not rate_limit.is_adaptive:
+            return
+
+        if error is not None:
+            rate_limited = rate_limit_error(error)
+            rate_limit.observe(
+                provider_headers(rate_limited or error),
+                rate_limited=rate_limited is not None,
+            )
+            return
+
+        usage = getattr(getattr(response, "_raw_response", response), "usage", None)
+        rate_limit.observe(
+            provider_headers(response),
+            values={"requests": 1, "tokens": getattr(usage, "total_tokens", None) or 0},
+        )
+
+
+def provider_headers(obj: Any) -> Dict[str, str]:
+    """
+    The provider's HTTP response headers of a litellm response (or a structured output
+    wrapping one), or of a litellm exception.
+    """
+    for candidate in (obj, getattr(obj, "_raw_response", None)):
+        hidden_params = getattr(candidate, "_hidden_params", None)
+        if isinstance(hidden_params, dict) and hidden_params.get("additional_headers"):
+            return dict(hidden_params["additional_headers"])
+
+    headers = getattr(obj, "litellm_response_headers", None) or getattr(
+        getattr(obj, "response", None), "headers", None
+    )
+    return dict(headers or {})
+
+
+def rate_limit_error(error: BaseException) -> Optional[BaseException]:
+    """The 429 error in the chain of `error` (instructor may wrap it), if any."""
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        if getattr(current, "status_code", None) == 429:
+            return current
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return None
 
 
 class ClientWrapper:
     model: Model
     inference_parameters: dict[str, Any]
+    tokenizer: Tokenizer
 
     def __init__(self, model: Model, **inference_parameters) -> None:
         self.model = model
         self.model._configure_rate_limiter()
 
         self.inference_parameters = inference_parameters
+        self.tokenizer = Tokenizer.for_model(self.model.name)
 
         import litellm
 
@@ -283,8 +528,32 @@ class ClientWrapper:
             self.model,
             self.inference_parameters,
         )
+        self.async_raw_client = Client(
+            litellm.acompletion,
+            self.model,
+            self.inference_parameters,
+        )
+
+        from instructor import patch  # type: ignore[import-untyped]
+
+        with DisableLogger("LiteLLM"):
+            self.function_calling_client = Client(
+                patch(
+                    litellm.LiteLLM(),
+                    mode=self.instructor_mode,
+                ).chat.completions.create,  # type: ignore
+                self.model,
+                self.inference_parameters,
+            )
+            self.async_function_calling_client = Client(
+                patch(create=litellm.acompletion, mode=self.instructor_mode),  # type: ignore
+                self.model,
+                self.inference_parameters,
+            )
 
-        from instructor import Mode, patch  # type: ignore[import-untyped]
+    @property
+    def instructor_mode(self) -> "Mode":  # type: ignore # noqa: F821
+        from instructor import Mode  # type: ignore[import-untyped]
 
         MODEL_PROVIDER_TO_INSTRUCTOR_MODE_OVERRIDE = {
             "huggingface": Mode.JSON,
@@ -297,36 +566,76 @@ class ClientWrapper:
             "openai/o1-2024-12-17": Mode.JSON_O1,
         }
 
-        with DisableLogger("LiteLLM"):
-            self.function_calling_client = Client(
-                patch(
-                    litellm.LiteLLM(),
-                    mode=MODEL_TO_INSTRUCTOR_MODE_OVERRIDE.get(
-                        f"{self.model.provider}/{self.model.char}",
-                        MODEL_PROVIDER_TO_INSTRUCTOR_MODE_OVERRIDE.get(
-                            self.model.provider, Mode.TOOLS
-                        ),
-                    ),
-                ).chat.completions.create,  # type: ignore
-                self.model,
-                self.inference_parameters,
-            )
+        return MODEL_TO_INSTRUCTOR_MODE_OVERRIDE.get(
+            f"{self.model.provider}/{self.model.char}",
+            MODEL_PROVIDER_TO_INSTRUCTOR_MODE_OVERRIDE.get(
+                self.model.provider, Mode.TOOLS
+            ),
+        )
 
     def encode(self, word: str) -> List[int]:
-        import tokenizers  # type: ignore[import-untyped]
-        from litellm import encode  # type: ignore[import-untyped]
+        return self.tokenizer.encode(word)
+
+    def count_tokens(self, text: str) -> int:
+        return self.tokenizer.count(text)
 
-        tokens = encode(model=self.model.name, text=shorten_string(word, encoded=False))
-        if isinstance(tokens, tokenizers.Encoding):
-            return tokens.ids
+    def estimate_tokens(self, text: str) -> int:
+        from verdict import config
 
-        return tokens
+        return self.tokenizer.estimate(text, config.RATE_LIMIT_CHARS_PER_TOKEN)
 
     @staticmethod
     def from_model(model: Model, **inference_parameters) -> "ClientWrapper":
         return ClientWrapper(model, **inference_parameters)
 
 
+class ClientFactory:
+    """
+    Builds the ClientWrapper for a (model, inference_parameters) pair on first use and
+    returns the same instance afterwards. ClientWrappers are shared across threads, so
+    every Unit execution and retry reuses the same litellm/instructor clients (and
+    their HTTP connection pools).
+    """
+
+    model: Model
+    inference_parameters: dict[str, Any]
+
+    client: Optional[ClientWrapper]
+    rate_limiter_disabled: Optional[bool]
+
+    def __init__(self, model: Model, inference_parameters: dict[str, Any]) -> None:
+        self.model = model
+        self.inference_parameters = inference_parameters
+
+        self.lock = threading.Lock()
+        self.client = None
+        self.rate_limiter_disabled = None
+
+    def __call__(self) -> ClientWrapper:
+        from verdict import config
+
+        if self.client is None:
+            with self.lock:
+                if self.client is None:
+                    self.rate_limiter_disabled = config.state.rate_limiter_disabled
+                    self.client = ClientWrapper.from_model(
+                        self.model, **self.inference_parameters
+                    )
+        elif self.rate_limiter_disabled != config.state.rate_limiter_disabled:
+            # ratelimit.disable()/enable() was called since the client was built
+            self.rate_limiter_disabled = config.state.rate_limiter_disabled
+            self.model._configure_rate_limiter()
+
+        return self.client
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # litellm/instructor clients are rebuilt on first use after unpickling
+        return {"model": self.model, "inference_parameters": self.inference_parameters}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+
 class ModelSelectionPolicy:
     @property
     def char(self) -> str:
@@ -348,13 +657,12 @@ class ModelSelectionPolicy:
         model: Union[str, Model], retries: int = 1, **inference_parameters
     ) -> "ModelSelectionPolicy":
         policy = ModelSelectionPolicy()
-        for _ in range(retries):
-            if isinstance(model, str):
-                model = ProviderModel(name=model)
+        if isinstance(model, str):
+            model = ProviderModel(name=model)
 
-            policy.client_factories.append(
-                lambda: ClientWrapper.from_model(model, **inference_parameters)
-            )
+        factory = ClientFactory(model, inference_parameters)
+        for _ in range(retries):
+            policy.client_factories.append(factory)
             policy.client_configs.append((model, retries, inference_parameters))
         policy.client_repeats.append((model, retries))
 
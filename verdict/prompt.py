@@ -1,20 +1,80 @@
 import ast
+import builtins
 import inspect
-import random
 import re
-import string
 import textwrap
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
+from types import CodeType
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
 
 from loguru._logger import Logger
 from typing_extensions import Self
 
 from verdict.schema import Schema
+from verdict.util.cache import new_nonce
 from verdict.util.exceptions import PromptError
 
 SECTION_REGEX = re.compile(r"@(\w+)(.*?)(?=@\w+|$)", re.DOTALL)
+PLACEHOLDER_REGEX = re.compile(r"(?<!\{)\{([^{}]+?)\}(?!\})")
+ATTRIBUTE_PATH_REGEX = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    """
+    A compiled `{...}` placeholder of a prompt template. Attribute paths such as
+    `{input.x}` are resolved with getattr; other expressions are evaluated from a
+    precompiled code object.
+    """
+
+    source: str
+    path: Optional[Tuple[str, ...]]
+    code: Optional[CodeType]
+
+    @staticmethod
+    def compile(source: str) -> "Placeholder":
+        path = (
+            tuple(source.strip().split("."))
+            if ATTRIBUTE_PATH_REGEX.fullmatch(source.strip())
+            else None
+        )
+        try:
+            code = compile(source.strip(), "<prompt>", "eval")
+        except SyntaxError:
+            code = None  # raised as a PromptError when the prompt is formatted
+        return Placeholder(source, path, code)
+
+    def evaluate(self, context: Dict[str, Any]) -> Any:
+        if self.path is not None and self.path[0] in context:
+            value = context[self.path[0]]
+            for attribute in self.path[1:]:
+                value = getattr(value, attribute)
+            return value
+        return eval(self.code or self.source, {}, context)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> Tuple[Union[str, Placeholder], ...]:
+    """Splits a prompt template into literal segments and compiled placeholders."""
+    segments: List[Union[str, Placeholder]] = []
+    position = 0
+    for match in PLACEHOLDER_REGEX.finditer(template):
+        segments.append(template[position : match.start()])
+        segments.append(Placeholder.compile(match.group(1)))
+        position = match.end()
+    segments.append(template[position:])
+    return tuple(segment for segment in segments if segment != "")
+
+
+@lru_cache(maxsize=1024)
+def illegal_symbols(template: Optional[str]) -> Tuple[str, ...]:
+    return tuple(
+        illegal_symbol
+        for illegal_symbol in ["{{", "}}"]
+        if template is not None and illegal_symbol in template
+    )
 
 
 class PromptRegistry(type):
@@ -116,11 +176,7 @@ class PromptMessage:
     def to_messages(
         self, add_nonce: bool = False
     ) -> List[Dict[str, str | List[Dict[str, str | Dict[str, str]]]]]:
-        nonce = (
-            "".join(random.choices(string.ascii_letters, k=10)) + "\n"
-            if add_nonce
-            else ""
-        )
+        nonce = new_nonce() if add_nonce else ""
 
         image_data = []
         if image_values := self._get_image_values(self.input_schema):
@@ -174,18 +230,10 @@ class Prompt(metaclass=PromptRegistry):
             for placeholder in placeholders:
                 try:
                     tree = ast.parse(placeholder, mode="eval")
-
-                    class VariableVisitor(ast.NodeVisitor):
-                        def visit_Name(self, node) -> None:
-                            variables.add(node.id)
-
-                        def visit_Attribute(self, node) -> None:
-                            while isinstance(node, ast.Attribute):
-                                node = node.value
-                            if isinstance(node, ast.Name):
-                                variables.add(node.id)
-
-                    VariableVisitor().visit(tree)
+                    # every name, including those inside calls and subscripts
+                    variables.update(
+                        node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+                    )
                 except SyntaxError:
                     variables.add(placeholder.split(".")[0])
 
@@ -219,24 +267,20 @@ class Prompt(metaclass=PromptRegistry):
         source: Schema,
         logger: Optional[Logger] = None,
     ) -> PromptMessage:
-        for illegal_symbol in ["{{", "}}"]:
+        if logger:
             for prompt in [self.system_prompt_template, self.user_prompt_template]:
-                if prompt is not None and illegal_symbol in prompt:
-                    if logger:
-                        logger.warning(
-                            f"Prompt contains '{illegal_symbol}'. Variable likely not getting evaluated."
-                        )
-
-        format_kwargs = (
-            {"input": input_schema}
-            | {"unit": unit}
-            | {"previous": previous}
-            | {"source": source}
-        )
+                for illegal_symbol in illegal_symbols(prompt):
+                    logger.warning(
+                        f"Prompt contains '{illegal_symbol}'. Variable likely not getting evaluated."
+                    )
 
-        for key, value in self.caller_locals.items():
-            if key not in format_kwargs and not key.startswith("__"):
-                format_kwargs[key] = value
+        format_kwargs = {
+            **self.caller_locals,
+            "input": input_schema,
+            "unit": unit,
+            "previous": previous,
+            "source": source,
+        }
 
         return PromptMessage(
             system=(
@@ -250,25 +294,26 @@ class Prompt(metaclass=PromptRegistry):
 
     @staticmethod
     def auto_format(template: str, context: Dict[str, Any]) -> str:
-        single_placeholder_pattern = r"(?<!\{)\{([^{}]+?)\}(?!\})"
-        matches = re.findall(single_placeholder_pattern, template)
+        parts = []
+        for segment in compile_template(template):
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
 
-        for match in matches:
             try:
-                value = eval(match, {}, context)
-                template = template.replace(f"{{{match}}}", str(value))
+                parts.append(str(segment.evaluate(context)))
             except Exception as e:
                 raise PromptError(
                     textwrap.dedent(
                         f"""
-                        Failed to evaluate Prompt placeholder '{match}' in the following context.
+                        Failed to evaluate Prompt placeholder '{segment.source}' in the following context.
 
                         Context: {context}
                         """
                     )
                 ) from e
 
-        return template
+        return "".join(parts)
 
 
 class Promptable(ABC):
@@ -280,8 +325,26 @@ class Promptable(ABC):
         else:
             self._prompt = prompt
 
+        # compile once, and only keep the caller locals the templates reference
+        for template in [
+            self._prompt.system_prompt_template,
+            self._prompt.user_prompt_template,
+        ]:
+            if template:
+                compile_template(template)
+
         frame = inspect.currentframe().f_back
-        self._prompt.caller_locals = frame.f_locals
+        caller_locals = frame.f_locals
+        names = self._prompt.get_all_keys() - RESERVED_KEYS
+        if all(name in caller_locals or hasattr(builtins, name) for name in names):
+            self._prompt.caller_locals = {
+                name: caller_locals[name]
+                for name in names
+                if name in caller_locals and not name.startswith("__")
+            }
+        else:
+            # e.g., a comprehension variable, or a name defined after .prompt()
+            self._prompt.caller_locals = caller_locals
 
         return self
 
@@ -1,7 +1,8 @@
 import inspect
 from abc import ABC
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args
 
 from loguru._logger import Logger
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, create_model
@@ -109,42 +110,38 @@ class ResponseSchema(Schema):
     @staticmethod
     def of(**kwargs) -> "Schema":
         # Schema.of(score=5) -> BaseModel(score=int)(score=5)
-        return type(
-            "InferredSchema",
-            (Schema,),
-            {
-                **kwargs,
-                "__module__": __name__,
-                "__annotations__": {
-                    field_name: Schema.infer_pydantic_annotation(field_value)
-                    for field_name, field_value in kwargs.items()
+        if any(isinstance(field_value, Scale) for field_value in kwargs.values()):
+            # Scale fields are configured by their default value
+            return type(
+                "InferredSchema",
+                (Schema,),
+                {
+                    **kwargs,
+                    "__module__": __name__,
+                    "__annotations__": {
+                        field_name: Schema.infer_pydantic_annotation(field_value)
+                        for field_name, field_value in kwargs.items()
+                    },
                 },
-            },
+            )(**kwargs)
+
+        return _interned(
+            _schema_class,
+            "InferredSchema",
+            tuple(
+                (field_name, Schema.infer_pydantic_annotation(field_value))
+                for field_name, field_value in kwargs.items()
+            ),
         )(**kwargs)
 
     @staticmethod
     def inline(**kwargs) -> Type["Schema"]:
         # Schema.inline(score=int) -> BaseModel(score=int)
-        return type(
-            "InlineSchema",
-            (Schema,),
-            {
-                "__module__": __name__,
-                "__annotations__": {
-                    field_name: field_type for field_name, field_type in kwargs.items()
-                },
-            },
-        )
+        return _interned(_schema_class, "InlineSchema", tuple(kwargs.items()))
 
     @classmethod
     def empty(cls) -> "Schema":
-        return type(
-            "EmptySchema",
-            (Schema,),
-            {
-                "__module__": __name__,
-            },
-        )()
+        return _interned(_schema_class, "EmptySchema", ())()
 
     @classmethod
     def is_empty(cls) -> bool:
@@ -160,20 +157,7 @@ class ResponseSchema(Schema):
 
     @classmethod
     def append(cls, **kwargs) -> Type["Schema"]:
-        model_fields = {
-            **{
-                field_name: (field_info.annotation, Field(...))
-                for field_name, field_info in cls.model_fields.items()
-            },
-            **{
-                field_name: (t if isinstance(t, tuple) else (t, Field(...)))
-                for field_name, t in kwargs.items()
-            },
-        }
-
-        return create_model(  # type: ignore
-            cls.__name__, **model_fields, __base__=Schema
-        )
+        return _interned(_extended_class, cls, tuple(kwargs.items()), False)
 
     def add(self, **kwargs) -> "Schema":
         return type(self).append(
@@ -185,20 +169,7 @@ class ResponseSchema(Schema):
 
     @classmethod
     def prepend(cls, **kwargs) -> Type["Schema"]:
-        model_fields = {
-            **{
-                field_name: (t if isinstance(t, tuple) else (t, Field(...)))
-                for field_name, t in kwargs.items()
-            },
-            **{
-                field_name: (field_info.annotation, Field(...))
-                for field_name, field_info in cls.model_fields.items()
-            },
-        }
-
-        return create_model(  # type: ignore
-            cls.__name__, **model_fields, __base__=Schema
-        )
+        return _interned(_extended_class, cls, tuple(kwargs.items()), True)
 
     @staticmethod
     def from_values(**kwargs) -> "Schema":
@@ -224,81 +195,36 @@ class ResponseSchema(Schema):
             1. Check if there is a default factory for the field in expected. If so, use that.
             2. Copy the first field in `self` that matches the type of the expected field.
         """
-        current = self
-
-        current_lookup = type(current)._fieldinfo_lookup()
-        expected_lookup = expected._fieldinfo_lookup()
-
-        # 1. Set defaults
-        for expected_field_name, expected_field_info in expected.model_fields.items():
-            key = Schema.generate_key(expected_field_info)
-
-            # names + types match, so we're good
-            if (
-                expected_field_name in current.model_fields
-                and key
-                == Schema.generate_key(current.model_fields[expected_field_name])
-            ):
-                continue
-
-            # default/default factory
-            if not expected_field_info.is_required():
-                current = current.add(
-                    **{
-                        expected_field_name: (
-                            field_value := expected_field_info.default_factory()
-                            if expected_field_info.default_factory is not None
-                            else expected_field_info.default
-                        )
-                    }
-                )
-
-                current_lookup = type(current)._fieldinfo_lookup()
+        cls, steps = _conform_plan(type(self), expected)
+        if not steps:
+            return self
+
+        values = self.model_dump()
+        for field_name, source in steps:
+            # copy a compatible field
+            if isinstance(source, str):
+                values[field_name] = values[source]
                 if logger:
                     logger.info(
-                        f"Constructed default input field {expected_field_name}={field_value} from {current}"
-                    )
-
-        # 2. Copy fields
-        for expected_field_name, expected_field_info in expected.model_fields.items():
-            key = Schema.generate_key(expected_field_info)
-
-            # names + types match, so we're good
-            if (
-                expected_field_name in current.model_fields
-                and key
-                == Schema.generate_key(current.model_fields[expected_field_name])
-            ):
-                continue
-
-            if len(current_lookup[key]) < len(expected_lookup[key]):
-                raise ConfigurationError(
-                    f"Cannot cast input. Not enough fields with FieldInfo: {expected_field_info.__str__()} (found {len(current_lookup[key])}, but we need to populate {len(expected_lookup[key])})"
-                )
-
-            # find a compatible field in the current schema
-            found: bool = False
-            for field_name, field_info in current.model_fields.items():
-                if key == Schema.generate_key(field_info):
-                    current = current.add(
-                        **{expected_field_name: getattr(current, field_name)}
+                        "Copied field {}={} to {}", source, values[source], field_name
                     )
-                    current_lookup = type(current)._fieldinfo_lookup()
-                    if logger:
-                        logger.info(
-                            f"Copied field {field_name}={getattr(current, field_name)} to {expected_field_name}"
-                        )
-                    found = True
-                    break
-
-            if found:
                 continue
 
-            raise ConfigurationError(
-                f"Cannot conform {self} to {expected}. Field compatible with type '{field_info.__str__()}' not found in the input model."
+            # default/default factory
+            values[field_name] = (
+                source.default_factory()  # type: ignore[call-arg]
+                if source.default_factory is not None
+                else source.default
             )
+            if logger:
+                logger.info(
+                    "Constructed default input field {}={} from {}",
+                    field_name,
+                    values[field_name],
+                    self,
+                )
 
-        return current
+        return cls(**values)
 
     @staticmethod
     def generate_key(field_info: FieldInfo) -> str:
@@ -340,3 +266,112 @@ class ResponseSchema(Schema):
         for field_name, field_info in cls.model_fields.items():
             lookup[Schema.generate_key(field_info)].append((field_name, field_info))
         return lookup
+
+
+# Dynamic Schema classes are interned by shape: building a pydantic model class is
+# expensive, and Schema.of / Schema.add are called per row (e.g., by MapUnit, conform
+# and the executor), so repeated shapes reuse one class.
+SCHEMA_CLASS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=SCHEMA_CLASS_CACHE_SIZE)
+def _schema_class(name: str, annotations: Tuple[Tuple[str, Any], ...]) -> Type[Schema]:
+    return type(
+        name,
+        (Schema,),
+        {
+            "__module__": __name__,
+            "__annotations__": dict(annotations),
+        },
+    )
+
+
+@lru_cache(maxsize=SCHEMA_CLASS_CACHE_SIZE)
+def _extended_class(
+    cls: Type[Schema], fields: Tuple[Tuple[str, Any], ...], prepend: bool
+) -> Type[Schema]:
+    existing_fields = {
+        field_name: (field_info.annotation, Field(...))
+        for field_name, field_info in cls.model_fields.items()
+    }
+    new_fields = {
+        field_name: (t if isinstance(t, tuple) else (t, Field(...)))
+        for field_name, t in fields
+    }
+    model_fields = (
+        {**new_fields, **existing_fields}
+        if prepend
+        else {**existing_fields, **new_fields}
+    )
+
+    return create_model(  # type: ignore
+        cls.__name__, **model_fields, __base__=Schema
+    )
+
+
+@lru_cache(maxsize=SCHEMA_CLASS_CACHE_SIZE)
+def _conform_plan(
+    source: Type[Schema], expected: Type[Schema]
+) -> Tuple[Type[Schema], Tuple[Tuple[str, Union[str, FieldInfo]], ...]]:
+    """
+    Plans Schema.conform for every instance of `source`: the conformed class, and the
+    fields to populate in order, each from the default of an expected field
+    (`FieldInfo`) or by copying a compatible field (its name).
+    """
+    current = source
+    steps: List[Tuple[str, Union[str, FieldInfo]]] = []
+
+    def matches(field_name: str, key: str) -> bool:
+        # names + types match, so we're good
+        return field_name in current.model_fields and key == Schema.generate_key(
+            current.model_fields[field_name]
+        )
+
+    expected_keys = {
+        field_name: Schema.generate_key(field_info)
+        for field_name, field_info in expected.model_fields.items()
+    }
+    expected_lookup = expected._fieldinfo_lookup()
+
+    # 1. Set defaults
+    for expected_field_name, expected_field_info in expected.model_fields.items():
+        if matches(expected_field_name, expected_keys[expected_field_name]):
+            continue
+
+        if not expected_field_info.is_required():
+            default = (
+                expected_field_info.default_factory()  # type: ignore[call-arg]
+                if expected_field_info.default_factory is not None
+                else expected_field_info.default
+            )
+            current = current.append(
+                **{expected_field_name: Schema.infer_pydantic_annotation(default)}
+            )
+            steps.append((expected_field_name, expected_field_info))
+
+    # 2. Copy fields
+    for expected_field_name, expected_field_info in expected.model_fields.items():
+        key = expected_keys[expected_field_name]
+        if matches(expected_field_name, key):
+            continue
+
+        current_lookup = current._fieldinfo_lookup()
+        if len(current_lookup[key]) < len(expected_lookup[key]):
+            raise ConfigurationError(
+                f"Cannot cast input. Not enough fields with FieldInfo: {expected_field_info.__str__()} (found {len(current_lookup[key])}, but we need to populate {len(expected_lookup[key])})"
+            )
+
+        # find a compatible field in the current schema
+        field_name, field_info = current_lookup[key][0]
+        current = current.append(**{expected_field_name: field_info.annotation})
+        steps.append((expected_field_name, field_name))
+
+    return current, tuple(steps)
+
+
+def _interned(factory: Callable[..., Type[Schema]], *key: Any) -> Type[Schema]:
+    try:
+        return factory(*key)
+    except TypeError:
+        # unhashable annotations (e.g., a FieldInfo) are not interned
+        return factory.__wrapped__(*key)  # type: ignore[attr-defined]
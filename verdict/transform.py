@@ -1,11 +1,15 @@
 import statistics
+from itertools import chain
 from operator import attrgetter
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
 
 from verdict.core.primitive import Unit
 from verdict.schema import Schema
-from verdict.util.exceptions import VerdictExecutionTimeError
+from verdict.util.exceptions import ConfigurationError, VerdictExecutionTimeError
 from verdict.util.misc import lightweight
+from verdict.util.process import cpu_bound_executor
 from verdict.util.tracing import ExecutionContext
 
 
@@ -14,15 +18,25 @@ class MapUnit(Unit):
     _char: str = "Map"
 
     accumulate: bool = True
+    cpu_bound: bool = False
     map_func: Callable[[Union[Any, List[Any]]], Union[Any, List[Any]]]
 
     def __init__(
         self,
         map_func: Callable[[Union[Any, List[Any]]], Union[Any, List[Any]]],
+        cpu_bound: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self.data.map_func = lambda x: map_func(x)
+        self.cpu_bound = (
+            cpu_bound or self.cpu_bound or getattr(map_func, "cpu_bound", False)
+        )
+
+    def map(self, values: Union[Any, List[Any]]) -> Union[Any, List[Any]]:
+        if self.cpu_bound:
+            return cpu_bound_executor.run(self.data.map_func, values)
+        return self.data.map_func(values)
 
     class InputSchema(Schema):
         values: Union[Any, List[Any]]
@@ -51,7 +65,7 @@ class MapUnit(Unit):
                 if len(values) == 1:
                     values = values[0]
 
-                output = self.data.map_func(values)
+                output = self.map(values)
                 if isinstance(output, Schema):
                     self.OutputSchema = self.ResponseSchema = output.__class__  # type: ignore
                     result = output  # type: ignore
@@ -100,23 +114,26 @@ class FieldMapUnit(MapUnit):
             values = input.values
 
             if len(self.fields) == 0 and len(values) > 0:
-                self.fields = list(values[0].model_fields.keys())
+                self.fields = list(type(values[0]).model_fields.keys())
 
-            assert all(field in values[0].model_fields for field in self.fields), (
-                f"Fields {self.fields} not a subset of input {input.values}"
-            )
+            assert all(
+                field in type(values[0]).model_fields for field in self.fields
+            ), f"Fields {self.fields} not a subset of input {input.values}"
 
-            result = Schema.of(
-                **{  # type: ignore
-                    field: self.data.map_func(list(map(attrgetter(field), values)))
-                    for field in self.fields
-                }
-            )
+            result = self.pool(values)
 
             if call is not None:
                 call.set_outputs(result)
             return result
 
+    def pool(self, values: List[Schema]) -> Schema:
+        return Schema.of(
+            **{  # type: ignore
+                field: self.map(list(map(attrgetter(field), values)))
+                for field in self.fields
+            }
+        )
+
     @staticmethod
     def from_fn(
         fn: Callable[[List[Any]], Any], name: str
@@ -146,9 +163,186 @@ class MeanVariancePoolUnit(FieldMapUnit):
         )
 
 
+class ArrayPoolUnit(FieldMapUnit):
+    """
+    Pools all fields over all ensemble members at once. The fields of the members are
+    stacked into a (members, fields) array, which `pool_func` reduces along axis 0 to
+    either a (fields,) array, or a dict of output name -> (fields,) array (one nested
+    Schema per field). Output Schema classes are built once per set of fields.
+    """
+
+    dtype: Any
+
+    def __init__(
+        self,
+        pool_func: Callable[[np.ndarray], Union[np.ndarray, Dict[str, np.ndarray]]],
+        fields: Union[str, List[str]] = [],
+        dtype: Any = float,
+        **kwargs,
+    ):
+        super().__init__(pool_func, fields, **kwargs)  # type: ignore
+        self.dtype = dtype
+
+    def stack(self, values: List[Schema]) -> np.ndarray:
+        getter = attrgetter(*self.fields)
+        rows = map(getter, values)
+        return np.fromiter(
+            rows if len(self.fields) == 1 else chain.from_iterable(rows),
+            dtype=self.dtype,
+            count=len(values) * len(self.fields),
+        ).reshape(len(values), len(self.fields))
+
+    def pool(self, values: List[Schema]) -> Schema:
+        pooled = self.map(self.stack(values))
+        annotation = float if self.dtype is float else Any
+
+        if isinstance(pooled, dict):
+            nested = Schema.inline(**{name: annotation for name in pooled})
+            outputs: Dict[str, Any] = {
+                name: output.tolist() for name, output in pooled.items()
+            }
+            return Schema.inline(**{field: nested for field in self.fields})(
+                **{
+                    field: nested(**{name: outputs[name][i] for name in outputs})
+                    for i, field in enumerate(self.fields)
+                }
+            )
+
+        return Schema.inline(**{field: annotation for field in self.fields})(
+            **dict(zip(self.fields, np.asarray(pooled).tolist()))
+        )
+
+
+def label_codes(labels: List[Any]) -> np.ndarray:
+    """Integer codes for `labels`, equal where the labels are equal."""
+    if labels and isinstance(labels[0], (int, float)):
+        native = np.asarray(labels)
+        if native.ndim == 1 and native.dtype.kind in "biuf":
+            return np.unique(native, return_inverse=True)[1].ravel()
+
+    # e.g., str (which NumPy sorts slower than a dict hashes it) or None
+    seen: Dict[Any, int] = {}
+    return np.fromiter(
+        (seen.setdefault(label, len(seen)) for label in labels),
+        dtype=np.intp,
+        count=len(labels),
+    )
+
+
+def vote(stacked: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Per column, the label with the most (weighted) votes. Ties go to the label seen
+    first, like `statistics.mode`.
+    """
+    members, fields = stacked.shape
+    flat = stacked.ravel()  # member-major, so flat[i] is in column i % fields
+    codes = label_codes(flat.tolist())
+    n_codes = int(codes.max()) + 1 if len(codes) else 1
+
+    # count every (column, label) pair at once
+    keys = np.tile(np.arange(fields) * n_codes, members) + codes
+    counts = np.bincount(
+        keys,
+        weights=None if weights is None else np.repeat(weights, fields),
+        minlength=fields * n_codes,
+    ).reshape(fields, n_codes)
+
+    # among the labels with the most votes, pick the one whose first vote came first
+    first = np.full(fields * n_codes, flat.size)
+    np.minimum.at(first, keys, np.arange(flat.size))
+    first = np.where(
+        counts == counts.max(axis=1, keepdims=True),
+        first.reshape(fields, n_codes),
+        flat.size,
+    )
+    return flat[first.min(axis=1)]
+
+
+class ArrayMeanPoolUnit(ArrayPoolUnit):
+    def __init__(self, fields: Union[str, List[str]] = []):
+        super().__init__(lambda x: x.mean(axis=0), fields, name="ArrayMeanPool")
+
+
+class ArrayMeanVariancePoolUnit(ArrayPoolUnit):
+    def __init__(self, fields: Union[str, List[str]] = []):
+        super().__init__(
+            lambda x: {
+                "mean": x.mean(axis=0),
+                # sample variance, like statistics.variance
+                "variance": x.var(axis=0, ddof=1)
+                if len(x) > 1
+                else np.zeros(x.shape[1]),
+            },
+            fields,
+            name="ArrayMeanVariancePool",
+        )
+
+
+class TrimmedMeanPoolUnit(ArrayPoolUnit):
+    """Mean after dropping the `proportion` lowest and highest values of each field."""
+
+    def __init__(self, fields: Union[str, List[str]] = [], proportion: float = 0.1):
+        if not 0 <= proportion < 0.5:
+            raise ConfigurationError(
+                f"TrimmedMeanPoolUnit proportion must be in [0, 0.5), got {proportion}"
+            )
+
+        def trimmed_mean(x: np.ndarray) -> np.ndarray:
+            cut = int(proportion * len(x))
+            return np.sort(x, axis=0)[cut : len(x) - cut].mean(axis=0)
+
+        super().__init__(trimmed_mean, fields, name="TrimmedMeanPool")
+
+
+class QuantilePoolUnit(ArrayPoolUnit):
+    """Quantiles of each field, e.g., `p25`, `p50` and `p75` for the default quantiles."""
+
+    def __init__(
+        self,
+        fields: Union[str, List[str]] = [],
+        quantiles: Sequence[float] = (0.25, 0.5, 0.75),
+    ):
+        names = [f"p{q * 100:g}".replace(".", "_") for q in quantiles]
+        super().__init__(
+            lambda x: dict(zip(names, np.quantile(x, quantiles, axis=0))),
+            fields,
+            name="QuantilePool",
+        )
+
+
+class MajorityVotePoolUnit(ArrayPoolUnit):
+    """The most common value of each field (of any type)."""
+
+    def __init__(self, fields: Union[str, List[str]] = []):
+        super().__init__(vote, fields, dtype=object, name="MajorityVotePool")
+
+
+class WeightedVotePoolUnit(ArrayPoolUnit):
+    """The value of each field with the largest total weight; one weight per member."""
+
+    def __init__(self, weights: Sequence[float], fields: Union[str, List[str]] = []):
+        member_weights = np.asarray(weights, dtype=float)
+
+        def weighted_vote(x: np.ndarray) -> np.ndarray:
+            if len(x) != len(member_weights):
+                raise VerdictExecutionTimeError(
+                    f"WeightedVotePoolUnit has {len(member_weights)} weights, but received {len(x)} members"
+                )
+            return vote(x, member_weights)
+
+        super().__init__(weighted_vote, fields, dtype=object, name="WeightedVotePool")
+
+
 __all__ = [
     "MapUnit",
     "MeanPoolUnit",
     "MeanVariancePoolUnit",
     "MaxPoolUnit",
+    "ArrayPoolUnit",
+    "ArrayMeanPoolUnit",
+    "ArrayMeanVariancePoolUnit",
+    "TrimmedMeanPoolUnit",
+    "QuantilePoolUnit",
+    "MajorityVotePoolUnit",
+    "WeightedVotePoolUnit",
 ]
@@ -0,0 +1,153 @@
+"""
+Background threads (the run log writer, trace exporters and rate limiter timers) and
+how they survive a fork. The log writer and the trace exporters are BackgroundWorkers.
+
+`Pipeline.run_from_dataset(processes=N)` forks its worker processes, so the pipeline
+(including its locks and lambdas) does not have to be pickled. Only the forking thread
+survives a fork; the child inherits the locks and queues of the other threads in
+whatever state they were in. Forking is still safe there, unlike in CPUBoundExecutor
+(which uses forkserver since it creates workers while tasks run), because:
+
+- the parent forks before its run starts, so no executor thread is holding a lock;
+- `quiesce` first waits for the registered background threads to finish their queued
+  work (e.g., a message being written or a batch of calls being exported);
+- the child calls `_after_fork()` on every registered object, which replaces its locks
+  and queues and restarts its thread (or, for a SQLiteCache, reopens its connection).
+
+Timer callbacks only run for requests queued on a rate limiter, and there are none
+before a run starts.
+"""
+
+import os
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Callable, List, Optional
+
+_restartable: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def register(obj: Any) -> None:
+    """
+    Call `obj._after_fork()` in forked children, e.g., to restart its background thread
+    or reopen a connection.
+    """
+    _restartable.add(obj)
+
+
+def unregister(obj: Any) -> None:
+    _restartable.discard(obj)
+
+
+def quiesce() -> None:
+    """Wait for the registered background threads to finish their queued work."""
+    for obj in list(_restartable):
+        if (flush := getattr(obj, "flush", None)) is not None:
+            flush()
+
+
+class BackgroundWorker:
+    """
+    A daemon thread that passes the items put on its queue to `process`, in batches of
+    up to `max_batch_size` items. With `flush_interval`, a partial batch is processed
+    once it is that many seconds old; otherwise only full batches are (or every item,
+    with the default `max_batch_size=1`). Items put while `max_queue_size` items are
+    waiting are dropped (counted in `dropped`) instead of blocking the caller.
+
+    Args:
+        process: Called with each batch on the worker thread.
+        name: The name of the worker thread.
+        max_batch_size: The most items passed to one `process`.
+        flush_interval: Seconds after which a partial batch is processed.
+        max_queue_size: The most items waiting to be processed (0 for unbounded).
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], None],
+        name: str,
+        max_batch_size: int = 1,
+        flush_interval: Optional[float] = None,
+        max_queue_size: int = 0,
+    ) -> None:
+        self.process = process
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._after_fork()
+        register(self)
+
+    def _after_fork(self) -> None:
+        # a forked child starts over, since its parent processes the items queued so far
+        self.lock = threading.Lock()
+        self.queue: "queue.Queue[Any] | queue.SimpleQueue[Any]" = (
+            queue.Queue(self.max_queue_size)
+            if self.max_queue_size
+            else queue.SimpleQueue()  # cheaper to put to
+        )
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        batch: List[Any] = []
+        deadline = self._deadline()
+        while True:
+            try:
+                item = self.queue.get(
+                    timeout=None
+                    if deadline is None
+                    else max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                item = None  # flush_interval elapsed
+
+            control = item is None or item is _STOP or isinstance(item, threading.Event)
+            if not control:
+                batch.append(item)
+                if len(batch) < self.max_batch_size:
+                    continue
+
+            if batch:
+                self.process(batch)
+                batch = []
+            deadline = self._deadline()
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _deadline(self) -> Optional[float]:
+        if self.flush_interval is None:
+            return None
+        return time.monotonic() + self.flush_interval
+
+    def put(self, item: Any) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """Blocks until the items put so far are processed."""
+        processed = threading.Event()
+        self.queue.put(processed)
+        processed.wait()
+
+    def stop(self) -> None:
+        """Processes the remaining items and stops the worker thread."""
+        unregister(self)
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+
+
+_STOP = object()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        after_in_child=lambda: [obj._after_fork() for obj in list(_restartable)]
+    )
@@ -0,0 +1,469 @@
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import string
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from verdict.util import background
+from verdict.util.ratelimit import MultiEvent, ReservationState
+
+# parameters that do not change the response
+UNCACHED_PARAMETERS = {
+    "api_key",
+    "timeout",
+    "stream_timeout",
+    "num_retries",
+    "max_retries",
+}
+
+# once over max_bytes, evict down to this fraction of it, so the cache is not scanned on
+# every insert
+LOW_WATER_MARK = 0.9
+# least recently used keys fetched at a time while evicting from a SQLiteCache
+EVICTION_BATCH_SIZE = 64
+
+# the nonce line prepended to prompts by PromptMessage.to_messages; its marker keeps an
+# ordinary first line (e.g., "Evaluation") from being stripped as if it were one
+NONCE_PATTERN = re.compile(r"^\[nonce:[A-Za-z]{10}\]\n")
+
+
+def new_nonce() -> str:
+    return f"[nonce:{''.join(random.choices(string.ascii_letters, k=10))}]\n"
+
+
+class ResponseCache(ABC):
+    """
+    A persistent cache of provider responses, consulted by `Client.__call__`.
+
+    Args:
+        ttl: Seconds after which an entry is treated as a miss and removed.
+        max_bytes: Approximate size bound; once the total size of stored responses
+            exceeds it, least recently used entries are evicted until it is below
+            `LOW_WATER_MARK` of it.
+    """
+
+    ttl: Optional[float]
+    max_bytes: Optional[int]
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(
+        self, ttl: Optional[float] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._set(key, value)
+
+    def is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    @staticmethod
+    def default() -> "ResponseCache":
+        global _default_cache
+        with _default_cache_lock:
+            if _default_cache is None:
+                from verdict import config
+
+                _default_cache = SQLiteCache(config.VERDICT_LOG_DIR / "cache.sqlite")
+            return _default_cache
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(ttl={self.ttl}, max_bytes={self.max_bytes})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Stores responses in a single SQLite database; safe to share between threads and
+    processes. A forked child (e.g., a worker of `Pipeline.run_from_dataset` with
+    `processes`) opens its own connection, since SQLite connections must not be used
+    across a fork.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        super().__init__(ttl=ttl, max_bytes=max_bytes)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connect()
+        background.register(self)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT, size INTEGER, created REAL, accessed REAL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _connect(self) -> None:
+        self.connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+
+    def _after_fork(self) -> None:
+        # keep the parent's connection referenced, since closing it (also when it is
+        # garbage collected) could release locks or write to the database under it
+        self._inherited_connection = self.connection
+        self.lock = threading.RLock()
+        self._connect()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if self.is_expired(created):
+                self._delete([key])
+                return None
+
+            self.connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            return value
+
+    def _set(self, key: str, value: str) -> None:
+        size = len(value.encode())
+        now = time.time()
+        with self.lock:
+            previous = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self.size += size - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self.size <= self.max_bytes:
+            return
+
+        low_water = self.max_bytes * LOW_WATER_MARK
+        while self.size > low_water:
+            keys = [
+                key
+                for (key,) in self.connection.execute(
+                    "SELECT key FROM responses ORDER BY accessed LIMIT ?",
+                    (EVICTION_BATCH_SIZE,),
+                )
+            ]
+            if not keys:
+                break
+            for key in keys:
+                if self.size <= low_water:
+                    break
+                self._delete([key])
+
+        if self.size > low_water:
+            # another process evicted entries since; count what is actually stored
+            self.size = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def _delete(self, keys: List[str]) -> None:
+        for key in keys:
+            row = self.connection.execute(
+                "DELETE FROM responses WHERE key = ? RETURNING size", (key,)
+            ).fetchone()
+            if row is not None:
+                self.size -= row[0]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.size = 0
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.path}, ttl={self.ttl}, max_bytes={self.max_bytes})"
+
+
+class ShardedDiskCache(ResponseCache):
+    """
+    Stores each response as a file under `directory/<shard>/<key>`, where the shard is
+    the first `shard_width` hex characters of the key. Writes are atomic (write to a
+    temporary file, then rename), so concurrent writers never expose partial entries.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        shard_width: int = 2,
+    ) -> None:
+        super().__init__(ttl=ttl, max_bytes=max_bytes)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_width = shard_width
+
+        self.size = sum(entry.stat().st_size for _, entry in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[: self.shard_width] / key
+
+    def _entries(self) -> Iterator[Tuple[Path, os.DirEntry]]:
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield Path(entry.path), entry
+
+    def _get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            # st_mtime is the creation time; st_atime is bumped on access for LRU
+            created = path.stat().st_mtime
+            if self.is_expired(created):
+                self._delete(path)
+                return None
+
+            value = path.read_text()
+            os.utime(path, (time.time(), created))
+            return value
+        except FileNotFoundError:
+            return None
+
+    def _set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".")
+        with os.fdopen(fd, "w") as f:
+            f.write(value)
+        size = os.stat(tmp_path).st_size
+
+        with self.lock:
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+            os.replace(tmp_path, path)
+            self.size += size - previous
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self.size <= self.max_bytes:
+            return
+
+        # a full scan, which also picks up entries written or evicted by other
+        # processes; evicting down to the low-water mark keeps it rare
+        entries = sorted(self._entries(), key=lambda entry: entry[1].stat().st_atime)
+        self.size = sum(entry.stat().st_size for _, entry in entries)
+        for path, _ in entries:
+            if self.size <= self.max_bytes * LOW_WATER_MARK:
+                break
+            self._delete(path)
+
+    def _delete(self, path: Path) -> None:
+        with self.lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                return
+            self.size -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            for path, _ in list(self._entries()):
+                path.unlink(missing_ok=True)
+            self.size = 0
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(directory={self.directory}, ttl={self.ttl}, max_bytes={self.max_bytes})"
+
+
+@dataclass
+class CacheScope:
+    """
+    The scope of provider calls made while executing a Unit.
+
+    Attributes:
+        cache: The response cache, if any.
+        namespace: Distinguishes otherwise identical requests that are meant to be
+            independent samples (e.g., Units of a Layer when the model uses a nonce).
+        ready: Rate limit to wait on before calling the provider. A call that reuses
+            a response instead (a cache hit or a coalesced request) refunds it, so
+            it is neither throttled nor charged.
+        refunded: Whether `ready` was refunded.
+    """
+
+    cache: Optional[ResponseCache]
+    namespace: str
+    ready: Optional[MultiEvent] = None
+    refunded: bool = False
+
+    def refund(self) -> None:
+        if self.ready is None:
+            return
+
+        self.ready.cancel()
+        # only atomic policies can refund; otherwise the charge is released as usual
+        self.refunded = getattr(self.ready, "state", None) == ReservationState.CANCELLED
+        if self.refunded:
+            self.ready = None  # later calls of the Unit are not throttled
+
+
+_current_scope: ContextVar[Optional[CacheScope]] = ContextVar(
+    "verdict_cache_scope", default=None
+)
+
+
+@contextmanager
+def cache_scope(scope: Optional[CacheScope]) -> Iterator[None]:
+    token = _current_scope.set(scope)
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+def current_scope() -> Optional[CacheScope]:
+    return _current_scope.get()
+
+
+@lru_cache(maxsize=1024)
+def _schema_key(response_model: Type) -> str:
+    try:
+        return json.dumps(response_model.model_json_schema(), sort_keys=True)
+    except Exception:
+        return repr(response_model)
+
+
+def _strip_nonce(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    stripped = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            content = NONCE_PATTERN.sub("", content)
+        elif isinstance(content, list):
+            content = [
+                {**item, "text": NONCE_PATTERN.sub("", item["text"])}
+                if isinstance(item, dict) and item.get("type") == "text"
+                else item
+                for item in content
+            ]
+        stripped.append({**message, "content": content})
+    return stripped
+
+
+def request_key(
+    parameters: Dict[str, Any],
+    response_model: Optional[Type] = None,
+    use_nonce: bool = False,
+    namespace: Optional[str] = None,
+) -> str:
+    """
+    Hash of everything that determines a response: model and connection parameters,
+    inference parameters, response_model schema and messages (without the nonce).
+    """
+    messages = parameters.get("messages", [])
+    request = {
+        "parameters": {
+            name: value
+            for name, value in parameters.items()
+            if name not in UNCACHED_PARAMETERS
+            and name not in ("messages", "response_model")
+        },
+        "messages": _strip_nonce(messages) if use_nonce else messages,
+        "response_model": _schema_key(response_model) if response_model else None,
+        # the nonce makes repeated calls independent samples; keep them distinct
+        "namespace": namespace if use_nonce else None,
+    }
+    return hashlib.sha256(
+        json.dumps(request, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def encode_response(response: Any, response_model: Optional[Type] = None) -> str:
+    return json.dumps(
+        {
+            "structured" if response_model is not None else "completion": (
+                response.model_dump(mode="json", warnings=False)
+            )
+        }
+    )
+
+
+def decode_response(value: str, response_model: Optional[Type] = None) -> Any:
+    data = json.loads(value)
+    if response_model is not None:
+        return response_model.model_validate(data["structured"])
+
+    from litellm import ModelResponse  # type: ignore[import-untyped]
+
+    return ModelResponse(**data["completion"])
@@ -0,0 +1,88 @@
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from verdict.util.exceptions import VerdictSystemError
+from verdict.util.ratelimit import AwaitableEvent
+
+
+class Flight:
+    """
+    A provider call in flight, shared by identical concurrent requests. The first
+    request (the leader) makes the call; the others wait for its outcome.
+    """
+
+    done: AwaitableEvent
+    response: Any
+    error: Optional[BaseException]
+
+    def __init__(self) -> None:
+        self.done = AwaitableEvent()
+        self.response = None
+        self.error = None
+
+    def _outcome(self) -> Any:
+        if self.error is None:
+            # every request gets its own response object
+            return copy.deepcopy(self.response)
+        if isinstance(self.error, Exception):
+            raise self.error
+        raise VerdictSystemError("Coalesced request was cancelled") from self.error
+
+    def result(self) -> Any:
+        self.done.wait()
+        return self._outcome()
+
+    async def result_async(self) -> Any:
+        await self.done.wait_async()
+        return self._outcome()
+
+
+class SingleFlight:
+    """
+    Deduplicates identical concurrent requests (by request key): while a request is
+    in flight, identical requests wait for its response instead of calling the
+    provider again.
+    """
+
+    calls: int
+    coalesced: int
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.flights: Dict[str, Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def join(self, key: str) -> Tuple[Flight, bool]:
+        """Returns the flight for `key`, and whether the caller leads (makes) the call."""
+        with self.lock:
+            if (flight := self.flights.get(key)) is not None:
+                self.coalesced += 1
+                return flight, False
+
+            self.calls += 1
+            flight = self.flights[key] = Flight()
+            return flight, True
+
+    def land(
+        self,
+        key: str,
+        flight: Flight,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Completes the leader's call; later identical requests start a new flight."""
+        with self.lock:
+            del self.flights[key]
+        flight.response = response
+        flight.error = error
+        flight.done.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+in_flight = SingleFlight()
@@ -1,10 +1,14 @@
+import json
 import os
 import sys
-from typing import Optional
+import traceback
+from typing import Any, Dict, List, Optional, Sequence
 
 from loguru import logger as base_logger
+from loguru._file_sink import FileSink
 
-from verdict import config
+from verdict.util.background import BackgroundWorker
+from verdict.util.exceptions import ConfigurationError
 
 # logging
 VERDICT_COMPACT_LOG_FORMAT: str = "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <red>{extra[unit]: >80} T={extra[thread_id]: <5}</red> | <cyan>{function}</cyan> - <level>{message:.150}...</level>"
@@ -13,8 +17,63 @@ VERDICT_VERBOSE_LOG_FORMAT: str = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green>
 logger = base_logger.bind(thread_id="main", unit="")
 logger.remove()
 
+_LEVEL_NO = {
+    level: base_logger.level(level).no
+    for level in ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+}
+
+
+def enabled(level: str) -> bool:
+    """
+    Whether a message at `level` is recorded by any sink. Guard messages that are
+    expensive to build (e.g., `Schema.escape`, `pprint.pformat`) on the hot paths.
+    """
+    no = _LEVEL_NO.get(level) or base_logger.level(level).no
+    # loguru drops messages below the minimum level of all of its sinks
+    return no >= base_logger._core.min_level  # type: ignore[attr-defined]
+
+
+class UnitLogger:
+    """
+    `logger` bound to a Unit (`unit` and `thread_id`) for the executor's per-task hot
+    paths. Since `logger.bind` allocates a new logger, binding (and joining the prefix)
+    is deferred until a message is recorded. Like loguru, `args` are only formatted
+    into the message if it is recorded.
+    """
+
+    __slots__ = ("prefix", "thread_id")
+
+    def __init__(self, prefix: Sequence[str], thread_id: Any = "main") -> None:
+        self.prefix = prefix
+        self.thread_id = thread_id
+
+    def _log(
+        self, level: str, message: str, *args: Any, exception: bool = False
+    ) -> None:
+        if enabled(level):
+            logger.bind(unit=".".join(self.prefix), thread_id=self.thread_id).opt(
+                depth=2, exception=exception
+            ).log(level, message, *args)
+
+    def debug(self, message: str, *args: Any) -> None:
+        self._log("DEBUG", message, *args)
+
+    def info(self, message: str, *args: Any) -> None:
+        self._log("INFO", message, *args)
+
+    def warning(self, message: str, *args: Any) -> None:
+        self._log("WARNING", message, *args)
+
+    def error(self, message: str, *args: Any) -> None:
+        self._log("ERROR", message, *args)
+
+    def exception(self, message: str, *args: Any) -> None:
+        self._log("ERROR", message, *args, exception=True)
+
 
 def init_logger(name: Optional[str] = None) -> None:
+    from verdict import config
+
     global logger
     logger.remove()
     logger.add(sys.stderr, format=VERDICT_COMPACT_LOG_FORMAT, level="CRITICAL")
@@ -25,7 +84,71 @@ def init_logger(name: Optional[str] = None) -> None:
         )
 
     if name and not os.getenv("VERDICT_NO_LOG", False):
+        if config.RUN_LOG_FORMAT not in ("text", "jsonl"):
+            raise ConfigurationError(
+                f"RUN_LOG_FORMAT must be 'text' or 'jsonl', got '{config.RUN_LOG_FORMAT}'."
+            )
+
+        jsonl = config.RUN_LOG_FORMAT == "jsonl"
+        file_sink = FileSink(
+            str(
+                config.VERDICT_LOG_DIR
+                / f"{name}_{{time}}.{'jsonl' if jsonl else 'log'}"
+            ),
+            rotation=config.RUN_LOG_ROTATION,
+            retention=config.RUN_LOG_RETENTION,
+            compression=config.RUN_LOG_COMPRESSION,
+        )
         logger.add(
-            config.VERDICT_LOG_DIR / f"{name}_{{time}}.log",
-            format=VERDICT_VERBOSE_LOG_FORMAT,
+            BackgroundSink(file_sink),
+            format=jsonl_format if jsonl else VERDICT_VERBOSE_LOG_FORMAT,
+            level=config.RUN_LOG_LEVEL,
+            colorize=False,
         )
+
+
+class BackgroundSink:
+    """
+    A loguru sink that hands formatted messages to a background thread, which writes
+    them to `sink` (e.g., loguru's FileSink, which handles rotation, retention and
+    compression). Unlike loguru's `enqueue=True`, messages are not pickled through a
+    multiprocessing pipe, which costs the logging threads more than the write itself.
+    Removing the sink (`logger.remove`) writes the remaining messages.
+    """
+
+    def __init__(self, sink: Any) -> None:
+        self.sink = sink
+        self.worker = BackgroundWorker(self._write, name="verdict-log-writer")
+
+    def _write(self, messages: List[str]) -> None:
+        for message in messages:
+            self.sink.write(message)
+
+    def write(self, message: str) -> None:
+        self.worker.put(message)
+
+    def flush(self) -> None:
+        """Blocks until the messages queued so far are written."""
+        self.worker.flush()
+
+    def stop(self) -> None:
+        self.worker.stop()
+        self.sink.stop()
+
+
+def jsonl_format(record: Dict[str, Any]) -> str:
+    """Formats a message as one compact JSON object per line (see RUN_LOG_FORMAT)."""
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "unit": record["extra"].get("unit", ""),
+        "thread": record["extra"].get("thread_id", "main"),
+        "function": record["function"],
+        "message": record["message"],
+    }
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+
+    # loguru formats the returned template with the record
+    record["extra"]["jsonl"] = json.dumps(entry, default=str)
+    return "{extra[jsonl]}\n"
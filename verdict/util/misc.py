@@ -6,7 +6,9 @@ import signal
 import sys
 import threading
 from functools import wraps
-from typing import Any, Callable, Optional, Type
+from typing import Any, Callable, Optional, Type, TypeVar
+
+T = TypeVar("T")
 
 
 def is_signal_safe():
@@ -78,6 +80,15 @@ def lightweight(cls: Type) -> Type:
     return cls
 
 
+def cpu_bound(obj: T) -> T:
+    """
+    Marks a MapUnit class, or a function passed to a MapUnit, to run its map function in
+    a worker process instead of a lightweight thread.
+    """
+    obj.cpu_bound = True  # type: ignore[attr-defined]
+    return obj
+
+
 def shorten_string(text: str, truncate_length: int = 10, encoded: bool = True) -> str:
     """
     Shorten inputs for logging, particularly if it contains base64 data.
@@ -101,4 +112,7 @@ def shorten_string(text: str, truncate_length: int = 10, encoded: bool = True) -
 
         return text
     else:
+        # cheap pre-check: a run of 100+ non-space characters needs a 100+ character word
+        if max(map(len, text.split()), default=0) < 100:
+            return text
         return re.sub(r"([^\s']{100,})", truncate_base64, text)
@@ -0,0 +1,120 @@
+import concurrent.futures
+import io
+import multiprocessing
+import sys
+import threading
+import weakref
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import dill  # type: ignore[import-untyped]
+
+from verdict import config
+from verdict.schema import Schema
+
+
+def _restore_schema(values: Dict[str, Any]) -> Schema:
+    return Schema.of(**values)
+
+
+@lru_cache(maxsize=1024)
+def is_importable(cls: type) -> bool:
+    """Whether `cls` can be found by its module and qualified name."""
+    obj: Any = sys.modules.get(cls.__module__)
+    for name in cls.__qualname__.split("."):
+        obj = getattr(obj, name, None)
+    return obj is cls
+
+
+class SchemaPickler(dill.Pickler):
+    """
+    Pickles functions (including lambdas and closures) by value with dill. Schema
+    classes that can be imported are pickled by reference, so their instances keep
+    their class (and nested models, Scales and validators). Instances of dynamic
+    classes (e.g., from `Schema.of`), which cannot be found by name, are pickled as
+    their field values and restored with `Schema.of`.
+    """
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, type) and issubclass(obj, Schema) and is_importable(obj):
+            # by reference; dill would first try (and fail) to pickle it by value
+            return obj.__qualname__
+        if isinstance(obj, Schema) and not is_importable(type(obj)):
+            return _restore_schema, (dict(obj),)
+        return NotImplemented
+
+
+def dumps(obj: Any, recurse: bool = False) -> bytes:
+    buffer = io.BytesIO()
+    SchemaPickler(buffer, recurse=recurse).dump(obj)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=128)
+def _load_function(payload: bytes) -> Callable[..., Any]:
+    return dill.loads(payload)
+
+
+def _run(function: bytes, args: bytes) -> bytes:
+    return dumps(_load_function(function)(*dill.loads(args)))
+
+
+class CPUBoundExecutor:
+    """
+    Runs CPU-bound functions in a lazily started pool of worker processes, so they are
+    not bound by the GIL shared with the I/O threads. Workers are started with
+    `forkserver` (or `spawn`), since they are started while the executor's threads run
+    tasks, and forking a process with running threads is unsafe (see
+    verdict.util.background).
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+        # functions are pickled once; recursive pickling with dill temporarily replaces
+        # sys.stdout, so it must not run concurrently
+        self.functions_lock = threading.Lock()
+        self.functions: weakref.WeakKeyDictionary[Callable[..., Any], bytes] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self.lock:
+            if self.pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                self.pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=config.CPU_BOUND_WORKER_COUNT,
+                    mp_context=multiprocessing.get_context(
+                        "forkserver" if "forkserver" in methods else "spawn"
+                    ),
+                )
+            return self.pool
+
+    def _dumps_function(self, fn: Callable[..., Any]) -> bytes:
+        with self.functions_lock:
+            if (payload := self.functions.get(fn)) is None:
+                payload = self.functions[fn] = dumps(fn, recurse=True)
+            return payload
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        function = self._dumps_function(fn)
+        pool = self._pool()
+        try:
+            return dill.loads(pool.submit(_run, function, dumps(args)).result())
+        except BrokenProcessPool:
+            # a worker died (e.g., out of memory); start a new pool for later calls
+            with self.lock:
+                if self.pool is pool:
+                    self.pool = None
+            raise
+
+    def shutdown(self) -> None:
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown(wait=True, cancel_futures=True)
+                self.pool = None
+
+
+cpu_bound_executor = CPUBoundExecutor()
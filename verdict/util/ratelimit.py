@@ -1,12 +1,32 @@
+import asyncio
+import heapq
+import itertools
+import os
+import struct
+import tempfile
 import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from collections import deque
+from contextlib import ExitStack
 from enum import Enum
+from pathlib import Path
 from queue import Queue
-from types import SimpleNamespace
-from typing import Dict, List, Optional, Protocol, Tuple, Union
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
+
+from verdict.util import background
 from verdict.util.exceptions import VerdictSystemError
 
 
@@ -30,6 +50,59 @@ def enable() -> None:
     )
 
 
+def split(policies: Iterable["RateLimitPolicy"], shares: int) -> None:
+    """
+    Keep 1/`shares` of the budget of every rate limiter used by `policies`, e.g., in
+    each of `shares` worker processes running a shard of a dataset. Limiters shared by
+    several policies are split once.
+    """
+    rate_limiters = {
+        id(rate_limiter): rate_limiter
+        for policy in policies
+        for rate_limiter in policy.rate_limiters
+    }
+    for rate_limiter in rate_limiters.values():
+        rate_limiter.split(shares)
+
+
+class AwaitableEvent(threading.Event):
+    """
+    A threading.Event that can also be awaited from an asyncio event loop without
+    blocking a thread. Waiters are woken via `call_soon_threadsafe` on `set()`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._waiters_lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def set(self) -> None:
+        with self._waiters_lock:
+            super().set()
+            waiters, self._waiters = self._waiters, []
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    async def wait_async(self) -> None:
+        if self.is_set():
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._waiters_lock:
+            if self.is_set():
+                return
+            self._waiters.append((loop, future))
+
+        await future
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
 class RateLimiterMetric(Enum):
     REQUESTS = "requests"
     TOKENS = "tokens"
@@ -38,6 +111,10 @@ class RateLimiterMetric(Enum):
 class RateLimiter(ABC):
     @abstractmethod
     def acquire(self, value: Optional[int] = None) -> threading.Event:
+        """
+        Returns an event that is set once `value` may be consumed. Implementations
+        should return an `AwaitableEvent` so async executors can await it.
+        """
         pass
 
     @abstractmethod
@@ -48,29 +125,80 @@ class RateLimiter(ABC):
     def copy(self) -> "RateLimiter":
         pass
 
+    def split(self, shares: int) -> None:
+        """Keep 1/`shares` of the budget. Limiters without a budget are unchanged."""
+        pass
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__}()"
 
 
-class UnlimitedRateLimiter(RateLimiter):
+class ReservableRateLimiter(RateLimiter):
+    """
+    A RateLimiter that RateLimitPolicy can acquire atomically together with its other
+    limiters. The policy holds the limiter's `lock` (if it has one) while calling
+    `available_in` and `consume`. Limiters that only implement RateLimiter are
+    acquired one at a time.
+    """
+
+    @abstractmethod
+    def available_in(self, value: int) -> Optional[float]:
+        """
+        Seconds until `value` can be consumed (0 if it can be now), or None if that
+        depends on a future `release`. Called with `lock` held.
+        """
+        pass
+
+    @abstractmethod
+    def consume(self, value: int) -> None:
+        """Consume `value` immediately. Called with `lock` held."""
+        pass
+
+    @abstractmethod
+    def refund(self, value: int) -> None:
+        """Return `value` consumed by a reservation that was cancelled."""
+        pass
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """Call `callback` (held by a weak reference) whenever budget is released."""
+        if not hasattr(self, "_subscribers"):
+            self._subscribers: List[weakref.WeakMethod] = []
+        self._subscribers.append(weakref.WeakMethod(callback))  # type: ignore[arg-type]
+
+    def notify(self) -> None:
+        for subscriber in list(getattr(self, "_subscribers", ())):
+            if (callback := subscriber()) is not None:
+                callback()
+
+
+class UnlimitedRateLimiter(ReservableRateLimiter):
     def acquire(self, value: Optional[int] = None) -> threading.Event:
-        event = threading.Event()
+        event = AwaitableEvent()
         event.set()
         return event
 
     def release(self, value: Optional[int] = None) -> None:
         pass
 
+    def available_in(self, value: int) -> Optional[float]:
+        return 0
+
+    def consume(self, value: int) -> None:
+        pass
+
+    def refund(self, value: int) -> None:
+        pass
+
     def copy(self) -> "UnlimitedRateLimiter":
         return UnlimitedRateLimiter()
 
 
-class ConcurrentRateLimiter(RateLimiter):
+class ConcurrentRateLimiter(ReservableRateLimiter):
     # config
     max_concurrent: int
 
     # state
-    waiting: Queue[threading.Event]
+    waiting: Queue[AwaitableEvent]
     lock: threading.RLock
     running: int
 
@@ -85,6 +213,10 @@ class ConcurrentRateLimiter(RateLimiter):
     def copy(self) -> "ConcurrentRateLimiter":
         return ConcurrentRateLimiter(self.max_concurrent)
 
+    def split(self, shares: int) -> None:
+        with self.lock:
+            self.max_concurrent = max(self.max_concurrent // shares, 1)
+
     def expire(self) -> None:
         with self.lock:
             while self.running < self.max_concurrent and not self.waiting.empty():
@@ -93,7 +225,7 @@ class ConcurrentRateLimiter(RateLimiter):
                 event.set()
 
     def acquire(self, value: Optional[int] = None) -> threading.Event:
-        event = threading.Event()
+        event = AwaitableEvent()
         self.waiting.put(event)
 
         with self.lock:
@@ -105,12 +237,24 @@ class ConcurrentRateLimiter(RateLimiter):
         with self.lock:
             self.running -= 1
             self.expire()
+        self.notify()
+
+    def available_in(self, value: int) -> Optional[float]:
+        if self.running < self.max_concurrent and self.waiting.empty():
+            return 0
+        return None
+
+    def consume(self, value: int) -> None:
+        self.running += 1
+
+    def refund(self, value: int) -> None:
+        self.release(value)
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(max={self.max_concurrent})"
 
 
-class TimeWindowRateLimiter(RateLimiter):
+class TimeWindowRateLimiter(ReservableRateLimiter):
     def __init__(
         self, max_value: int, window_seconds: int, smoothing_factor: float = 0.9
     ) -> None:
@@ -120,20 +264,34 @@ class TimeWindowRateLimiter(RateLimiter):
 
         self.lock = threading.RLock()
         self.values: deque[Tuple[int, float]] = deque()
-        self.waiting: deque[Tuple[threading.Event, int]] = deque()
+        self.total = 0  # running sum of `values`
+        self.waiting: deque[Tuple[AwaitableEvent, int]] = deque()
         self._stop_event = threading.Event()
 
         # expiration thread
+        self._start()
+        background.register(self)
+
+    def _start(self) -> None:
         self._expiration_thread = threading.Thread(
             target=self._expire_and_process, daemon=True
         )
         self._expiration_thread.start()
 
+    def _after_fork(self) -> None:
+        self.lock = threading.RLock()
+        if not self._stop_event.is_set():
+            self._start()
+
     def copy(self) -> "TimeWindowRateLimiter":
         return TimeWindowRateLimiter(
             self.max_value, self.window_seconds, self.smoothing_factor
         )
 
+    def split(self, shares: int) -> None:
+        with self.lock:
+            self.max_value = self.max_value / shares  # type: ignore[assignment]
+
     def _expire_and_process(self) -> None:
         while not self._stop_event.is_set():
             with self.lock:
@@ -144,21 +302,25 @@ class TimeWindowRateLimiter(RateLimiter):
     def expire(self) -> None:
         now = time.perf_counter()
         while self.values and now - self.values[0][1] > self.window_seconds:
-            self.values.popleft()
+            self.total -= self.values.popleft()[0]
 
     def current_sum(self) -> int:
-        return sum(value for value, _ in self.values)
+        return self.total
+
+    def _append(self, value: int) -> None:
+        self.values.append((value, time.perf_counter()))
+        self.total += value
 
     def acquire(self, value: Optional[int] = None) -> threading.Event:
         if value is None:
             raise VerdictSystemError("Value is required for TimeWindowRateLimiter")
 
-        event = threading.Event()
+        event = AwaitableEvent()
         with self.lock:
             self.expire()
 
             if self.current_sum() + value <= (self.max_value * self.smoothing_factor):
-                self.values.append((value, time.perf_counter()))
+                self._append(value)
                 event.set()
             else:
                 self.waiting.append((event, value))
@@ -171,7 +333,7 @@ class TimeWindowRateLimiter(RateLimiter):
             if self.current_sum() + wait_value <= (
                 self.max_value * self.smoothing_factor
             ):
-                self.values.append((wait_value, time.perf_counter()))
+                self._append(wait_value)
                 wait_event.set()
                 self.waiting.popleft()
             else:
@@ -182,8 +344,26 @@ class TimeWindowRateLimiter(RateLimiter):
             raise VerdictSystemError("Value is required for TimeWindowRateLimiter")
 
         with self.lock:
-            self.values.append((value, time.perf_counter()))
+            self._append(value)
             self._process_waiting_tasks()
+        self.notify()
+
+    def available_in(self, value: int) -> Optional[float]:
+        self.expire()
+        if not self.waiting and self.current_sum() + value <= (
+            self.max_value * self.smoothing_factor
+        ):
+            return 0
+        if not self.values:  # only blocked behind this limiter's own queue
+            return 0.1
+        # re-checked once the oldest value leaves the window
+        return max(self.values[0][1] + self.window_seconds - time.perf_counter(), 0.001)
+
+    def consume(self, value: int) -> None:
+        self._append(value)
+
+    def refund(self, value: int) -> None:
+        self.release(-value)
 
     def shutdown(self) -> None:
         """Stop the expiration thread."""
@@ -197,47 +377,729 @@ class TimeWindowRateLimiter(RateLimiter):
         return f"{self.__class__.__name__}(max_value={self.max_value}, window_seconds={self.window_seconds}, smoothing_factor={self.smoothing_factor})"
 
 
+class SharedTimer:
+    """
+    A single daemon thread that runs callbacks at their `time.monotonic()` deadlines.
+    Shared by all TokenBucketRateLimiters, so queued requests are woken exactly when
+    budget becomes available instead of by a polling thread per limiter.
+    """
+
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.heap: List[Tuple[float, int, Callable[[], None]]] = []
+        self.counter = itertools.count()
+        self.thread: Optional[threading.Thread] = None
+        background.register(self)
+
+    def _after_fork(self) -> None:
+        # restart the timer thread for pending callbacks
+        self.condition = threading.Condition()
+        self.thread = None
+        if self.heap:
+            self._start()
+
+    def _start(self) -> None:
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> None:
+        with self.condition:
+            heapq.heappush(self.heap, (deadline, next(self.counter), callback))
+            if self.thread is None or not self.thread.is_alive():
+                self._start()
+            self.condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                now = time.monotonic()
+                while not self.heap or self.heap[0][0] > now:
+                    self.condition.wait(self.heap[0][0] - now if self.heap else None)
+                    now = time.monotonic()
+                _, _, callback = heapq.heappop(self.heap)
+
+            try:
+                callback()
+            except Exception:
+                from verdict.util.log import logger
+
+                logger.opt(exception=True).error("Rate limiter timer callback failed")
+
+
+timer = SharedTimer()
+
+
+class TokenBucketRateLimiter(ReservableRateLimiter):
+    """
+    A token bucket (GCRA) limiter with O(1) acquire. The bucket holds up to
+    `max_value * smoothing_factor` and refills continuously at that amount per
+    `window_seconds`. Queued requests are admitted in FIFO order and woken by the
+    shared timer at the exact time the bucket has refilled enough for them. A request
+    larger than the bucket is admitted once the bucket is full.
+    """
+
+    # config
+    max_value: int
+    window_seconds: float
+    smoothing_factor: float
+
+    # state
+    level: float
+    updated: float
+    waiting: deque[Tuple[AwaitableEvent, int]]
+    wakeup: Optional[float]
+
+    def __init__(
+        self, max_value: int, window_seconds: float, smoothing_factor: float = 0.9
+    ) -> None:
+        self.max_value = max_value
+        self.window_seconds = window_seconds
+        self.smoothing_factor = smoothing_factor
+
+        self.capacity = max_value * smoothing_factor
+        self.rate = self.capacity / window_seconds
+
+        self.lock = threading.Lock()
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self.waiting = deque()
+        self.wakeup = None  # deadline of the pending timer callback, if any
+
+    def copy(self) -> "TokenBucketRateLimiter":
+        return TokenBucketRateLimiter(
+            self.max_value, self.window_seconds, self.smoothing_factor
+        )
+
+    def split(self, shares: int) -> None:
+        with self.lock:
+            self._refill()
+            self.max_value = self.max_value / shares  # type: ignore[assignment]
+            self.capacity = self.max_value * self.smoothing_factor
+            self.rate = self.capacity / self.window_seconds
+            self.level = min(self.level, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _shortfall(self, value: int) -> float:
+        return min(value, self.capacity) - self.level
+
+    def _admit_waiting(self) -> List[AwaitableEvent]:
+        admitted = []
+        while self.waiting and self._shortfall(self.waiting[0][1]) <= 1e-9:
+            event, value = self.waiting.popleft()
+            self.level -= value
+            admitted.append(event)
+
+        if self.waiting:
+            deadline = (
+                time.monotonic() + self._shortfall(self.waiting[0][1]) / self.rate
+            )
+            if self.wakeup is None or deadline < self.wakeup:
+                self.wakeup = deadline
+                timer.schedule(deadline, self._on_timer)
+
+        return admitted
+
+    def _on_timer(self) -> None:
+        with self.lock:
+            self.wakeup = None
+            self._refill()
+            admitted = self._admit_waiting()
+            drained = not self.waiting
+
+        for event in admitted:
+            event.set()
+        if drained:
+            self.notify()
+
+    def acquire(self, value: Optional[int] = None) -> threading.Event:
+        if value is None:
+            raise VerdictSystemError("Value is required for TokenBucketRateLimiter")
+
+        event = AwaitableEvent()
+        with self.lock:
+            self._refill()
+            self.waiting.append((event, value))
+            admitted = self._admit_waiting()
+
+        for admitted_event in admitted:
+            admitted_event.set()
+        return event
+
+    def release(self, value: Optional[int] = None) -> None:
+        if value is None:
+            raise VerdictSystemError("Value is required for TokenBucketRateLimiter")
+
+        # like TimeWindowRateLimiter, a release consumes `value` (negative to refund)
+        with self.lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - value)
+            admitted = self._admit_waiting()
+
+        for event in admitted:
+            event.set()
+        if value < 0:
+            self.notify()
+
+    def available_in(self, value: int) -> Optional[float]:
+        self._refill()
+        if self.waiting:
+            return None
+        return max(self._shortfall(value), 0) / self.rate
+
+    def consume(self, value: int) -> None:
+        self.level -= value
+
+    def refund(self, value: int) -> None:
+        self.release(-value)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(max_value={self.max_value}, window_seconds={self.window_seconds}, smoothing_factor={self.smoothing_factor})"
+
+
+# (level, updated) of a SharedTokenBucketRateLimiter
+SHARED_STATE = struct.Struct("dd")
+
+
+class SharedState:
+    """
+    The lock of a SharedTokenBucketRateLimiter. Entering it takes the thread lock and
+    an exclusive `flock` on the state file, and loads the state; exiting stores the
+    state and releases both. The file is reopened in forked children, since `flock`
+    locks are shared by file descriptors inherited across a fork.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        load: Callable[[bytes], None],
+        store: Callable[[], bytes],
+    ) -> None:
+        self.path = path
+        self.load = load
+        self.store = store
+
+        self.open_lock = threading.Lock()
+        self.fd: Optional[int] = None
+        self.pid: Optional[int] = None
+
+    def _open(self) -> None:
+        with self.open_lock:
+            if self.pid == os.getpid():
+                return
+            if self.fd is not None:  # inherited from the parent process
+                os.close(self.fd)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.thread_lock = threading.Lock()
+            self.pid = os.getpid()
+
+    def __enter__(self) -> "SharedState":
+        import fcntl
+
+        if self.pid != os.getpid():
+            self._open()
+        self.thread_lock.acquire()
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                self.load(os.pread(self.fd, SHARED_STATE.size, 0))
+            except BaseException:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+                raise
+        except BaseException:
+            self.thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        import fcntl
+
+        try:
+            os.pwrite(self.fd, self.store(), 0)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.thread_lock.release()
+
+
+class SharedTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """
+    A TokenBucketRateLimiter whose bucket is shared by all processes on the host that
+    use the same `name`, e.g., workers each running `Pipeline.run_from_dataset` on a
+    shard of a dataset. The bucket state is kept in a small file in `directory` and
+    only read and written under an exclusive `flock`, so the processes jointly respect
+    one limit. Each process queues its own requests, which are woken when the shared
+    bucket should have refilled enough for them (and re-queued if another process
+    took that budget first). POSIX only.
+    """
+
+    # config
+    name: str
+    path: Path
+
+    def __init__(
+        self,
+        name: str,
+        max_value: int,
+        window_seconds: float,
+        smoothing_factor: float = 0.9,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        super().__init__(max_value, window_seconds, smoothing_factor)
+        self.name = name
+        self.path = (
+            Path(directory or tempfile.gettempdir()) / f"verdict-ratelimit-{name}"
+        )
+        self.lock = SharedState(self.path, self._load, self._store)  # type: ignore[assignment]
+
+    def copy(self) -> "SharedTokenBucketRateLimiter":
+        return SharedTokenBucketRateLimiter(
+            self.name,
+            self.max_value,
+            self.window_seconds,
+            self.smoothing_factor,
+            self.path.parent,
+        )
+
+    def split(self, shares: int) -> None:
+        # the bucket is already shared by all processes
+        pass
+
+    def _refill(self) -> None:
+        # wall-clock time, since the state is compared across processes
+        now = time.time()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _load(self, data: bytes) -> None:
+        if len(data) == SHARED_STATE.size:
+            self.level, self.updated = SHARED_STATE.unpack(data)
+        else:  # first use of this name
+            self.level, self.updated = self.capacity, time.time()
+
+    def _store(self) -> bytes:
+        return SHARED_STATE.pack(self.level, self.updated)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "max_value": self.max_value,
+            "window_seconds": self.window_seconds,
+            "smoothing_factor": self.smoothing_factor,
+            "directory": self.path.parent,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r}, max_value={self.max_value}, window_seconds={self.window_seconds}, smoothing_factor={self.smoothing_factor})"
+
+
+class AdaptiveRateLimiter(TokenBucketRateLimiter):
+    """
+    A TokenBucketRateLimiter whose limit is learned from the provider. `max_value` is
+    only the initial estimate, updated by `RateLimitPolicy.observe` after each response:
+
+    - If the provider reports its limit and remaining budget in the response headers,
+      the estimate follows the reported limit and the bucket is lowered to the
+      reported remaining budget (e.g., when other clients share the same key).
+    - Otherwise, the estimate grows additively by `increase` per window of successful
+      requests, up to `ceiling`.
+    - A 429 cuts the estimate multiplicatively by `decrease` (at most once per
+      `cooldown`, since in-flight requests are rejected together) and empties the
+      bucket until the provider's retry-after has passed.
+    """
+
+    # config
+    floor: float
+    ceiling: Optional[float]
+    increase: float
+    decrease: float
+    cooldown: float
+
+    # state
+    decreased: Optional[float]
+    share: float  # of the provider's limit, if split across processes
+
+    def __init__(
+        self,
+        max_value: int,
+        window_seconds: float,
+        smoothing_factor: float = 0.9,
+        floor: float = 1,
+        ceiling: Optional[float] = None,
+        increase: Optional[float] = None,
+        decrease: float = 0.5,
+        cooldown: Optional[float] = None,
+    ) -> None:
+        super().__init__(max_value, window_seconds, smoothing_factor)
+        self.floor = floor
+        self.ceiling = ceiling
+        self.increase = max_value / 10 if increase is None else increase
+        self.decrease = decrease
+        self.cooldown = window_seconds / 10 if cooldown is None else cooldown
+
+        self.decreased = None  # time of the last multiplicative decrease
+        self.share = 1
+
+    def copy(self) -> "AdaptiveRateLimiter":
+        return AdaptiveRateLimiter(
+            self.max_value,
+            self.window_seconds,
+            self.smoothing_factor,
+            floor=self.floor,
+            ceiling=self.ceiling,
+            increase=self.increase,
+            decrease=self.decrease,
+            cooldown=self.cooldown,
+        )
+
+    @property
+    def estimate(self) -> float:
+        """The current estimate of the provider's limit per `window_seconds`."""
+        return self.max_value
+
+    def split(self, shares: int) -> None:
+        with self.lock:
+            self.share /= shares
+            self.floor /= shares
+            if self.ceiling is not None:
+                self.ceiling /= shares
+            self.increase /= shares
+        super().split(shares)
+
+    def _resize(self, max_value: float) -> None:
+        if self.ceiling is not None:
+            max_value = min(max_value, self.ceiling)
+        self.max_value = max(max_value, self.floor)  # type: ignore[assignment]
+
+        # added capacity can be used right away
+        capacity, self.capacity = self.capacity, self.max_value * self.smoothing_factor
+        self.rate = self.capacity / self.window_seconds
+        self.level = min(self.level + max(self.capacity - capacity, 0), self.capacity)
+
+    def observe(
+        self,
+        value: int,
+        limit: Optional[float] = None,
+        remaining: Optional[float] = None,
+    ) -> None:
+        """
+        Adapt to a successful response that used `value`, given the provider's
+        reported `limit` and `remaining` budget (if any).
+        """
+        if limit is not None:
+            limit *= self.share
+        if remaining is not None:
+            remaining *= self.share
+
+        with self.lock:
+            self._refill()
+            previous = self.max_value
+            if limit is not None:
+                self._resize(limit)
+            elif value:
+                self._resize(self.max_value + self.increase * value / self.max_value)
+            if remaining is not None:
+                # keep the smoothing margin below what the provider has left
+                used = (limit or self.max_value) - remaining
+                self.level = min(self.level, self.capacity - used)
+            admitted = self._admit_waiting()
+            grown = self.max_value > previous
+
+        for event in admitted:
+            event.set()
+        if grown:
+            self.notify()
+
+    def backoff(self, retry_after: Optional[float] = None) -> None:
+        """Adapt to a 429, optionally with the provider's retry-after in seconds."""
+        with self.lock:
+            self._refill()
+            if self.decreased is None or self.updated - self.decreased >= self.cooldown:
+                self.decreased = self.updated
+                self._resize(self.max_value * self.decrease)
+            self.level = min(self.level, -(retry_after or 0) * self.rate)
+
+
+# (limit, remaining) response headers reported by providers for each metric
+RATE_LIMIT_HEADERS: Dict[RateLimiterMetric, List[Tuple[str, str]]] = {
+    RateLimiterMetric.REQUESTS: [
+        ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+        (
+            "anthropic-ratelimit-requests-limit",
+            "anthropic-ratelimit-requests-remaining",
+        ),
+    ],
+    RateLimiterMetric.TOKENS: [
+        ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+        ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+    ],
+}
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    if (milliseconds := _header_number(headers, "retry-after-ms")) is not None:
+        return milliseconds / 1000
+    return _header_number(headers, "retry-after")  # HTTP-date values are ignored
+
+
 RateLimitConfig = Dict[RateLimiter, Union[str, RateLimiterMetric]]
 
 
 class MultiEvent(Protocol):
     def wait(self) -> None: ...
 
+    async def wait_async(self) -> None: ...
+
     def is_set(self) -> bool: ...
 
+    def cancel(self) -> None: ...
+
+
+class ReservationState(Enum):
+    QUEUED = "queued"
+    ADMITTED = "admitted"
+    CANCELLED = "cancelled"
+
+
+class Reservation:
+    """
+    The MultiEvent returned by `RateLimitPolicy.acquire`. It is set once every
+    limiter of the policy has admitted the request.
+
+    `cancel()` withdraws a queued request, or refunds an admitted request that was
+    never sent. Only atomic policies support it; for other policies it does nothing.
+    """
+
+    policy: "RateLimitPolicy"
+    amounts: List[Tuple[RateLimiter, int]]
+    events: List[threading.Event]
+    state: ReservationState
+
+    def __init__(
+        self,
+        policy: "RateLimitPolicy",
+        amounts: List[Tuple[RateLimiter, int]],
+        events: List[threading.Event],
+    ) -> None:
+        self.policy = policy
+        self.amounts = amounts
+        self.events = events
+        self.state = ReservationState.QUEUED
+
+    def wait(self) -> None:
+        for event in self.events:
+            event.wait()
+
+    async def wait_async(self) -> None:
+        try:
+            for event in self.events:
+                if isinstance(event, AwaitableEvent):
+                    await event.wait_async()
+                elif not event.is_set():  # custom RateLimiter returning a plain Event
+                    await asyncio.to_thread(event.wait)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def is_set(self) -> bool:
+        return all(event.is_set() for event in self.events)
+
+    def cancel(self) -> None:
+        self.policy._cancel(self)
+
 
 class RateLimitPolicy:
+    """
+    The rate limiters a request must pass, each applied to a metric ("requests" or
+    "tokens").
+
+    If every limiter is a ReservableRateLimiter (all built-in limiters are),
+    `acquire` is atomic. The request waits in a FIFO queue until all limiters can
+    admit it at once, and only then consumes from all of them. So a request queued on the tokens
+    limiter does not hold requests budget, and the other way round. Otherwise, or
+    with `atomic=False`, each limiter is acquired independently.
+    """
+
     # config
     rate_limiters: Dict[RateLimiter, RateLimiterMetric]
+    atomic: bool
+    is_adaptive: bool
 
-    def __init__(self, rate_limiters: RateLimitConfig) -> None:
+    # state
+    waiting: deque[Reservation]
+    wakeup: Optional[float]
+
+    def __init__(self, rate_limiters: RateLimitConfig, atomic: bool = True) -> None:
         self.rate_limiters = {
             rate_limiter: RateLimiterMetric(metric)
             for rate_limiter, metric in rate_limiters.items()
         }
+        self.atomic = atomic and all(
+            isinstance(rate_limiter, ReservableRateLimiter)
+            for rate_limiter in self.rate_limiters
+        )
+
+        self.lock = threading.Lock()
+        self.waiting = deque()
+        self.wakeup = None  # deadline of the pending timer callback, if any
+
+        # limiter locks are always taken in the same order, so policies can share limiters
+        self.lock_order = sorted(self.rate_limiters, key=id)
+        if self.atomic:
+            for rate_limiter in self.rate_limiters:
+                rate_limiter.subscribe(self._process)
+
+        self.is_adaptive = any(
+            isinstance(rate_limiter, AdaptiveRateLimiter)
+            for rate_limiter in self.rate_limiters
+        )
 
     def copy(self) -> "RateLimitPolicy":
         return RateLimitPolicy(
             {
                 rate_limiter.copy(): metric
                 for rate_limiter, metric in self.rate_limiters.items()
-            }
+            },
+            atomic=self.atomic,
         )
 
     def acquire(self, values: Dict[str, int] = {}) -> MultiEvent:
-        events: List[threading.Event] = []
-        for rate_limiter, metric in self.rate_limiters.items():
-            events.append(rate_limiter.acquire(values.get(metric.value, 0)))
+        amounts = [
+            (rate_limiter, values.get(metric.value, 0))
+            for rate_limiter, metric in self.rate_limiters.items()
+        ]
+        if not self.atomic:
+            return Reservation(
+                self,
+                amounts,
+                [rate_limiter.acquire(value) for rate_limiter, value in amounts],
+            )
+
+        reservation = Reservation(self, amounts, [AwaitableEvent()])
+        with self.lock:
+            self.waiting.append(reservation)
+        self._process()
+        return reservation
 
-        return SimpleNamespace(
-            wait=lambda: [event.wait() for event in events],
-            is_set=lambda: all(event.is_set() for event in events),
-        )
+    def _process(self) -> None:
+        admitted = []
+        with self.lock:
+            while self.waiting:
+                reservation = self.waiting[0]
+                with ExitStack() as stack:
+                    for rate_limiter in self.lock_order:
+                        if (lock := getattr(rate_limiter, "lock", None)) is not None:
+                            stack.enter_context(lock)
+
+                    delays = [
+                        rate_limiter.available_in(value)
+                        for rate_limiter, value in reservation.amounts
+                    ]
+                    if all(delay == 0 for delay in delays):
+                        for rate_limiter, value in reservation.amounts:
+                            rate_limiter.consume(value)
+                        reservation.state = ReservationState.ADMITTED
+                        admitted.append(self.waiting.popleft())
+                        continue
+
+                # limiters waiting on a release notify us once it happens; otherwise
+                # re-check once the slowest limiter can admit the request
+                if None not in delays:
+                    deadline = time.monotonic() + max(delays)  # type: ignore[type-var]
+                    if self.wakeup is None or deadline < self.wakeup:
+                        self.wakeup = deadline
+                        timer.schedule(deadline, self._on_timer)
+                break
+
+        for reservation in admitted:
+            reservation.events[0].set()
+
+    def _on_timer(self) -> None:
+        with self.lock:
+            self.wakeup = None
+        self._process()
+
+    def _cancel(self, reservation: Reservation) -> None:
+        if not self.atomic:
+            return
+
+        with self.lock:
+            state, reservation.state = reservation.state, ReservationState.CANCELLED
+            if state == ReservationState.QUEUED:
+                self.waiting.remove(reservation)
+
+        if state == ReservationState.QUEUED:
+            self._process()  # the next request may no longer be blocked
+        elif state == ReservationState.ADMITTED:
+            for rate_limiter, value in reservation.amounts:
+                rate_limiter.refund(value)
 
     def release(self, values: Dict[str, int] = {}) -> None:
         for rate_limiter, metric in self.rate_limiters.items():
             rate_limiter.release(values.get(metric.value, 0))
 
+    def observe(
+        self,
+        headers: Mapping[str, str] = {},
+        rate_limited: bool = False,
+        values: Dict[str, int] = {},
+    ) -> None:
+        """
+        Feed a provider response (or a 429 if `rate_limited`) to the policy's
+        AdaptiveRateLimiters. `values` is the usage of a successful request.
+        """
+        if not self.is_adaptive:
+            return
+
+        # litellm prefixes raw provider headers with "llm_provider-"
+        headers = {
+            key.lower().removeprefix("llm_provider-"): value
+            for key, value in headers.items()
+        }
+        for rate_limiter, metric in self.rate_limiters.items():
+            if not isinstance(rate_limiter, AdaptiveRateLimiter):
+                continue
+
+            limit = remaining = None
+            for limit_header, remaining_header in RATE_LIMIT_HEADERS[metric]:
+                limit = _header_number(headers, limit_header)
+                remaining = _header_number(headers, remaining_header)
+                if limit is not None or remaining is not None:
+                    break
+
+            # a 429 reporting budget left for this metric was caused by another one
+            if rate_limited and (remaining is None or remaining < 1):
+                rate_limiter.backoff(_retry_after(headers))
+            else:
+                rate_limiter.observe(
+                    0 if rate_limited else values.get(metric.value, 0),
+                    limit,
+                    remaining,
+                )
+
+    @property
+    def estimate(self) -> Dict[str, float]:
+        """The current limit estimate of each AdaptiveRateLimiter, by metric."""
+        return {
+            metric.value: rate_limiter.estimate
+            for rate_limiter, metric in self.rate_limiters.items()
+            if isinstance(rate_limiter, AdaptiveRateLimiter)
+        }
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({' | '.join(f'{metric.value}@{rate_limiter}' for rate_limiter, metric in self.rate_limiters.items())})"
 
@@ -248,8 +1110,40 @@ class RateLimitPolicy:
     def of(rpm: int, tpm: int) -> "RateLimitPolicy":
         return RateLimitPolicy(
             {
-                TimeWindowRateLimiter(max_value=rpm, window_seconds=60): "requests",
-                TimeWindowRateLimiter(max_value=tpm, window_seconds=60): "tokens",
+                TokenBucketRateLimiter(max_value=rpm, window_seconds=60): "requests",
+                TokenBucketRateLimiter(max_value=tpm, window_seconds=60): "tokens",
+            }
+        )
+
+    @staticmethod
+    def shared(name: str, rpm: int, tpm: int) -> "RateLimitPolicy":
+        """
+        Like `RateLimitPolicy.of`, but shared by all processes on the host that use
+        the same `name`.
+        """
+        return RateLimitPolicy(
+            {
+                SharedTokenBucketRateLimiter(
+                    f"{name}-requests", max_value=rpm, window_seconds=60
+                ): "requests",
+                SharedTokenBucketRateLimiter(
+                    f"{name}-tokens", max_value=tpm, window_seconds=60
+                ): "tokens",
+            }
+        )
+
+    @staticmethod
+    def adaptive(
+        rpm: int, tpm: int, window_seconds: float = 60, **kwargs
+    ) -> "RateLimitPolicy":
+        """
+        An adaptive policy starting from `rpm`/`tpm`, which are learned from the
+        provider's rate-limit headers and 429s. See AdaptiveRateLimiter for `kwargs`.
+        """
+        return RateLimitPolicy(
+            {
+                AdaptiveRateLimiter(rpm, window_seconds, **kwargs): "requests",
+                AdaptiveRateLimiter(tpm, window_seconds, **kwargs): "tokens",
             }
         )
 
@@ -0,0 +1,82 @@
+import math
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from verdict.util.misc import shorten_string
+
+
+class Tokenizer:
+    """
+    Tokenizer for a single model, resolved once through litellm.
+
+    Token counts are memoized (LRU, keyed by text), so repeated prompt segments such
+    as system prompts, the prompt of a Unit repeated in a Layer, or the same user
+    prompt counted for rate limiting and again for usage, are only tokenized once.
+
+    Args:
+        model: The litellm model name.
+        max_cached_counts: Number of distinct texts to memoize counts for.
+    """
+
+    model: str
+    count: Callable[[str], int]
+
+    def __init__(self, model: str, max_cached_counts: int = 4096) -> None:
+        self.model = model
+        self.count = lru_cache(maxsize=max_cached_counts)(self._count)
+
+        self._encode: Optional[Callable[[str], Any]] = None
+
+    def _resolve(self) -> Callable[[str], Any]:
+        if self._encode is None:
+            from litellm import encode  # type: ignore[import-untyped]
+
+            try:
+                # private, but lets us look the tokenizer up once instead of per call
+                from litellm.utils import _select_tokenizer  # type: ignore[import-untyped]
+
+                tokenizer = {
+                    "tokenizer": _select_tokenizer(model=self.model)["tokenizer"]
+                }
+                self._encode = lambda text: encode(
+                    text=text, custom_tokenizer=tokenizer
+                )
+            except Exception:
+                self._encode = lambda text: encode(model=self.model, text=text)
+        return self._encode
+
+    def encode(self, text: str) -> List[int]:
+        tokens = self._resolve()(shorten_string(text, encoded=False))
+        if hasattr(tokens, "ids"):  # tokenizers.Encoding
+            return tokens.ids
+        return tokens
+
+    def _count(self, text: str) -> int:
+        return len(self.encode(text))
+
+    def estimate(self, text: str, chars_per_token: Optional[float] = None) -> int:
+        """
+        Token count used for rate limiting. With `chars_per_token`, returns a cheap
+        length-based estimate instead of tokenizing.
+        """
+        if chars_per_token is not None:
+            return math.ceil(len(text) / chars_per_token)
+        return self.count(text)
+
+    @staticmethod
+    def for_model(model: str) -> "Tokenizer":
+        with _tokenizers_lock:
+            if model not in _tokenizers:
+                _tokenizers[model] = Tokenizer(model)
+            return _tokenizers[model]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"model": self.model}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["model"])  # type: ignore[misc]
+
+
+_tokenizers: Dict[str, Tokenizer] = {}
+_tokenizers_lock = threading.Lock()
@@ -12,19 +12,33 @@ Key classes:
     - TracingManager: Fans out to multiple tracers, manages context propagation.
     - NoOpTracer: A tracer that does nothing, but propagates context.
     - ConsoleTracer: Prints trace events to the console, with indentation.
+    - BatchExportTracer: Base class for tracers that export finished calls in batches
+      from a background thread.
 
 Usage examples are provided at the end of the file.
 """
 
+import atexit
 import contextvars
+import os
+import random
 import threading
 import time
-import uuid
+import weakref
 from abc import ABC, abstractmethod
 from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Dict, Iterator, List, Optional, Union
 
+from verdict.util.background import BackgroundWorker
+from verdict.util.log import logger
+
+
+def new_id() -> str:
+    """Returns a random 128-bit id as 32 hex digits (several times cheaper than uuid4)."""
+    return os.urandom(16).hex()
+
+
 # --- Context Management ---
 
 
@@ -71,8 +85,8 @@ class Call:
 
     name: str
     inputs: Dict[str, Any]
-    trace_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    call_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    trace_id: str = field(default_factory=new_id)
+    call_id: str = field(default_factory=new_id)
     parent_id: Optional[str] = None
     outputs: Any = None
     exception: Any = None
@@ -158,10 +172,20 @@ class TracingManager(Tracer):
 
     Args:
         tracers: A list of Tracer instances to fan out to.
+        sample_rate: The fraction of rows (traces submitted by the pipeline) whose
+            spans are recorded. Decided once per row, so a row is traced completely or
+            not at all. Defaults to config.TRACE_SAMPLE_RATE.
     """
 
-    def __init__(self, tracers: List[Tracer]) -> None:
+    def __init__(
+        self, tracers: List[Tracer], sample_rate: Optional[float] = None
+    ) -> None:
+        from verdict import config
+
         self.tracers = tracers
+        self.sample_rate = (
+            config.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
 
     @contextmanager
     def start_call(
@@ -189,7 +213,7 @@ class TracingManager(Tracer):
             call_id: str = (
                 calls[0].call_id
                 if calls and hasattr(calls[0], "call_id") and calls[0] is not None
-                else str(uuid.uuid4())
+                else new_id()
             )
             token = current_trace_context.set(
                 TraceContext(trace_id, call_id, parent_id)
@@ -229,7 +253,7 @@ class NoOpTracer(Tracer):
             parent_id = parent_ctx.call_id
         if trace_id is None and parent_ctx is not None:
             trace_id = parent_ctx.trace_id
-        call_id: str = str(uuid.uuid4())
+        call_id: str = new_id()
         token: contextvars.Token = current_trace_context.set(
             TraceContext(trace_id, call_id, parent_id)
         )
@@ -285,6 +309,8 @@ class ConsoleTracer(Tracer):
                 f"{indent}<< Call: {name} | trace_id={call.trace_id} | call_id={call.call_id} | parent_id={call.parent_id} | Outputs: {self._shorten(call.outputs)} | Exception: {call.exception} | Duration: {duration_str}"
             )
             current_trace_context.reset(token)
+            # only open calls are needed for the indentation
+            self._call_registry.pop(call.call_id, None)
 
     def _get_indent(self, call: Call) -> str:
         """Compute indentation for pretty-printing based on call depth."""
@@ -306,6 +332,90 @@ class ConsoleTracer(Tracer):
         return s
 
 
+# --- BatchExportTracer ---
+
+
+class BatchExportTracer(Tracer):
+    """Base class for tracers that send finished calls to a backend (e.g., a file or a
+    collector). Worker threads only time the call and queue it; a background thread
+    passes the queued calls to `export` in batches.
+
+    Args:
+        max_batch_size: The most calls passed to one `export`.
+        flush_interval: Seconds after which a partial batch is exported.
+        max_queue_size: Calls finished while this many are waiting to be exported
+            are dropped (counted in `dropped`) instead of blocking the workers.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 512,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 65_536,
+    ) -> None:
+        self.worker = BackgroundWorker(
+            self._export,
+            name="verdict-trace-exporter",
+            max_batch_size=max_batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+        )
+        _batch_export_tracers.add(self)
+
+    @property
+    def dropped(self) -> int:
+        return self.worker.dropped
+
+    @abstractmethod
+    def export(self, calls: List[Call]) -> None:
+        """Sends a batch of finished calls. Runs on the exporter thread."""
+        pass
+
+    def _export(self, batch: List[Call]) -> None:
+        try:
+            self.export(batch)
+        except Exception:
+            logger.exception("Failed to export {} calls", len(batch))
+
+    @contextmanager
+    def start_call(
+        self,
+        name: str,
+        inputs: Dict[str, Any],
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> Iterator[Call]:
+        parent_ctx = current_trace_context.get()
+        if parent_id is None and parent_ctx is not None:
+            parent_id = parent_ctx.call_id
+        if trace_id is None and parent_ctx is not None:
+            trace_id = parent_ctx.trace_id
+
+        call = Call(name, inputs, trace_id=trace_id, parent_id=parent_id)
+        token: contextvars.Token = current_trace_context.set(
+            TraceContext(trace_id, call.call_id, parent_id)
+        )
+        try:
+            with call:
+                yield call
+        finally:
+            current_trace_context.reset(token)
+            self.worker.put(call)
+
+    def flush(self) -> None:
+        """Blocks until the calls finished so far are exported."""
+        self.worker.flush()
+
+    def shutdown(self) -> None:
+        """Exports the remaining calls and stops the exporter thread."""
+        _batch_export_tracers.discard(self)
+        self.worker.stop()
+
+
+_batch_export_tracers: "weakref.WeakSet[BatchExportTracer]" = weakref.WeakSet()
+atexit.register(lambda: [t.shutdown() for t in list(_batch_export_tracers)])
+
+
 def ensure_tracing_manager(
     tracer: Optional[Union[Tracer, List[Tracer]]],
 ) -> TracingManager:
@@ -327,24 +437,56 @@ class ExecutionContext:
         trace_id: The unique identifier for the trace (spans/calls tree).
         call_id: The unique identifier for this call/span.
         parent_id: The call_id of the parent call, if any.
+        sampled: Whether spans are recorded (see `sample`). If not, `trace_call`
+            yields None without calling the tracer.
+        call: The span the caller already opened for this call (see `within`).
+        in_call: Whether `trace_call` should reuse `call` instead of opening a span.
     """
 
     tracer: Tracer = field(default_factory=NoOpTracer)
-    trace_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    call_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    trace_id: str = field(default_factory=new_id)
+    call_id: str = field(default_factory=new_id)
     parent_id: Optional[str] = None
+    sampled: bool = True
+    call: Optional[Call] = field(default=None, repr=False, compare=False)
+    in_call: bool = False
 
     def child(self, call_id: Optional[str] = None) -> "ExecutionContext":
         """Create a new context for a child call/span."""
         return ExecutionContext(
             tracer=self.tracer,
             trace_id=self.trace_id,
-            call_id=call_id or str(uuid.uuid4()),
+            call_id=call_id or new_id(),
             parent_id=self.call_id,
+            sampled=self.sampled,
+        )
+
+    def within(self, call: Optional[Call]) -> "ExecutionContext":
+        """Create a context for code running inside the already open `call`, e.g., a
+        Unit executed by the executor, whose `trace_call` yields `call` instead of
+        opening a second span for the same Unit."""
+        return ExecutionContext(
+            tracer=self.tracer,
+            trace_id=self.trace_id,
+            call_id=self.call_id,
+            parent_id=self.parent_id,
+            sampled=self.sampled,
+            call=call,
+            in_call=True,
         )
 
+    def sample(self) -> bool:
+        """Head-based sampling: decide whether to record a new trace (e.g., a dataset
+        row) under this context, at the tracer's `sample_rate`."""
+        sample_rate = getattr(self.tracer, "sample_rate", 1.0)
+        return self.sampled and (sample_rate >= 1 or random.random() < sample_rate)
+
     @contextmanager
     def trace_call(self, name: str, inputs: dict):
+        if self.in_call or not self.sampled:
+            yield self.call
+            return
+
         with self.tracer.start_call(
             name=name,
             inputs=inputs,